@@ -0,0 +1,198 @@
+"""
+Reporting of synthetic pytest sessions while the local Zebrunner stub injects faults: latency, 5xx bursts,
+429 throttling, connection resets and slow uploads.
+
+    PYTHONPATH=src python benchmarks/bench_chaos.py --tests 500 --profiles errors throttling
+    PYTHONPATH=src python benchmarks/bench_chaos.py --setting REPORTING_PIPELINE_ENABLED=true
+
+Sessions run the real plugin in a subprocess. For every profile the harness checks that every test result
+reached the stub and that reporting made the session at most `--max-overhead` seconds slower than
+the same session with reporting disabled. Exits with code 1 if any check fails.
+"""
+
+import argparse
+import math
+import os
+import random
+import re
+import socket
+import struct
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Set
+
+from bench_overhead import CONFTEST_LOGGING, SOURCE_DIR, _write_modules, run_session
+from stub_server import StubRequestHandler, StubZebrunnerServer
+
+FINISH_TEST_PATH = re.compile(r"^/api/reporting/v1/test-runs/\d+/tests/(\d+)$")
+
+
+class FaultProfile(NamedTuple):
+    # Median and spread of lognormal response latency in seconds
+    latency_median: float = 0.0
+    latency_sigma: float = 0.0
+    # Probability that an outage answering 5xx to all requests for `burst_duration` seconds starts
+    error_rate: float = 0.0
+    burst_duration: float = 2.0
+    throttle_rate: float = 0.0
+    retry_after: float = 0.5
+    reset_rate: float = 0.0
+    # Bytes per second the stub reads request bodies with. Zero means unlimited
+    upload_rate: int = 0
+
+
+PROFILES: Dict[str, FaultProfile] = {
+    "healthy": FaultProfile(),
+    "latency": FaultProfile(latency_median=0.02, latency_sigma=1.0),
+    "errors": FaultProfile(error_rate=0.005, burst_duration=2.0),
+    "throttling": FaultProfile(throttle_rate=0.05, retry_after=0.2),
+    "resets": FaultProfile(reset_rate=0.02),
+    "slow-uploads": FaultProfile(upload_rate=256 * 1024),
+    "mixed": FaultProfile(
+        latency_median=0.01, latency_sigma=0.8, error_rate=0.002, throttle_rate=0.02, reset_rate=0.01
+    ),
+}
+
+
+class ChaosRequestHandler(StubRequestHandler):
+    server: "ChaosZebrunnerServer"
+
+    def _handle(self) -> None:
+        profile = self.server.profile
+        body = self._read_body()
+        if profile.upload_rate:
+            time.sleep(len(body) / profile.upload_rate)
+        if profile.latency_median:
+            time.sleep(
+                self.server.random(
+                    lambda rng: rng.lognormvariate(math.log(profile.latency_median), profile.latency_sigma)
+                )
+            )
+
+        fault = self.server.next_fault()
+        if fault == "reset":
+            # Zero linger timeout makes close() send RST instead of FIN
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            self.close_connection = True
+            return
+        if fault == "throttle":
+            self.send_response(429)
+            self.send_header("Retry-After", str(profile.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if fault == "error":
+            self._send_json(503, {"message": "Injected failure"})
+            return
+
+        self.server.record(self.command, self.path, len(body))
+        match = FINISH_TEST_PATH.match(self.path.split("?")[0])
+        if self.command == "PUT" and match and b'"result"' in body:
+            self.server.record_result(int(match.group(1)))
+        self._send_json(200, {"id": self.server.next_id(), "authToken": "stub-token"})
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+
+class ChaosZebrunnerServer(StubZebrunnerServer):
+    def __init__(self, profile: FaultProfile, seed: int = 0) -> None:
+        super().__init__(ChaosRequestHandler)
+        self.profile = profile
+        self.finished_tests: Set[int] = set()
+        self.faults: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._burst_until = 0.0
+
+    def random(self, sample):  # type: ignore
+        with self._random_lock:
+            return sample(self._random)
+
+    def next_fault(self) -> str:
+        with self._random_lock:
+            fault = ""
+            if time.monotonic() < self._burst_until:
+                fault = "error"
+            elif self._random.random() < self.profile.error_rate:
+                self._burst_until = time.monotonic() + self.profile.burst_duration
+                fault = "error"
+            elif self._random.random() < self.profile.throttle_rate:
+                fault = "throttle"
+            elif self._random.random() < self.profile.reset_rate:
+                fault = "reset"
+            if fault:
+                self.faults[fault] = self.faults.get(fault, 0) + 1
+            return fault
+
+    def record_result(self, test_id: int) -> None:
+        with self._lock:
+            self.finished_tests.add(test_id)
+
+    def reset(self) -> None:
+        super().reset()
+        with self._lock:
+            self.finished_tests = set()
+            self.faults = {}
+
+
+def generate_session(directory: Path, tests: int) -> None:
+    (directory / "conftest.py").write_text(CONFTEST_LOGGING)
+    (directory / "artifact.bin").write_bytes(os.urandom(64 * 1024))
+    _write_modules(
+        directory,
+        tests,
+        '    logger.info("message of test")',
+        f'@pytest.mark.artifact("{directory / "artifact.bin"}")\n',
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tests", type=int, default=200)
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES))
+    parser.add_argument("--setting", action="append", default=[], help="plugin setting as ENV_NAME=value")
+    parser.add_argument("--max-overhead", type=float, default=60.0, help="allowed slowdown of a session, seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = dict(setting.split("=", 1) for setting in args.setting)
+    failures: List[str] = []
+    print(f"{'profile':<14}{'off, s':>9}{'on, s':>9}{'results':>10}{'calls':>8}  faults", flush=True)
+    with tempfile.TemporaryDirectory() as directory:
+        generate_session(Path(directory), args.tests)
+        for name in args.profiles:
+            with ChaosZebrunnerServer(PROFILES[name], args.seed) as stub:
+                env = {
+                    **os.environ,
+                    "PYTHONPATH": os.pathsep.join(filter(None, [str(SOURCE_DIR), os.environ.get("PYTHONPATH")])),
+                    "REPORTING_SERVER_HOSTNAME": stub.url,
+                    "REPORTING_SERVER_ACCESS_TOKEN": "stub-token",
+                    **settings,
+                }
+                disabled = run_session(Path(directory), [], {**env, "REPORTING_ENABLED": "false"})
+                stub.reset()
+                enabled = run_session(Path(directory), [], {**env, "REPORTING_ENABLED": "true"})
+
+                overhead = enabled.seconds - disabled.seconds
+                results = len(stub.finished_tests)
+                faults = ", ".join(f"{fault}: {count}" for fault, count in sorted(stub.faults.items()))
+                print(
+                    f"{name:<14}{disabled.seconds:>9.2f}{enabled.seconds:>9.2f}"
+                    f"{results:>6}/{args.tests:<4}{stub.total_calls:>7}  {faults or '-'}",
+                    flush=True,
+                )
+                if results != args.tests:
+                    failures.append(f"{name}: {args.tests - results} test results were lost")
+                if overhead > args.max_overhead:
+                    failures.append(f"{name}: reporting overhead {overhead:.1f}s exceeds {args.max_overhead:.1f}s")
+
+    for failure in failures:
+        print(f"FAILED {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Bytes on wire, compression CPU cost and estimated latency of typical JSON request bodies per content encoding.
+
+    PYTHONPATH=src python benchmarks/bench_compression.py --bandwidth 10 --rtt 80
+
+Requests are sent to the local Zebrunner stub, which counts received body bytes. Transfer time of the
+compressed body over a link of given bandwidth and round trip time is estimated rather than measured,
+because the stub is on loopback.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import traceback
+from typing import Callable, Dict, List, Tuple
+
+from stub_server import StubZebrunnerServer
+
+from pytest_zebrunner.api import compression
+from pytest_zebrunner.api.client import AsyncZebrunnerAPI
+from pytest_zebrunner.api.models import (
+    CiContextModel,
+    FinishTestModel,
+    LogRecordModel,
+    StartTestRunModel,
+)
+from pytest_zebrunner.api.serialization import dumps
+from pytest_zebrunner.settings import (
+    CompressionSettings,
+    ContentEncoding,
+    ServerSettings,
+)
+
+CONFIGURATIONS: List[Tuple[str, ContentEncoding, int]] = [
+    ("identity", ContentEncoding.IDENTITY, 0),
+    ("gzip 1", ContentEncoding.GZIP, 1),
+    ("gzip 6", ContentEncoding.GZIP, 6),
+    ("gzip 9", ContentEncoding.GZIP, 9),
+    ("zstd 3", ContentEncoding.ZSTD, 3),
+    ("zstd 10", ContentEncoding.ZSTD, 10),
+]
+
+
+def _traceback(depth: int) -> str:
+    def recurse(level: int) -> None:
+        if level == 0:
+            # Resembles pytest assertion rewriting output with a full diff
+            diff = "\n".join(f"E         -   'key_{i}': 'expected value {i}'," for i in range(100))
+            raise AssertionError(f"assert {{'key_0': ...}} == {{'key_0': ...}}\nE         Full diff:\n{diff}")
+        recurse(level - 1)
+
+    try:
+        recurse(depth)
+    except AssertionError:
+        return traceback.format_exc()
+    return ""
+
+
+def log_batch() -> List[LogRecordModel]:
+    return [
+        LogRecordModel(
+            test_id="1",
+            timestamp=str(1700000000000 + i),
+            level="INFO",
+            message=f"GET https://example.local/api/items/{i} returned 200 in {i % 97} ms",
+        )
+        for i in range(1000)
+    ]
+
+
+def failure_reason() -> FinishTestModel:
+    return FinishTestModel(result="FAILED", reason=_traceback(40))
+
+
+def ci_context() -> StartTestRunModel:
+    variables = {**os.environ, **{f"CI_VARIABLE_{i}": f"/builds/group/project/{i}/" + "x" * 40 for i in range(60)}}
+    return StartTestRunModel(
+        name="Default Suite",
+        framework="pytest",
+        ci_context=CiContextModel(ci_type="GITLAB_CI", env_variables=variables),
+    )
+
+
+PAYLOADS: Dict[str, Tuple[Callable, Callable]] = {
+    "log batch": (log_batch, lambda api, payload: api.send_logs(1, payload)),
+    "failure reason": (failure_reason, lambda api, payload: api.finish_test(1, 1, payload)),
+    "ci context": (ci_context, lambda api, payload: api.start_test_run("DEF", payload)),
+}
+
+
+def compression_time(encoding: ContentEncoding, level: int, content: bytes, repeat: int) -> float:
+    """
+    Returns CPU time of a single compression in milliseconds.
+    """
+    if encoding == ContentEncoding.IDENTITY:
+        return 0.0
+    compressor = compression.Compressor(encoding, threshold=0, level=level)
+    started = time.process_time()
+    for _ in range(repeat):
+        compressor.compress(content)
+    return (time.process_time() - started) / repeat * 1000
+
+
+async def send(url: str, settings: ServerSettings, method: Callable, payload: object) -> float:
+    api = AsyncZebrunnerAPI(url, "", settings)
+    started = time.perf_counter()
+    await method(api, payload)
+    elapsed = time.perf_counter() - started
+    await api.close()
+    return elapsed * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bandwidth", type=float, default=10.0, help="link bandwidth, megabits per second")
+    parser.add_argument("--rtt", type=float, default=80.0, help="link round trip time, milliseconds")
+    parser.add_argument("--repeat", type=int, default=50, help="compressions per measurement")
+    args = parser.parse_args()
+
+    print(
+        f"{'payload':<16}{'encoding':<10}{'bytes':>10}{'ratio':>8}{'cpu, ms':>10}"
+        f"{'loopback, ms':>14}{'estimated, ms':>15}"
+    )
+    with StubZebrunnerServer() as stub:
+        for payload_name, (factory, method) in PAYLOADS.items():
+            payload = factory()
+            original_size = len(dumps(payload))
+            for name, encoding, level in CONFIGURATIONS:
+                if encoding == ContentEncoding.ZSTD and compression.zstandard is None:
+                    continue
+                settings = ServerSettings(
+                    hostname=stub.url,
+                    access_token="",
+                    compression=CompressionSettings(encoding=encoding, threshold=0, level=level or None),
+                )
+                stub.reset()
+                loopback = asyncio.run(send(stub.url, settings, method, payload))
+                size = stub.bytes_received
+                cpu = compression_time(encoding, level, dumps(payload), args.repeat)
+                estimated = cpu + args.rtt + size * 8 / (args.bandwidth * 1000)
+                print(
+                    f"{payload_name:<16}{name:<10}{size:>10}{original_size / size:>8.1f}{cpu:>10.2f}"
+                    f"{loopback:>14.1f}{estimated:>15.1f}",
+                    flush=True,
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Requests per second of AsyncZebrunnerAPI for different connection pool configurations.
+
+    PYTHONPATH=src python benchmarks/bench_http_client.py --requests 2000 --concurrency 50
+
+The stub server speaks plain HTTP/1.1, so `http2` configurations negotiate HTTP/1.1 unless
+the benchmark is pointed to a TLS endpoint with `--url`.
+
+Requests are sent by AsyncZebrunnerAPI directly with `--concurrency` of them in flight. The plugin never does
+that: each of its reporting threads waits for one request at a time through the synchronous facade, so these
+numbers are an upper bound for pool settings, not reporting throughput. On loopback the stub serves every
+connection in its own thread, so keeping connections alive does not pay off there and more connections only
+add contention. Point `--url` to a remote server to compare pools under real round trip times.
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from pytest_zebrunner.api.client import AsyncZebrunnerAPI
+from pytest_zebrunner.api.models import FinishTestModel
+from pytest_zebrunner.settings import ServerSettings
+
+CONFIGURATIONS: Dict[str, dict] = {
+    "no keep-alive": {"max_keepalive_connections": 0},
+    "default": {},
+    "10 connections": {"max_connections": 10, "max_keepalive_connections": 10},
+    "200 connections": {"max_connections": 200, "max_keepalive_connections": 200, "keepalive_expiry": 30.0},
+    "http2": {"http2": True},
+}
+
+
+async def measure(url: str, settings: ServerSettings, requests: int, concurrency: int) -> float:
+    api = AsyncZebrunnerAPI(url, settings.access_token, settings)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def finish_test(test_id: int) -> None:
+        async with semaphore:
+            await api.finish_test(1, test_id, FinishTestModel(result="PASSED"))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(finish_test(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    await api.close()
+    return requests / elapsed
+
+
+def main(url: Optional[str], requests: int, concurrency: int) -> None:
+    # Stub runs in a separate process so it does not compete with the client for the GIL
+    stub = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / "stub_server.py")], stdout=subprocess.PIPE, text=True
+    )
+    try:
+        url = url or stub.stdout.readline().strip()  # type: ignore
+        print(f"{'configuration':<20}{'requests/s':>12}")
+        for name, options in CONFIGURATIONS.items():
+            settings = ServerSettings(hostname=url, access_token="token", **options)
+            rps = asyncio.run(measure(url, settings, requests, concurrency))
+            print(f"{name:<20}{rps:>12.0f}")
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Zebrunner compatible server. Local stub server is used by default")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    arguments = parser.parse_args()
+    main(arguments.url, arguments.requests, arguments.concurrency)
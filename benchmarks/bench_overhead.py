@@ -0,0 +1,174 @@
+"""
+Reporting overhead of the plugin for synthetic pytest sessions run against the local Zebrunner stub.
+
+    PYTHONPATH=src python benchmarks/bench_overhead.py --sizes 1000 10000 --scenarios plain logging
+
+Every scenario is run twice in a subprocess: with reporting disabled and enabled. Overhead per test is
+the difference of wall times divided by the number of tests. Settings of the plugin can be passed
+with `--setting`, e.g. `--setting REPORTING_PIPELINE_ENABLED=true`. Use `--json` to save results
+and compare them between releases.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from stub_server import StubZebrunnerServer
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "src"
+TESTS_PER_MODULE = 1000
+
+HEADER = """import logging
+
+import pytest
+
+logger = logging.getLogger("bench")"""
+
+
+def _write_modules(directory: Path, tests: int, body: str, decorator: str = "") -> None:
+    for start in range(0, tests, TESTS_PER_MODULE):
+        count = min(TESTS_PER_MODULE, tests - start)
+        functions = "".join(f"{decorator}def test_{i}():\n{body}\n\n" for i in range(start, start + count))
+        (directory / f"test_generated_{start}.py").write_text(f"{HEADER}\n\n{functions}")
+
+
+CONFTEST_LOGGING = """import logging
+
+from pytest_zebrunner.zebrunner_logging import ZebrunnerHandler
+
+logger = logging.getLogger("bench")
+logger.setLevel(logging.INFO)
+logger.addHandler(ZebrunnerHandler())
+"""
+
+
+def plain(directory: Path, tests: int) -> None:
+    _write_modules(directory, tests, "    pass")
+
+
+def parametrized(directory: Path, tests: int) -> None:
+    (directory / "test_generated.py").write_text(
+        f"import pytest\n\n\n@pytest.mark.parametrize('value', range({tests}))\ndef test_value(value):\n    pass\n"
+    )
+
+
+def with_logging(directory: Path, tests: int) -> None:
+    (directory / "conftest.py").write_text(CONFTEST_LOGGING)
+    _write_modules(directory, tests, "\n".join(f'    logger.info("message {i} of test")' for i in range(5)))
+
+
+def with_artifacts(directory: Path, tests: int) -> None:
+    (directory / "artifact.txt").write_bytes(os.urandom(1024))
+    _write_modules(directory, tests, "    pass", f'@pytest.mark.artifact("{directory / "artifact.txt"}")\n')
+
+
+class Scenario(NamedTuple):
+    generate: Callable[[Path, int], None]
+    args: List[str] = []
+    requires: Optional[str] = None
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "plain": Scenario(plain),
+    "parametrized": Scenario(parametrized),
+    "xdist": Scenario(plain, ["-p", "xdist", "-n", "4"], requires="xdist"),
+    "logging": Scenario(with_logging),
+    "artifacts": Scenario(with_artifacts),
+}
+
+
+class Measurement(NamedTuple):
+    seconds: float
+    peak_rss_mb: float
+
+
+def _plugin_args() -> List[str]:
+    # Plugin is loaded by entry point only if the package is installed. Python < 3.10 returns entry points
+    # grouped in a dict and does not accept the group argument
+    plugins = entry_points()
+    plugins = plugins.select(group="pytest11") if hasattr(plugins, "select") else plugins.get("pytest11", [])
+    if any(entry.value == "pytest_zebrunner.plugin" for entry in plugins):
+        return []
+    return ["-p", "pytest_zebrunner.plugin"]
+
+
+def run_session(directory: Path, args: List[str], env: Dict[str, str]) -> Measurement:
+    command = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *_plugin_args(), *args]
+    with tempfile.TemporaryFile() as output:
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=directory, env=env, stdout=output, stderr=subprocess.STDOUT)
+        # wait4 reports resource usage of this session only, unlike getrusage(RUSAGE_CHILDREN)
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - started
+        if not os.WIFEXITED(status) or os.WEXITSTATUS(status) != 0:
+            output.seek(0)
+            raise RuntimeError(f"pytest session failed:\n{output.read().decode()}")
+    # ru_maxrss is in kilobytes on Linux
+    return Measurement(seconds, usage.ru_maxrss / 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--setting", action="append", default=[], help="plugin setting as ENV_NAME=value")
+    parser.add_argument("--json", help="save results to the file")
+    args = parser.parse_args()
+
+    settings = dict(setting.split("=", 1) for setting in args.setting)
+    results = []
+    print(
+        f"{'scenario':<14}{'tests':>8}{'off, s':>9}{'on, s':>9}{'ms/test':>9}{'calls':>9}{'sent, KB':>10}{'RSS, MB':>9}"
+    )
+    with StubZebrunnerServer() as stub:
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(SOURCE_DIR), os.environ.get("PYTHONPATH")])),
+            "REPORTING_SERVER_HOSTNAME": stub.url,
+            "REPORTING_SERVER_ACCESS_TOKEN": "stub-token",
+            **settings,
+        }
+        for name in args.scenarios:
+            scenario = SCENARIOS[name]
+            if scenario.requires and importlib.util.find_spec(scenario.requires) is None:
+                print(f"{name:<14}skipped, {scenario.requires} is not installed")
+                continue
+
+            for size in args.sizes:
+                with tempfile.TemporaryDirectory() as directory:
+                    scenario.generate(Path(directory), size)
+                    disabled = run_session(Path(directory), scenario.args, {**env, "REPORTING_ENABLED": "false"})
+                    stub.reset()
+                    enabled = run_session(Path(directory), scenario.args, {**env, "REPORTING_ENABLED": "true"})
+
+                result = {
+                    "scenario": name,
+                    "tests": size,
+                    "disabled_seconds": disabled.seconds,
+                    "enabled_seconds": enabled.seconds,
+                    "overhead_ms_per_test": (enabled.seconds - disabled.seconds) * 1000 / size,
+                    "http_calls": stub.total_calls,
+                    "bytes_sent": stub.bytes_received,
+                    "peak_rss_mb": enabled.peak_rss_mb,
+                }
+                results.append(result)
+                print(
+                    f"{name:<14}{size:>8}{disabled.seconds:>9.2f}{enabled.seconds:>9.2f}"
+                    f"{result['overhead_ms_per_test']:>9.3f}{stub.total_calls:>9}"
+                    f"{stub.bytes_received / 1024:>10.1f}{enabled.peak_rss_mb:>9.1f}"
+                )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"settings": settings, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
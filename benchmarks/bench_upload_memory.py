@@ -0,0 +1,96 @@
+"""
+Peak RSS of a process uploading artifacts and screenshots of growing size to the local Zebrunner stub.
+
+    PYTHONPATH=src python benchmarks/bench_upload_memory.py --sizes 1 64 256
+
+Every upload runs in a fresh subprocess. Uploads are streamed from disk, so peak RSS should not depend on
+file size. Exits with code 1 if RSS grows by more than `--max-growth` megabytes.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from stub_server import StubRequestHandler, StubZebrunnerServer
+
+from pytest_zebrunner.api.client import AsyncZebrunnerAPI
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+class DiscardingRequestHandler(StubRequestHandler):
+    """
+    Counts request body bytes without keeping them in memory.
+    """
+
+    def _read_body(self) -> bytes:
+        remaining = int(self.headers.get("Content-Length") or 0)
+        size = remaining
+        while remaining:
+            remaining -= len(self.rfile.read(min(remaining, 1024 * 1024)))
+        self.server.record(self.command, self.path, size)
+        return b""
+
+    def _handle(self) -> None:
+        self._read_body()
+        self._send_json(200, {"id": self.server.next_id()})
+
+    do_POST = _handle
+
+
+async def upload(url: str, kind: str, path: str) -> None:
+    api = AsyncZebrunnerAPI(url, "")
+    if kind == "artifact":
+        await api.send_artifact(path, 1, 1)
+    else:
+        await api.send_screenshot(1, 1, path)
+    await api.close()
+
+
+def measure(url: str, kind: str, path: str) -> float:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SOURCE_DIR), os.environ.get("PYTHONPATH")]))}
+    process = subprocess.Popen([sys.executable, __file__, "--upload", url, kind, path], env=env)
+    _, status, usage = os.wait4(process.pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError(f"Upload of {path} failed")
+    # ru_maxrss is in kilobytes on Linux
+    return usage.ru_maxrss / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 64, 256], help="file sizes in megabytes")
+    parser.add_argument("--max-growth", type=float, default=32.0, help="allowed RSS growth, megabytes")
+    parser.add_argument("--upload", nargs=3, metavar=("URL", "KIND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.upload:
+        asyncio.run(upload(*args.upload))
+        return
+
+    print(f"{'kind':<12}{'size, MB':>10}{'RSS, MB':>10}")
+    growth = {}
+    with StubZebrunnerServer(DiscardingRequestHandler) as stub, tempfile.TemporaryDirectory() as directory:
+        for kind in ("artifact", "screenshot"):
+            rss = []
+            for size in args.sizes:
+                path = Path(directory) / f"file-{size}.bin"
+                with open(path, "wb") as file:
+                    for _ in range(size):
+                        file.write(os.urandom(1024 * 1024))
+                rss.append(measure(stub.url, kind, str(path)))
+                print(f"{kind:<12}{size:>10}{rss[-1]:>10.1f}", flush=True)
+            growth[kind] = max(rss) - min(rss)
+
+    failed = {kind: value for kind, value in growth.items() if value > args.max_growth}
+    for kind, value in failed.items():
+        print(f"FAILED {kind}: peak RSS grew by {value:.1f} MB")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
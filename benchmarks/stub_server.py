@@ -0,0 +1,101 @@
+"""
+Local stand-in for Zebrunner API used by benchmarks. Answers every request with a new id and counts calls and bytes.
+"""
+
+import itertools
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "StubZebrunnerServer"
+
+    def setup(self) -> None:
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send_json(self, status: int, data: Any) -> None:
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _handle(self) -> None:
+        body = self._read_body()
+        self.server.record(self.command, self.path, len(body))
+        self._send_json(200, {"id": self.server.next_id(), "authToken": "stub-token"})
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class StubZebrunnerServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, handler: type = StubRequestHandler) -> None:
+        super().__init__(("127.0.0.1", 0), handler)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+        self.bytes_received = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self._ids)
+
+    def record(self, method: str, path: str, size: int) -> None:
+        with self._lock:
+            key = f"{method} {path.split('?')[0]}"
+            self.calls[key] = self.calls.get(key, 0) + 1
+            self.bytes_received += size
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = {}
+            self.bytes_received = 0
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def __enter__(self) -> "StubZebrunnerServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    with StubZebrunnerServer() as stub:
+        print(stub.url, flush=True)
+        stub._thread.join()
@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from collections import Counter
+from enum import Enum
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker shared by all Zebrunner endpoints. Opens after `failure_threshold` consecutive failures
+    or responses slower than `latency_slo` seconds. While open, requests are rejected right away. After
+    `recovery_timeout` seconds a single probe request is let through: success closes the circuit,
+    failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        latency_slo: Optional[float] = None,
+        recovery_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.latency_slo = latency_slo
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.transitions: Counter = Counter()
+        self.rejected_requests = 0
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    @property
+    def accepts_requests(self) -> bool:
+        """
+        True if next request would be sent to Zebrunner.
+        """
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN:
+                return not self._probe_in_flight
+            return self._clock() >= self._opened_at + self.recovery_timeout
+
+    def time_until_probe(self) -> float:
+        with self._lock:
+            if self._state != CircuitState.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.recovery_timeout - self._clock())
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == CircuitState.OPEN and self._clock() >= self._opened_at + self.recovery_timeout:
+                self._transition(CircuitState.HALF_OPEN, "probing Zebrunner availability")
+            if self._state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            if self._state == CircuitState.CLOSED:
+                return True
+
+            self.rejected_requests += 1
+            return False
+
+    def record_success(self, latency: float) -> None:
+        if self.latency_slo is not None and latency > self.latency_slo:
+            self.record_failure(f"response took {latency:.1f}s")
+            return
+
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self._state != CircuitState.CLOSED:
+                self._transition(CircuitState.CLOSED, "Zebrunner is available again")
+
+    def record_failure(self, reason: str = "request failed") -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == CircuitState.HALF_OPEN:
+                self._open(f"probe failed: {reason}")
+            elif self._state == CircuitState.CLOSED and self._failures >= self.failure_threshold:
+                self._open(f"{self._failures} consecutive failures, last one: {reason}")
+
+    def _open(self, reason: str) -> None:
+        self._opened_at = self._clock()
+        self._transition(CircuitState.OPEN, f"{reason}. Next probe in {self.recovery_timeout:.0f}s")
+
+    def _transition(self, state: CircuitState, reason: str) -> None:
+        self.transitions[f"{self._state.value} -> {state.value}"] += 1
+        logger.warning(f"Zebrunner circuit breaker {self._state.value} -> {state.value}: {reason}")
+        self._state = state
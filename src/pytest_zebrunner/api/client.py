@@ -1,15 +1,19 @@
-import functools
+import asyncio
 import json
 import logging
+import threading
 import time
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from pathlib import Path
 from pprint import pformat
-from typing import List, Optional, Union
+from typing import Any, Coroutine, List, Optional, Tuple, TypeVar, Union
 
 import httpx
-from httpx import Client, Request, Response
+from httpx import AsyncClient, Request, Response
 
+from pytest_zebrunner.api.circuit_breaker import CircuitBreaker
+from pytest_zebrunner.api.compression import Compressor
 from pytest_zebrunner.api.models import (
     ArtifactReferenceModel,
     AttachTestsToSessionModel,
@@ -23,11 +27,21 @@ from pytest_zebrunner.api.models import (
     StartTestRunModel,
     StartTestSessionModel,
 )
-from pytest_zebrunner.errors import AgentApiError
+from pytest_zebrunner.api.retry import RetryBudget, RetryPolicy, sleep_time
+from pytest_zebrunner.api.serialization import (
+    JSON_HEADERS,
+    json_array_chunks,
+    json_content,
+)
+from pytest_zebrunner.api.uploads import file_content, multipart_file_content
+from pytest_zebrunner.errors import AgentApiError, CircuitOpenError
+from pytest_zebrunner.settings import ContentEncoding, ServerSettings
 from pytest_zebrunner.utils import Singleton
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def log_response(response: Response, log_level: int = logging.DEBUG) -> None:
     """Logger customized configuration"""
@@ -44,40 +58,69 @@ def log_response(response: Response, log_level: int = logging.DEBUG) -> None:
     )
 
 
-def retry(method, times: int = 6, first_wait: float = 5):
-    """
-    Wrapper for retry to connect and wait between retries.
-    """
-
-    def wrapper(*args, **kwargs):
-        for x in range(times):
-            try:
-                result = method(*args, **kwargs)
-            except AgentApiError as e:
-                logger.error(e)
-                if x != times:
-                    logger.info(f"Retry number: {x + 1}")
-                    time.sleep(first_wait * (2**x))
-            else:
-                return result
-
-    return wrapper
+def _response_body(response: Response) -> Any:
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
 
 
-class ZebrunnerAPI(metaclass=Singleton):
+class AsyncZebrunnerAPI:
     """
-    A singleton Zebrunner API representation
+    Asynchronous Zebrunner API representation. Must be used from a single event loop
     """
 
-    _authenticated = False
+    def __init__(self, service_url: str, access_token: str, settings: Optional[ServerSettings] = None):
+        self.service_url = service_url.rstrip("/")
+        self.access_token = access_token
+        self._client = self._create_client(settings)
+        self._auth_token: Optional[str] = None
+        self._authenticated = False
+        # Time the auth token expires at in seconds since epoch, it is shared with other processes
+        self.auth_expires_at: Optional[float] = None
+        self.auth_refresh_margin = settings.auth.refresh_margin if settings is not None else 60.0
+        self.max_request_size = settings.max_request_size if settings is not None else 4 * 1024 * 1024
+        self.compressor: Optional[Compressor] = None
+        if settings is not None and settings.compression.encoding != ContentEncoding.IDENTITY:
+            self.compressor = Compressor(**settings.compression.dict())
+        self.retry_budget = RetryBudget(settings.retry.budget if settings is not None else 0)
+        retry_options = settings.retry.dict(exclude={"budget"}) if settings is not None else {"attempts": 1}
+        # Repeating these requests does not change the result. Creation requests are idempotent because
+        # Zebrunner identifies test runs and tests by uuid generated by the agent
+        self._idempotent = RetryPolicy(**retry_options)
+        self._not_idempotent = self._idempotent._replace(idempotent=False)
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        if settings is not None and settings.circuit_breaker.enabled:
+            self.circuit_breaker = CircuitBreaker(
+                settings.circuit_breaker.failure_threshold,
+                settings.circuit_breaker.latency_slo,
+                settings.circuit_breaker.recovery_timeout,
+            )
 
-    def __init__(self, service_url: str = None, access_token: str = None):
-        if service_url and access_token:
-            self.service_url = service_url.rstrip("/")
-            self.access_token = access_token
-            self._client = Client(timeout=60.0)
-            self._auth_token = None
-            self._authenticated = False
+    @staticmethod
+    def _create_client(settings: Optional[ServerSettings]) -> AsyncClient:
+        """
+        Creates http client with connection pool and timeouts configured by server settings.
+        """
+        if settings is None:
+            return AsyncClient(timeout=60.0)
+
+        timeout = httpx.Timeout(
+            connect=settings.connect_timeout,
+            read=settings.read_timeout,
+            write=settings.write_timeout,
+            pool=settings.pool_timeout,
+        )
+        limits = httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        )
+        try:
+            return AsyncClient(timeout=timeout, limits=limits, http2=settings.http2)
+        except ImportError:
+            logger.warning("HTTP/2 support requires 'h2' package. Install 'httpx[http2]'. Falling back to HTTP/1.1")
+            return AsyncClient(timeout=timeout, limits=limits)
 
     def _sign_request(self, request: Request) -> Request:
         """
@@ -86,8 +129,74 @@ class ZebrunnerAPI(metaclass=Singleton):
         request.headers["Authorization"] = f"Bearer {self._auth_token}"
         return request
 
-    @retry
-    def auth(self) -> None:
+    async def _request(
+        self, method: str, url: str, error_message: str, policy: Optional[RetryPolicy] = None, **kwargs: Any
+    ) -> Response:
+        """
+        Send request to Zebrunner retrying it according to the policy. Raise AgentApiError if request failed
+        or response is not successful
+        """
+        policy = policy or self._not_idempotent
+        content = kwargs.get("content")
+        if self.compressor is not None and isinstance(content, bytes):
+            # Compressed once, retries send the same body
+            content, headers = self.compressor.compress(content)
+            kwargs = {**kwargs, "content": content, "headers": {**kwargs.get("headers", {}), **headers}}
+        attempt = 0
+        while True:
+            response, request_error = await self._send(method, url, error_message, **kwargs)
+            if response is not None and response.is_success:
+                return response
+
+            if request_error is not None:
+                error = AgentApiError(error_message, request_error)
+                retry_allowed = policy.should_retry(error=request_error)
+            else:
+                error = AgentApiError(
+                    f"{error_message}. Non successful status code",
+                    {"status_code": response.status_code, "body": _response_body(response)},  # type: ignore
+                )
+                retry_allowed = policy.should_retry(status_code=response.status_code)  # type: ignore
+
+            attempt += 1
+            if not retry_allowed or attempt >= policy.attempts:
+                raise error
+
+            delay = sleep_time(policy, attempt - 1, response)
+            if not self.retry_budget.acquire(delay):
+                logger.warning(f"{error_message}. Retry budget is exhausted")
+                raise error
+
+            logger.info(f"{error_message}. Retry {attempt}/{policy.attempts - 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _send(
+        self, method: str, url: str, error_message: str, **kwargs: Any
+    ) -> Tuple[Optional[Response], Optional[httpx.RequestError]]:
+        """
+        Send request once and report its outcome to the circuit breaker
+        """
+        breaker = self.circuit_breaker
+        if breaker is not None and not breaker.allow_request():
+            raise CircuitOpenError(f"{error_message}. Zebrunner is unavailable, request was not sent")
+
+        started = time.monotonic()
+        try:
+            response = await self._client.request(method, url, **kwargs)
+        except httpx.RequestError as e:
+            if breaker is not None:
+                breaker.record_failure(repr(e))
+            return None, e
+
+        if breaker is not None:
+            if response.status_code >= 500:
+                breaker.record_failure(f"status code {response.status_code}")
+            else:
+                breaker.record_success(time.monotonic() - started)
+
+        return response, None
+
+    async def auth(self) -> None:
         """
         Validates the user access token with http post method and if it is correct, authenticates the user.
         """
@@ -95,158 +204,129 @@ class ZebrunnerAPI(metaclass=Singleton):
             return
 
         url = f"{self.service_url}/api/iam/v1/auth/refresh"
-        try:
-            response = self._client.post(url, json={"refreshToken": self.access_token})
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to authorize zebrunner agent", e)
+        response = await self._request(
+            "POST",
+            url,
+            "Failed to authorize zebrunner agent",
+            policy=self._idempotent,
+            **json_content({"refreshToken": self.access_token}),
+        )
 
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to authorize zebrunner agent", {"status_code": response.status_code, "body": response.json()}
-            )
+        data = response.json()
+        expires_in = data.get("authTokenExpirationInSecs")
+        self.use_auth_token(data["authToken"], time.time() + expires_in if expires_in is not None else None)
 
-        self._auth_token = response.json()["authToken"]
+    def use_auth_token(self, auth_token: str, expires_at: Optional[float] = None) -> None:
+        """
+        Sign next requests with the auth token, e.g. obtained by another process.
+        """
+        self._auth_token = auth_token
+        self.auth_expires_at = expires_at
         self._client.auth = self._sign_request  # type: ignore
         self._authenticated = True
 
-    def start_test_run(self, project_key: str, body: StartTestRunModel) -> Optional[int]:
+    @property
+    def auth_expires_soon(self) -> bool:
+        """
+        Returns True if the auth token expires within refresh margin and should be refreshed.
+        """
+        return self.auth_expires_at is not None and time.time() >= self.auth_expires_at - self.auth_refresh_margin
+
+    async def start_test_run(self, project_key: str, body: StartTestRunModel) -> Optional[int]:
         """
         Send POST request creating new test run. Raise ApiAgentException if request failed
         """
         url = f"{self.service_url}/api/reporting/v1/test-runs"
-
-        try:
-            response = self._client.post(
-                url, params={"projectKey": project_key}, json=body.dict(exclude_none=True, by_alias=True)
-            )
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to create test run", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to create test run. Non successful response code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
+        response = await self._request(
+            "POST",
+            url,
+            "Failed to create test run",
+            policy=self._idempotent,
+            params={"projectKey": project_key},
+            **json_content(body),
+        )
         return response.json()["id"]
 
-    def start_test(self, test_run_id: int, body: StartTestModel) -> Optional[int]:
+    async def start_test(self, test_run_id: int, body: StartTestModel) -> Optional[int]:
         """
         Send POST request creating new test. Raise AgentApiError in case of any exceptions
         """
         url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/tests"
-
-        try:
-            response = self._client.post(url, json=body.dict(exclude_none=True, by_alias=True))
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to create test", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to create test. Non successful response code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
+        response = await self._request(
+            "POST",
+            url,
+            "Failed to create test",
+            policy=self._idempotent,
+            **json_content(body),
+        )
         return response.json()["id"]
 
-    def update_test(self, test_run_id: int, test_id: int, test: StartTestModel) -> Optional[int]:
+    async def update_test(self, test_run_id: int, test_id: int, test: StartTestModel) -> Optional[int]:
         """
         Send PUT request updating some test. Raise AgentApiError in case of any exceptions
         """
-
         url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/tests/{test_id}/"
-        try:
-            response = self._client.post(url, json=test.dict(exclude_none=True, by_alias=True))
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to update test", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to update test. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
+        response = await self._request(
+            "POST",
+            url,
+            "Failed to update test",
+            policy=self._idempotent,
+            **json_content(test),
+        )
         return response.json()["id"]
 
-    def finish_test(self, test_run_id: int, test_id: int, body: FinishTestModel) -> None:
+    async def finish_test(self, test_run_id: int, test_id: int, body: FinishTestModel) -> None:
         """
         Send PUT request finishing current test. Raise AgentApiError in case of any exceptions
         """
         url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/tests/{test_id}"
+        await self._request(
+            "PUT",
+            url,
+            "Failed to finish test",
+            policy=self._idempotent,
+            **json_content(body),
+        )
 
-        try:
-            response = self._client.put(url, json=body.dict(exclude_none=True, by_alias=True))
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to finish test", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to finish test. Non  successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
-    def finish_test_run(self, test_run_id: int) -> None:
+    async def finish_test_run(self, test_run_id: int) -> None:
         """
         Send PUT request finishing current test run. Raise AgentApiError in case of any exceptions
         """
         url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}"
-        try:
-            response = self._client.put(
-                url,
-                json={"endedAt": (datetime.utcnow().replace(tzinfo=timezone.utc).isoformat())},
-            )
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to finish test run", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to finish test run. Non  successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
+        await self._request(
+            "PUT",
+            url,
+            "Failed to finish test run",
+            policy=self._idempotent,
+            **json_content({"endedAt": (datetime.utcnow().replace(tzinfo=timezone.utc).isoformat())}),
+        )
 
-    def send_logs(self, test_run_id: int, logs: List[LogRecordModel]) -> None:
+    async def send_logs(self, test_run_id: int, logs: List[LogRecordModel]) -> None:
         """
-        Send POST request uploading logs. Raise AgentApiError in case of any exceptions
+        Send POST requests uploading logs. Large batches are split into requests of at most max_request_size bytes.
+        Raise AgentApiError in case of any exceptions
         """
         url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/logs"
-
-        body = [x.dict(exclude_none=True, by_alias=True) for x in logs]
-        try:
-            response = self._client.post(url, json=body)
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to send logs", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to send logs. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
-    def send_screenshot(self, test_run_id: int, test_id: int, image_path: Union[str, Path]) -> None:
+        for content in json_array_chunks(logs, self.max_request_size):
+            await self._request("POST", url, "Failed to send logs", content=content, headers=JSON_HEADERS)
+
+    async def send_screenshot(
+        self,
+        test_run_id: int,
+        test_id: int,
+        image_path: Union[str, Path],
+        content_type: str = "image/png",
+        captured_at: Optional[int] = None,
+    ) -> None:
         """
         Send screenshot to zebrunner. Raise AgentApiError in case of any exceptions
         """
         url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/tests/{test_id}/screenshots"
-        with open(image_path, "rb") as image:
-            try:
-                response = self._client.post(
-                    url,
-                    content=image.read(),
-                    headers={
-                        "Content-Type": "image/png",
-                        "x-zbr-screenshot-captured-at": str(round(time.time() * 1000)),
-                    },
-                )
-            except httpx.RequestError as e:
-                raise AgentApiError("Failed to send screenshot", e)
-
-            if not response.is_success:
-                raise AgentApiError(
-                    "Failed to send screenshot. Non successful status code",
-                    {"status_code": response.status_code, "body": response.json()},
-                )
+        upload = file_content(image_path, content_type)
+        upload["headers"]["x-zbr-screenshot-captured-at"] = str(captured_at or round(time.time() * 1000))
+        await self._request("POST", url, "Failed to send screenshot", **upload)
 
-    def send_artifact(self, filename: Union[str, Path], test_run_id: int, test_id: Optional[int] = None) -> None:
+    async def send_artifact(self, filename: Union[str, Path], test_run_id: int, test_id: Optional[int] = None) -> None:
         """
         Send artifact to zebrunner. Attach it to test run if test_id is None else attach it to test.
         Raise AgentApiError in case of any exceptions
@@ -256,19 +336,9 @@ class ZebrunnerAPI(metaclass=Singleton):
         else:
             url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/artifacts"
 
-        with open(filename, "rb") as file:
-            try:
-                response = self._client.post(url, files={"file": file})
-            except httpx.RequestError as e:
-                raise AgentApiError("Failed to send artifact", e)
-
-            if not response.is_success:
-                raise AgentApiError(
-                    "Failed to send artifact. Non successful status code",
-                    {"status_code": response.status_code, "body": response.json()},
-                )
+        await self._request("POST", url, "Failed to send artifact", **multipart_file_content(filename))
 
-    def send_artifact_references(
+    async def send_artifact_references(
         self, references: List[ArtifactReferenceModel], test_run_id: int, test_id: Optional[int] = None
     ) -> None:
         """
@@ -279,20 +349,15 @@ class ZebrunnerAPI(metaclass=Singleton):
             url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/tests/{test_id}/artifact-references"
         else:
             url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/artifact-references/"
-        json_items = [item.dict(exclude_none=True, by_alias=True) for item in references]
+        await self._request(
+            "PUT",
+            url,
+            "Failed to send artifact reference",
+            policy=self._idempotent,
+            **json_content({"items": references}),
+        )
 
-        try:
-            response = self._client.put(url, json={"items": json_items})
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to send artifact reference", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to send artifact reference. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
-    def send_labels(self, labels: List[LabelModel], test_run_id: int, test_id: Optional[int] = None) -> None:
+    async def send_labels(self, labels: List[LabelModel], test_run_id: int, test_id: Optional[int] = None) -> None:
         """
         Send labels to zebrunner. Attach it to test run if test_id is None else attach it to test.
         Raise AgentApiError in case of any exceptions
@@ -301,86 +366,52 @@ class ZebrunnerAPI(metaclass=Singleton):
             url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/tests/{test_id}/labels"
         else:
             url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/labels"
-        labels_json = [label.dict(exclude_none=True, by_alias=True) for label in labels]
-
-        try:
-            response = self._client.put(url, json={"items": labels_json})
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to send labels", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to send labels. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
+        await self._request(
+            "PUT", url, "Failed to send labels", policy=self._idempotent, **json_content({"items": labels})
+        )
 
-    def start_test_session(self, test_run_id: int, body: StartTestSessionModel) -> Optional[str]:
+    async def start_test_session(self, test_run_id: int, body: StartTestSessionModel) -> Optional[str]:
         """
         Send POST request starting test session. Raise AgentApiError in case of any exceptions
         """
         url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/test-sessions"
-
-        try:
-            response = self._client.post(url, json=body.dict(exclude_none=True, by_alias=True))
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to start session", e)
-
-        if not response.status_code == 200:
-            raise AgentApiError(
-                "Failed to start session. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
+        response = await self._request("POST", url, "Failed to start session", **json_content(body))
         return response.json().get("id")
 
-    def add_tests_to_session(self, test_run_id: int, session_id: str, related_tests: List[int]) -> None:
+    async def add_tests_to_session(self, test_run_id: int, session_id: str, related_tests: List[int]) -> None:
         """
         Send PUT request attaching new test to test session. Raise AgentApiError in case of any exceptions
         """
         url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/test-sessions/{session_id}"
         body = AttachTestsToSessionModel(test_ids=related_tests)
-        try:
-            response = self._client.put(url, json=body.dict(exclude_none=True, by_alias=True))
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to attach tests to session", e)
+        await self._request(
+            "PUT",
+            url,
+            "Failed to attach tests to session",
+            policy=self._idempotent,
+            **json_content(body),
+        )
 
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to attach tests to session. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
-    def finish_test_session(self, test_run_id: int, test_id: str, body: FinishTestSessionModel) -> None:
+    async def finish_test_session(self, test_run_id: int, test_id: str, body: FinishTestSessionModel) -> None:
         """
         Send PUT request finishing test session. Raise AgentApiError in case of any exceptions
         """
         url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/test-sessions/{test_id}"
-        try:
-            response = self._client.put(url, json=body.dict(exclude_none=True, by_alias=True))
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to start session", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to finish session. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
-    @retry
-    def get_rerun_tests(self, run_context: str) -> RerunDataModel:
+        await self._request(
+            "PUT",
+            url,
+            "Failed to finish session",
+            policy=self._idempotent,
+            **json_content(body),
+        )
+
+    async def get_rerun_tests(self, run_context: str) -> RerunDataModel:
         """Exchange run context on tests to run. Raise AgentApiError in case of any exceptions"""
         url = f"{self.service_url}/api/reporting/v1/run-context-exchanges"
         run_context_dict = json.loads(run_context)
-        try:
-            response = self._client.post(url, json=run_context_dict)
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to get rerun tests", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to get rerun tests. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
+        response = await self._request(
+            "POST", url, "Failed to get rerun tests", policy=self._idempotent, **json_content(run_context_dict)
+        )
 
         response_data = response.json()
         for test in response_data["testsToRun"]:
@@ -388,60 +419,173 @@ class ZebrunnerAPI(metaclass=Singleton):
 
         return RerunDataModel(**response_data)
 
-    def reverse_test_registration(self, test_run_id: int, test_id: int) -> None:
+    async def reverse_test_registration(self, test_run_id: int, test_id: int) -> None:
         """Send PUT request reversing test registration. Raise AgentApiError in case of any exceptions"""
-
         url = f"{self.service_url}/api/reporting/v1/test-runs/{test_run_id}/tests/{test_id}"
+        await self._request("DELETE", url, "Failed to revert test registration", policy=self._idempotent)
 
-        try:
-            response = self._client.delete(url)
-        except httpx.RequestError as e:
-            raise AgentApiError("Failed to revert test registration", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to revert test registration. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
-    def set_test_run_platform(self, run_id: int, platform: PlatformModel) -> None:
+    async def set_test_run_platform(self, run_id: int, platform: PlatformModel) -> None:
         """Update test run platform. Raise AgentApiError in case of any exceptions"""
         url = f"{self.service_url}/api/reporting/v1/test-runs/{run_id}/platform"
-
-        try:
-            response = self._client.put(url, json=platform.dict(exclude_none=True, by_alias=True))
-        except httpx.RequestError as e:
-            raise AgentApiError("failed to set test run platform", e)
-
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to set test run platform. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
-
-    def patch_test_run_build(self, run_id: int, build: str) -> None:
+        await self._request(
+            "PUT",
+            url,
+            "Failed to set test run platform",
+            policy=self._idempotent,
+            **json_content(platform),
+        )
+
+    async def patch_test_run_build(self, run_id: int, build: str) -> None:
         """Set test run build. Raise AgentApiError in case of any exceptions"""
         url = f"{self.service_url}/api/reporting/v1/test-runs/{run_id}"
-
         body = {
             "op": "replace",
             "path": "/config/build",
             "value": build,
         }
+        await self._request(
+            "PATCH", url, "Failed to patch test run build", policy=self._idempotent, **json_content([body])
+        )
 
-        try:
-            response = self._client.patch(url, json=[body])
-        except httpx.RequestError as e:
-            raise AgentApiError("failed to patch test run build", e)
+    async def close(self) -> None:
+        """
+        Close the connection pool.
+        """
+        await self._client.aclose()
 
-        if not response.is_success:
-            raise AgentApiError(
-                "Failed to patch test run platform. Non successful status code",
-                {"status_code": response.status_code, "body": response.json()},
-            )
+
+class _EventLoopThread:
+    """
+    Private event loop running in a daemon thread
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="zebrunner-api-loop", daemon=True)
+        self._thread.start()
+
+    def submit(self, coroutine: Coroutine[Any, Any, T]) -> "Future[T]":
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class ZebrunnerAPI(metaclass=Singleton):
+    """
+    A singleton Zebrunner API representation. Synchronous facade over AsyncZebrunnerAPI that runs it
+    on a private event loop. Every call blocks until its response arrives, so requests of one thread are sent
+    one after another. Only requests of different threads (reporting pipeline sender, log shipper, upload workers)
+    are in flight at the same time, sharing the connection pool
+    """
+
+    def __init__(self, service_url: str = None, access_token: str = None, settings: Optional[ServerSettings] = None):
+        if service_url and access_token:
+            self.service_url = service_url.rstrip("/")
+            self.access_token = access_token
+            self._loop = _EventLoopThread()
+            self._api = AsyncZebrunnerAPI(service_url, access_token, settings)
+
+    @property
+    def _authenticated(self) -> bool:
+        api = getattr(self, "_api", None)
+        return api is not None and api._authenticated and not api.auth_expires_soon
+
+    @property
+    def auth_token(self) -> Optional[Tuple[str, Optional[float]]]:
+        """
+        Returns auth token and time it expires at or None if the agent is not authorized.
+        """
+        api = getattr(self, "_api", None)
+        if api is None or not api._authenticated:
+            return None
+        return api._auth_token, api.auth_expires_at
+
+    def use_auth_token(self, auth_token: str, expires_at: Optional[float] = None) -> None:
+        # Only sets attributes, so it is safe to call outside of the event loop
+        self._api.use_auth_token(auth_token, expires_at)
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        return self._api.circuit_breaker
+
+    def _call(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        return self._loop.submit(coroutine).result()
+
+    def auth(self) -> None:
+        self._call(self._api.auth())
+
+    def start_test_run(self, project_key: str, body: StartTestRunModel) -> Optional[int]:
+        return self._call(self._api.start_test_run(project_key, body))
+
+    def start_test(self, test_run_id: int, body: StartTestModel) -> Optional[int]:
+        return self._call(self._api.start_test(test_run_id, body))
+
+    def update_test(self, test_run_id: int, test_id: int, test: StartTestModel) -> Optional[int]:
+        return self._call(self._api.update_test(test_run_id, test_id, test))
+
+    def finish_test(self, test_run_id: int, test_id: int, body: FinishTestModel) -> None:
+        self._call(self._api.finish_test(test_run_id, test_id, body))
+
+    def finish_test_run(self, test_run_id: int) -> None:
+        self._call(self._api.finish_test_run(test_run_id))
+
+    def send_logs(self, test_run_id: int, logs: List[LogRecordModel]) -> None:
+        self._call(self._api.send_logs(test_run_id, logs))
+
+    def send_screenshot(
+        self,
+        test_run_id: int,
+        test_id: int,
+        image_path: Union[str, Path],
+        content_type: str = "image/png",
+        captured_at: Optional[int] = None,
+    ) -> None:
+        self._call(self._api.send_screenshot(test_run_id, test_id, image_path, content_type, captured_at))
+
+    def send_artifact(self, filename: Union[str, Path], test_run_id: int, test_id: Optional[int] = None) -> None:
+        self._call(self._api.send_artifact(filename, test_run_id, test_id))
+
+    def send_artifact_references(
+        self, references: List[ArtifactReferenceModel], test_run_id: int, test_id: Optional[int] = None
+    ) -> None:
+        self._call(self._api.send_artifact_references(references, test_run_id, test_id))
+
+    def send_labels(self, labels: List[LabelModel], test_run_id: int, test_id: Optional[int] = None) -> None:
+        self._call(self._api.send_labels(labels, test_run_id, test_id))
+
+    def start_test_session(self, test_run_id: int, body: StartTestSessionModel) -> Optional[str]:
+        return self._call(self._api.start_test_session(test_run_id, body))
+
+    def add_tests_to_session(self, test_run_id: int, session_id: str, related_tests: List[int]) -> None:
+        self._call(self._api.add_tests_to_session(test_run_id, session_id, related_tests))
+
+    def finish_test_session(self, test_run_id: int, test_id: str, body: FinishTestSessionModel) -> None:
+        self._call(self._api.finish_test_session(test_run_id, test_id, body))
+
+    def get_rerun_tests(self, run_context: str) -> RerunDataModel:
+        return self._call(self._api.get_rerun_tests(run_context))
+
+    def reverse_test_registration(self, test_run_id: int, test_id: int) -> None:
+        self._call(self._api.reverse_test_registration(test_run_id, test_id))
+
+    def set_test_run_platform(self, run_id: int, platform: PlatformModel) -> None:
+        self._call(self._api.set_test_run_platform(run_id, platform))
+
+    def patch_test_run_build(self, run_id: int, build: str) -> None:
+        self._call(self._api.patch_test_run_build(run_id, build))
 
     def close(self) -> None:
         """
-        Close the connection pool without block-usage.
+        Close the connection pool and stop the event loop.
         """
-        self._client.close()
+        self._call(self._api.close())
+        self._loop.stop()
+        breaker = self.circuit_breaker
+        if breaker is not None and breaker.transitions:
+            logger.warning(
+                f"Zebrunner circuit breaker transitions: {dict(breaker.transitions)}, "
+                f"rejected requests: {breaker.rejected_requests}"
+            )
@@ -0,0 +1,47 @@
+import gzip
+import logging
+from typing import Dict, Optional, Tuple
+
+from pytest_zebrunner.settings import ContentEncoding
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEVELS = {ContentEncoding.GZIP: 6, ContentEncoding.ZSTD: 3}
+
+
+class Compressor:
+    """
+    Compresses request bodies of at least `threshold` bytes. Small bodies fit into a single packet anyway,
+    so compressing them only costs CPU. Falls back to gzip if zstd is requested but zstandard is not installed.
+    """
+
+    def __init__(
+        self, encoding: ContentEncoding = ContentEncoding.GZIP, threshold: int = 1024, level: Optional[int] = None
+    ) -> None:
+        if encoding == ContentEncoding.ZSTD and zstandard is None:
+            logger.warning("zstd compression requires 'zstandard' package, request bodies are compressed with gzip")
+            encoding = ContentEncoding.GZIP
+        self.encoding = encoding
+        self.threshold = threshold
+        self.level = level if level is not None else DEFAULT_LEVELS.get(encoding)
+        self._zstd = zstandard.ZstdCompressor(level=self.level) if encoding == ContentEncoding.ZSTD else None
+
+    def compress(self, content: bytes) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Returns request body to send and headers to add to the request.
+        """
+        if self.encoding == ContentEncoding.IDENTITY or len(content) < self.threshold:
+            return content, {}
+        if self._zstd is not None:
+            compressed = self._zstd.compress(content)
+        else:
+            # Constant mtime keeps the output reproducible
+            compressed = gzip.compress(content, compresslevel=self.level, mtime=0)  # type: ignore
+        if len(compressed) >= len(content):
+            return content, {}
+        return compressed, {"Content-Encoding": self.encoding.value}
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
@@ -63,6 +63,59 @@ def to_camel_case(key: str) -> str:
     return "".join(parts)
 
 
+class Record:
+    """
+    Lightweight payload created for every test or log record. Unlike pydantic models, values are not validated
+    and camelCase field names are computed once per class. Fields are listed in `__slots__`.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+    _defaults: Dict[str, Any] = {}
+    _factories: Dict[str, Callable[[], Any]] = {}
+    _aliases: Tuple[Tuple[str, str], ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._aliases = tuple((name, to_camel_case(name)) for name in cls.__slots__)
+
+    def __init__(self, **fields: Any) -> None:
+        for name in self.__slots__:
+            if name in fields:
+                value = fields.pop(name)
+            elif name in self._defaults:
+                value = self._defaults[name]
+            elif name in self._factories:
+                value = self._factories[name]()
+            else:
+                raise TypeError(f"{self.__class__.__name__} missing required field '{name}'")
+            setattr(self, name, value)
+        if fields:
+            raise TypeError(f"{self.__class__.__name__} got unexpected fields {', '.join(fields)}")
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        return ((name, getattr(self, name)) for name in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and all(value == getattr(other, name) for name, value in self)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self)
+        return f"{self.__class__.__name__}({fields})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns JSON payload with camelCase keys. Fields set to None are omitted.
+        """
+        data = {}
+        for name, alias in self._aliases:
+            value = getattr(self, name)
+            if value is not None:
+                data[alias] = value
+        return data
+
+
 class CamelModel(BaseModel):
     class Config:
         alias_generator = to_camel_case
@@ -107,39 +160,50 @@ class StartTestRunModel(CamelModel):
     notifications: Optional[NotificationsModel] = None
 
 
-class LabelModel(CamelModel):
-    key: str
-    value: str
+class LabelModel(Record):
+    __slots__ = ("key", "value")
+
+    def __init__(self, key: Any, value: Any) -> None:
+        # Labels may be given as any values, e.g. @pytest.mark.label("priority", 1), Zebrunner expects strings
+        super().__init__(key=str(key), value=str(value))
 
 
 class CorrelationDataModel(CamelModel):
     name: str
+    # Absent in correlation data of tests reported by older agent versions
+    node_id: Optional[str] = None
 
 
-class StartTestModel(CamelModel):
-    name: str
-    class_name: str
-    method_name: str
-    uuid: str = Field(default_factory=generate_uuid)
-    started_at: str = Field(default_factory=generate_datetime_str)
+class StartTestModel(Record):
+    __slots__ = (
+        "name",
+        "class_name",
+        "method_name",
+        "uuid",
+        "started_at",
+        "correlation_data",
+        "maintainer",
+        "test_case",
+        "labels",
+    )
+    _defaults = {"correlation_data": None, "maintainer": None, "test_case": None}
+    _factories = {"uuid": generate_uuid, "started_at": generate_datetime_str, "labels": list}
 
-    correlation_data: Optional[str] = None
-    maintainer: Optional[str] = None
-    test_case: Optional[str] = None
-    labels: Optional[List[LabelModel]] = []
 
+class FinishTestModel(Record):
+    __slots__ = ("result", "ended_at", "reason")
+    _defaults = {"reason": None}
+    _factories = {"ended_at": generate_datetime_str}
 
-class FinishTestModel(CamelModel):
-    result: str
-    ended_at: str = Field(default_factory=generate_datetime_str)
-    reason: Optional[str] = None
 
+class LogRecordModel(Record):
+    __slots__ = ("test_id", "level", "timestamp", "message")
 
-class LogRecordModel(CamelModel):
-    test_id: str
-    level: str
-    timestamp: str
-    message: str
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        # Test id is resolved to int in background reporting mode, Zebrunner expects a string
+        data["testId"] = str(data["testId"])
+        return data
 
 
 class StartTestSessionModel(CamelModel):
@@ -159,9 +223,8 @@ class AttachTestsToSessionModel(CamelModel):
     test_ids: List[int] = []
 
 
-class ArtifactReferenceModel(CamelModel):
-    name: str
-    value: str
+class ArtifactReferenceModel(Record):
+    __slots__ = ("name", "value")
 
 
 class TestModel(CamelModel):
@@ -0,0 +1,81 @@
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, NamedTuple, Optional
+
+import httpx
+
+# Errors raised before request reached the server. Retrying them is safe for any endpoint
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class RetryPolicy(NamedTuple):
+    """
+    Retry policy of an endpoint. Non idempotent endpoints are retried only if the request did not reach
+    the server or was rejected with one of `rejected_statuses`.
+    """
+
+    attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    idempotent: bool = True
+    retry_statuses: FrozenSet[int] = frozenset({408, 429, 500, 502, 503, 504})
+    rejected_statuses: FrozenSet[int] = frozenset({429, 503})
+
+    def should_retry(self, error: Optional[Exception] = None, status_code: Optional[int] = None) -> bool:
+        if error is not None:
+            return self.idempotent or isinstance(error, NOT_SENT_ERRORS)
+        if self.idempotent:
+            return status_code in self.retry_statuses
+        return status_code in self.rejected_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full jitter exponential backoff: random delay between zero and exponentially growing cap.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class RetryBudget:
+    """
+    Session wide limit of time spent waiting between retries, shared by all endpoints.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.remaining = seconds
+        self._lock = threading.Lock()
+
+    def acquire(self, delay: float) -> bool:
+        with self._lock:
+            if delay > self.remaining:
+                return False
+            self.remaining -= delay
+            return True
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Returns delay in seconds requested by `Retry-After` header. Header may contain seconds or HTTP date.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, retry_at.timestamp() - datetime.now(timezone.utc).timestamp())
+
+
+def sleep_time(policy: RetryPolicy, attempt: int, response: Optional[httpx.Response] = None) -> float:
+    delay = retry_after(response) if response is not None else None
+    return delay if delay is not None else policy.backoff(attempt)
@@ -0,0 +1,59 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+from pydantic import BaseModel
+
+from pytest_zebrunner.api.models import Record
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, BaseModel):
+        return value.dict(exclude_none=True, by_alias=True)
+    raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize request payload to JSON. Records and pydantic models may be nested in lists and dicts.
+    Uses orjson if it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def json_content(value: Any) -> Dict[str, Any]:
+    """
+    Returns keyword arguments of httpx request sending value as JSON body.
+    """
+    return {"content": dumps(value), "headers": JSON_HEADERS}
+
+
+def json_array_chunks(values: Iterable[Any], max_size: int) -> Iterator[bytes]:
+    """
+    Serialize values to JSON arrays of at most `max_size` bytes, encoding one value at a time, so memory use
+    depends on chunk size rather than on the number of values. A value larger than `max_size` gets its own array.
+    No values produce a single empty array.
+    """
+    parts: List[bytes] = []
+    size = 2
+    empty = True
+    for value in values:
+        encoded = dumps(value)
+        if parts and size + 1 + len(encoded) > max_size:
+            yield b"[" + b",".join(parts) + b"]"
+            empty = False
+            parts, size = [], 2
+        size += len(encoded) + (1 if parts else 0)
+        parts.append(encoded)
+    if parts or empty:
+        yield b"[" + b",".join(parts) + b"]"
@@ -0,0 +1,76 @@
+import asyncio
+import mimetypes
+import os
+from pathlib import Path
+from typing import AsyncIterator, Dict, Union
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FileStream:
+    """
+    Request body streaming file from disk in fixed-size chunks, so memory use does not depend on file size.
+    The file is opened again on every iteration, so the request can be retried. Reads run in the default
+    executor to keep the event loop responsive.
+    """
+
+    def __init__(
+        self, path: Union[str, Path], prefix: bytes = b"", suffix: bytes = b"", chunk_size: int = CHUNK_SIZE
+    ) -> None:
+        self.path = path
+        self.prefix = prefix
+        self.suffix = suffix
+        self.chunk_size = chunk_size
+        self.file_size = os.stat(path).st_size
+
+    @property
+    def length(self) -> int:
+        return len(self.prefix) + self.file_size + len(self.suffix)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        if self.prefix:
+            yield self.prefix
+        with open(self.path, "rb") as file:
+            # Never send more than announced in Content-Length even if the file grows meanwhile
+            remaining = self.file_size
+            while remaining > 0:
+                chunk = await loop.run_in_executor(None, file.read, min(self.chunk_size, remaining))
+                if not chunk:
+                    raise IOError(f"File {self.path} was truncated while being uploaded")
+                remaining -= len(chunk)
+                yield chunk
+        if self.suffix:
+            yield self.suffix
+
+
+def file_content(path: Union[str, Path], content_type: str) -> Dict:
+    """
+    Returns keyword arguments of httpx request sending file as request body.
+    """
+    stream = FileStream(path)
+    return {"content": stream, "headers": {"Content-Type": content_type, "Content-Length": str(stream.length)}}
+
+
+def multipart_file_content(path: Union[str, Path], field: str = "file") -> Dict:
+    """
+    Returns keyword arguments of httpx request sending file as multipart/form-data field. Unlike httpx multipart
+    encoding, file is read without blocking the event loop and Content-Length is computed from file size.
+    """
+    boundary = os.urandom(16).hex()
+    filename = os.path.basename(path).replace('"', "%22")
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    prefix = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    suffix = f"\r\n--{boundary}--\r\n".encode()
+    stream = FileStream(path, prefix, suffix)
+    return {
+        "content": stream,
+        "headers": {
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(stream.length),
+        },
+    }
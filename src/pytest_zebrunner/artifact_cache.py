@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Set, Tuple, Union
+
+from pytest_zebrunner.pipeline import LazyId
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _hasher() -> Any:
+    return xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+
+
+def test_run_key(test_run_id: Union[int, LazyId]) -> str:
+    """
+    Returns key of the test run that is the same in xdist controller and workers.
+    """
+    return test_run_id.key if isinstance(test_run_id, LazyId) else str(test_run_id)
+
+
+class ArtifactCache:
+    """
+    Content hashes of uploaded artifacts. Zebrunner has no way to reference an already uploaded file, so only
+    repeated uploads of the same content to the same owner are skipped: a test or the test run (owner None).
+    Run level uploads are claimed in an on-disk index shared by xdist workers of the run. Claims read from the
+    index are kept in memory, and the index is read again only from the point where it changed since.
+
+    Hashes are cached by path, size and modification time, so unchanged files are hashed once.
+    """
+
+    def __init__(self, directory: Union[str, Path, None] = None) -> None:
+        self.directory = Path(directory or tempfile.gettempdir())
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._uploaded: Dict[Any, Set[str]] = defaultdict(set)
+        # Test run key -> (inode, size and modification time of the index when it was read, claims read from it)
+        self._indexes: Dict[str, Tuple[Tuple[int, int, int], Set[str]]] = {}
+        self._lock = threading.Lock()
+
+    def index_path(self, test_run_key: str) -> Path:
+        return self.directory / f"zebrunner-artifacts-{test_run_key}.jsonl"
+
+    def digest(self, path: Union[str, Path]) -> str:
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(key)
+        if digest is None:
+            hasher = _hasher()
+            with open(path, "rb") as file:
+                for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+            digest = self._digests[key] = hasher.hexdigest()
+        return digest
+
+    def claim(self, owner: Any, digest: str, test_run_key: str) -> bool:
+        """
+        Returns True if the content was not uploaded to the owner yet and records it as uploaded.
+        """
+        with self._lock:
+            if owner is None:
+                return self._update_index(test_run_key, {"claim": digest}, digest)
+            if digest in self._uploaded[owner]:
+                return False
+            self._uploaded[owner].add(digest)
+            return True
+
+    def release(self, owner: Any, digest: str, test_run_key: str) -> None:
+        """
+        Forget the claim after failed upload, so the content can be uploaded again.
+        """
+        with self._lock:
+            if owner is None:
+                self._update_index(test_run_key, {"release": digest})
+            else:
+                self._uploaded[owner].discard(digest)
+
+    def forget(self, owner: Any) -> None:
+        with self._lock:
+            self._uploaded.pop(owner, None)
+
+    def remove_index(self, test_run_key: str) -> None:
+        with self._lock:
+            self._indexes.pop(test_run_key, None)
+        try:
+            self.index_path(test_run_key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _update_index(self, test_run_key: str, entry: dict, claimed_digest: Optional[str] = None) -> bool:
+        """
+        Appends entry to the index under exclusive lock. If `claimed_digest` is given, the entry is appended only
+        if the digest is not claimed yet. Returns False if it is.
+        """
+        try:
+            with open(self.index_path(test_run_key), "a+b") as index:
+                if fcntl is not None:
+                    fcntl.flock(index, fcntl.LOCK_EX)
+                try:
+                    claimed = self._read_index(test_run_key, index)
+                    if claimed_digest is not None and claimed_digest in claimed:
+                        return False
+                    index.write(json.dumps(entry).encode() + b"\n")
+                    index.flush()
+                    self._apply(claimed, entry)
+                    self._indexes[test_run_key] = (self._signature(index), claimed)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(index, fcntl.LOCK_UN)
+        except (OSError, ValueError) as e:
+            self._indexes.pop(test_run_key, None)
+            logger.warning("Failed to update artifact cache index", exc_info=e)
+        return True
+
+    def _read_index(self, test_run_key: str, index: BinaryIO) -> Set[str]:
+        """
+        Returns claims of the index. Only entries appended since it was read last time are read, the whole index
+        is read again if it was replaced.
+        """
+        signature = self._signature(index)
+        known = self._indexes.get(test_run_key)
+        if known is not None and known[0] == signature:
+            return known[1]
+
+        claimed: Set[str] = set()
+        index.seek(0)
+        if known is not None and known[0][0] == signature[0] and known[0][1] <= signature[1]:
+            claimed = known[1]
+            index.seek(known[0][1])
+        for line in index:
+            self._apply(claimed, json.loads(line))
+        return claimed
+
+    @staticmethod
+    def _signature(index: BinaryIO) -> Tuple[int, int, int]:
+        stat = os.fstat(index.fileno())
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _apply(claimed: Set[str], entry: dict) -> None:
+        if "claim" in entry:
+            claimed.add(entry["claim"])
+        else:
+            claimed.discard(entry["release"])
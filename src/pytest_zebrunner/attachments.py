@@ -6,6 +6,8 @@ from pytest_zebrunner.api.client import ZebrunnerAPI
 from pytest_zebrunner.api.models import ArtifactReferenceModel, LabelModel
 from pytest_zebrunner.context import zebrunner_context
 from pytest_zebrunner.errors import AgentApiError, AgentError
+from pytest_zebrunner.pipeline import send
+from pytest_zebrunner.upload_pool import upload
 
 
 def attach_test_screenshot(path: Union[str, Path]) -> None:
@@ -17,7 +19,14 @@ def attach_test_screenshot(path: Union[str, Path]) -> None:
 
     try:
         api = ZebrunnerAPI(zebrunner_context.settings.server.hostname, zebrunner_context.settings.server.access_token)
-        api.send_screenshot(zebrunner_context.test_run_id, zebrunner_context.test_id, path)
+        upload(
+            api,
+            zebrunner_context.test,
+            "send_screenshot",
+            zebrunner_context.test_run_id,
+            zebrunner_context.test_id,
+            path,
+        )
     except AgentApiError as e:
         logging.error("Failed to attach test screenshot", exc_info=e)
 
@@ -31,7 +40,14 @@ def attach_test_artifact(path: Union[str, Path]) -> None:
 
     try:
         api = ZebrunnerAPI(zebrunner_context.settings.server.hostname, zebrunner_context.settings.server.access_token)
-        api.send_artifact(path, zebrunner_context.test_run_id, zebrunner_context.test_id)
+        upload(
+            api,
+            zebrunner_context.test,
+            "send_artifact",
+            path,
+            zebrunner_context.test_run_id,
+            zebrunner_context.test_id,
+        )
     except AgentApiError as e:
         logging.error("Failed to attach test artifact", exc_info=e)
 
@@ -45,7 +61,7 @@ def attach_test_run_artifact(path: Union[str, Path]) -> None:
 
     try:
         api = ZebrunnerAPI(zebrunner_context.settings.server.hostname, zebrunner_context.settings.server.access_token)
-        api.send_artifact(path, zebrunner_context.test_run_id)
+        upload(api, None, "send_artifact", path, zebrunner_context.test_run_id)
     except AgentApiError as e:
         logging.error("Failed to attach test run artifact", exc_info=e)
 
@@ -59,8 +75,12 @@ def attach_test_artifact_reference(name: str, ref: str) -> None:
 
     try:
         api = ZebrunnerAPI(zebrunner_context.settings.server.hostname, zebrunner_context.settings.server.access_token)
-        api.send_artifact_references(
-            [ArtifactReferenceModel(name=name, value=ref)], zebrunner_context.test_run_id, zebrunner_context.test_id
+        send(
+            api,
+            "send_artifact_references",
+            [ArtifactReferenceModel(name=name, value=ref)],
+            zebrunner_context.test_run_id,
+            zebrunner_context.test_id,
         )
     except AgentApiError as e:
         logging.error("Failed to attach test artifact reference", exc_info=e)
@@ -75,7 +95,12 @@ def attach_test_run_artifact_reference(name: str, ref: str) -> None:
 
     try:
         api = ZebrunnerAPI(zebrunner_context.settings.server.hostname, zebrunner_context.settings.server.access_token)
-        api.send_artifact_references([ArtifactReferenceModel(name=name, value=ref)], zebrunner_context.test_run_id)
+        send(
+            api,
+            "send_artifact_references",
+            [ArtifactReferenceModel(name=name, value=ref)],
+            zebrunner_context.test_run_id,
+        )
     except AgentApiError as e:
         logging.error("Failed to attach test run artifact reference", exc_info=e)
 
@@ -89,7 +114,13 @@ def attach_test_label(name: str, value: str) -> None:
 
     try:
         api = ZebrunnerAPI(zebrunner_context.settings.server.hostname, zebrunner_context.settings.server.access_token)
-        api.send_labels([LabelModel(key=name, value=value)], zebrunner_context.test_run_id, zebrunner_context.test_id)
+        send(
+            api,
+            "send_labels",
+            [LabelModel(key=name, value=value)],
+            zebrunner_context.test_run_id,
+            zebrunner_context.test_id,
+        )
     except AgentApiError as e:
         logging.error("Failed to attach label to test", exc_info=e)
 
@@ -103,6 +134,6 @@ def attach_test_run_label(name: str, value: str) -> None:
 
     try:
         api = ZebrunnerAPI(zebrunner_context.settings.server.hostname, zebrunner_context.settings.server.access_token)
-        api.send_labels([LabelModel(key=name, value=value)], zebrunner_context.test_run_id)
+        send(api, "send_labels", [LabelModel(key=name, value=value)], zebrunner_context.test_run_id)
     except AgentApiError as e:
         logging.error("Failed to attach label to test run", exc_info=e)
@@ -1,14 +1,25 @@
+from contextvars import ContextVar
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 
 from pydantic.error_wrappers import ValidationError
 
 from pytest_zebrunner.settings import load_settings
 
+if TYPE_CHECKING:
+    from pytest_zebrunner.api.models import RerunDataModel
+    from pytest_zebrunner.log_limiter import LogLimiter
+    from pytest_zebrunner.log_shipper import LogShipper
+    from pytest_zebrunner.payload_limits import PayloadLimits
+    from pytest_zebrunner.pipeline import LazyId, ReportingPipeline
+    from pytest_zebrunner.retention import RetentionBuffer
+    from pytest_zebrunner.screenshots import ScreenshotTranscoder
+    from pytest_zebrunner.upload_pool import UploadPool
+
 
 class TestRun:
     def __init__(self, name: str = None, environment: str = None, build: str = None) -> None:
-        self.zebrunner_id: Optional[int] = None
+        self.zebrunner_id: Optional[Union[int, "LazyId"]] = None
         self.name = name or f"Unnamed {datetime.utcnow()}"
         self.environment = environment
         self.build = build
@@ -16,7 +27,7 @@ class TestRun:
 
 class Test:
     def __init__(self, name: str, file: str, maintainers: List[str], labels: List[Tuple[str, str]]) -> None:
-        self.zebrunner_id: Optional[int] = None
+        self.zebrunner_id: Optional[Union[int, "LazyId"]] = None
         self.name = name
         self.file = file
         self.maintainers = maintainers
@@ -24,15 +35,38 @@ class Test:
         self.is_reverted = False
 
 
+# Test that the current thread or asyncio task works for. Unlike ZebrunnerContext.test, it stays bound to threads
+# and tasks started by the test, so their logs are attributed to the test even when they outlive it.
+current_test: ContextVar[Optional[Test]] = ContextVar("zebrunner_current_test", default=None)
+
+
 class ZebrunnerContext:
     def __init__(self) -> None:
         self.test_run: Optional[TestRun] = None
         self.test: Optional[Test] = None
+        # Tests to rerun exchanged for the run context, shared with xdist workers
+        self.rerun_data: Optional["RerunDataModel"] = None
+        self.pipeline: Optional["ReportingPipeline"] = None
+        self.upload_pool: Optional["UploadPool"] = None
+        self.screenshot_transcoder: Optional["ScreenshotTranscoder"] = None
+        self.log_shipper: Optional["LogShipper"] = None
+        self.log_limiter: Optional["LogLimiter"] = None
+        self.retention: Optional["RetentionBuffer"] = None
+        self.payload_limits: Optional["PayloadLimits"] = None
         try:
             self.settings = load_settings()
         except ValidationError:
             self.settings = None  # type: ignore
 
+    @property
+    def test(self) -> Optional[Test]:
+        return self._test
+
+    @test.setter
+    def test(self, test: Optional[Test]) -> None:
+        self._test = test
+        current_test.set(test)
+
     @property
     def is_configured(self) -> bool:
         return self.settings is not None
@@ -46,11 +80,11 @@ class ZebrunnerContext:
         return self.is_configured and self.test_run_id is not None
 
     @property
-    def test_id(self) -> int:
+    def test_id(self) -> Optional[Union[int, "LazyId"]]:
         return getattr(self.test, "zebrunner_id", None)
 
     @property
-    def test_run_id(self) -> int:
+    def test_run_id(self) -> Optional[Union[int, "LazyId"]]:
         return getattr(self.test_run, "zebrunner_id", None)
 
 
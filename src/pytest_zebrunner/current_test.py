@@ -3,6 +3,7 @@ import logging
 from pytest_zebrunner.api.client import ZebrunnerAPI
 from pytest_zebrunner.context import zebrunner_context
 from pytest_zebrunner.errors import AgentApiError, AgentError
+from pytest_zebrunner.pipeline import send
 
 
 class CurrentTest:
@@ -14,7 +15,7 @@ class CurrentTest:
         settings = zebrunner_context.settings
         try:
             api = ZebrunnerAPI(settings.server.hostname, settings.server.access_token)
-            api.reverse_test_registration(zebrunner_context.test_run_id, zebrunner_context.test_id)
+            send(api, "reverse_test_registration", zebrunner_context.test_run_id, zebrunner_context.test_id)
             if zebrunner_context.test:
                 zebrunner_context.test.is_reverted = True
         except AgentApiError as e:
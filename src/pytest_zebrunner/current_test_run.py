@@ -6,6 +6,7 @@ from pytest_zebrunner.api.models import LabelModel, PlatformModel
 from .api.client import ZebrunnerAPI
 from .context import zebrunner_context
 from .errors import AgentApiError, AgentError
+from .pipeline import send
 
 
 class CurrentTestRun:
@@ -20,7 +21,7 @@ class CurrentTestRun:
         settings = zebrunner_context.settings
         try:
             api = ZebrunnerAPI(settings.server.hostname, settings.server.access_token)
-            api.patch_test_run_build(zebrunner_context.test_run_id, build)
+            send(api, "patch_test_run_build", zebrunner_context.test_run_id, build)
         except AgentApiError as e:
             logging.error("Failed to set build", exc_info=e)
 
@@ -35,7 +36,7 @@ class CurrentTestRun:
         settings = zebrunner_context.settings
         try:
             api = ZebrunnerAPI(settings.server.hostname, settings.server.access_token)
-            api.send_labels([LabelModel(key=label, value=locale)], zebrunner_context.test_run_id, None)
+            send(api, "send_labels", [LabelModel(key=label, value=locale)], zebrunner_context.test_run_id, None)
         except AgentApiError as e:
             logging.error("failed to set locale", exc_info=e)
 
@@ -56,7 +57,9 @@ class CurrentTestRun:
         settings = zebrunner_context.settings
         try:
             api = ZebrunnerAPI(settings.server.hostname, settings.server.access_token)
-            api.set_test_run_platform(
+            send(
+                api,
+                "set_test_run_platform",
                 zebrunner_context.test_run_id,
                 PlatformModel(name=name, version=version),
             )
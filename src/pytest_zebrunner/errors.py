@@ -2,5 +2,9 @@ class AgentApiError(Exception):
     pass
 
 
+class CircuitOpenError(AgentApiError):
+    pass
+
+
 class AgentError(Exception):
     pass
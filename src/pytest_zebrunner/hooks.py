@@ -1,16 +1,21 @@
-import itertools
 import logging
-from typing import Generator
+from typing import Generator, List
 
 import pytest
+from _pytest.config import Config
 from _pytest.main import Session
 from _pytest.nodes import Item
 from _pytest.reports import TestReport
 from _pytest.runner import CallInfo
 
+from pytest_zebrunner.api.client import ZebrunnerAPI
+from pytest_zebrunner.api.models import RerunDataModel
 from pytest_zebrunner.context import TestRun, zebrunner_context
+from pytest_zebrunner.metadata import item_metadata
+from pytest_zebrunner.pipeline import LazyId, resolve_id
 from pytest_zebrunner.reporting_service import ReportingService
 from pytest_zebrunner.selenium_integration import SeleniumSessionManager, inject_driver
+from pytest_zebrunner.zebrunner_logging import captured_logs, keep_teardown_records
 
 logger = logging.getLogger(__name__)
 
@@ -33,15 +38,35 @@ class PytestHooks:
                 zebrunner_context.settings.run.build,
             )
             test_run.zebrunner_id = session.config.workerinput["test_run_id"]
+            test_run_key = session.config.workerinput.get("test_run_key")
+            if test_run_key is not None and zebrunner_context.pipeline is not None:
+                # Keeps journal entries of workers referencing the test run created by controller
+                test_run.zebrunner_id = LazyId(test_run_key)
+                test_run.zebrunner_id.resolve(session.config.workerinput["test_run_id"])
             zebrunner_context.test_run = test_run
+            auth_token = session.config.workerinput.get("auth_token")
+            if auth_token is not None:
+                self.service.api.use_auth_token(*auth_token)
+            rerun_data = session.config.workerinput.get("rerun_data")
+            if rerun_data is not None:
+                zebrunner_context.rerun_data = RerunDataModel.parse_raw(rerun_data)
         else:
             self.service.start_test_run()
 
         inject_driver(self.session_manager)
 
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, session: Session, config: Config, items: List[Item]) -> None:
+        selected = self.service.filter_test_items(items)
+        if len(selected) < len(items):
+            selected_ids = {id(item) for item in selected}
+            config.hook.pytest_deselected(items=[item for item in items if id(item) not in selected_ids])
+            items[:] = selected
+
     @pytest.hookimpl
     def pytest_collection_finish(self, session: Session) -> None:
-        session.items = self.service.filter_test_items(session.items)
+        for item in session.items:
+            item_metadata(item)
 
     @pytest.hookimpl
     def pytest_sessionfinish(self, session: Session, exitstatus: int) -> None:
@@ -49,28 +74,41 @@ class PytestHooks:
             self.session_manager.finish_all_sessions()
             self.service.finish_test_run()
             self.service.api.close()
+        else:
+            self.service.close_payload_limits()
+            self.service.close_log_limiter()
+            self.service.close_retention()
+            self.service.close_log_shipper()
+            self.service.close_upload_pool()
+            self.service.remove_retention_files()
+            self.service.close_pipeline()
+            self.service.close_screenshot_transcoder()
+
+    @pytest.hookimpl(hookwrapper=True, trylast=True)
+    def pytest_runtest_teardown(self, item: Item) -> Generator:
+        # Runs inside of the logging plugin wrapper, which drops captured records once teardown is over
+        yield
+        if zebrunner_context.settings.logs.capture:
+            keep_teardown_records(item)
 
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_makereport(self, item: Item, call: CallInfo) -> Generator:
         outcome = yield
         report: TestReport = outcome.get_result()
 
-        report.maintainers = [str(mark.args[0]) for mark in item.iter_markers("maintainer")]
-        report.labels = [(str(mark.args[0]), str(mark.args[1])) for mark in item.iter_markers("label")]
-        report.artifact_references = [
-            (str(m.args[0]), str(m.args[1])) for m in item.iter_markers("artifact_reference")
-        ]
-        report.artifacts = [mark.args[0] for mark in item.iter_markers("artifact")]
-        report.test_rail_case_ids = list(
-            itertools.chain(*[mark.args for mark in item.iter_markers("test_rail_case_id")])
-        )
-        report.xray_case_ids = list(itertools.chain(*[mark.args for mark in item.iter_markers("xray_test_key")]))
-        report.zephyr_case_ids = list(
-            itertools.chain(*[mark.args for mark in item.iter_markers("zephyr_test_case_key")])
-        )
-        report.zebrunner_case_keys = list(
-            itertools.chain(*[mark.args for mark in item.iter_markers("zebrunner_test_case_key")])
-        )
+        report.zebrunner_metadata = item_metadata(item)
+        if zebrunner_context.settings.logs.capture:
+            report.captured_logs = captured_logs(item, report)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_report_to_serializable(self, report: TestReport) -> Generator:
+        outcome = yield
+        data = outcome.get_result()
+        # Metadata and captured logs are used by the process running the test only, xdist controller does not
+        # report tests
+        if isinstance(data, dict):
+            data.pop("zebrunner_metadata", None)
+            data.pop("captured_logs", None)
 
     @pytest.hookimpl
     def pytest_runtest_logreport(self, report: TestReport) -> None:
@@ -79,15 +117,30 @@ class PytestHooks:
             is_call_rerun = report.outcome == "rerun"
             if report.when == "setup" and not is_setup_rerun:
                 self.service.start_test(report)
-                if zebrunner_context.test_is_active:
-                    self.session_manager.add_test(zebrunner_context.test_id)
+                test_id = zebrunner_context.test_id
+                if zebrunner_context.test_is_active and test_id is not None:
+                    self.session_manager.add_test(test_id)
 
+                self.service.send_captured_logs(report)
                 if report.outcome == "skipped":
                     self.service.finish_test(report)
             elif report.when == "call" and not is_call_rerun:
+                self.service.send_captured_logs(report)
                 self.service.finish_test(report)
+            else:
+                self.service.send_captured_logs(report)
 
 
 class XdistHooks:
     def pytest_configure_node(self, node):  # type: ignore
-        node.workerinput["test_run_id"] = zebrunner_context.test_run.zebrunner_id
+        test_run_id = zebrunner_context.test_run.zebrunner_id
+        node.workerinput["test_run_id"] = resolve_id(test_run_id)
+        if isinstance(test_run_id, LazyId):
+            node.workerinput["test_run_key"] = test_run_id.key
+        auth_token = ZebrunnerAPI().auth_token
+        if auth_token is not None:
+            # Workers sign requests with the token of controller until it is about to expire
+            node.workerinput["auth_token"] = list(auth_token)
+        if zebrunner_context.rerun_data is not None:
+            # Workers filter collected tests with the data controller got, instead of exchanging the context again
+            node.workerinput["rerun_data"] = zebrunner_context.rerun_data.json(by_alias=True)
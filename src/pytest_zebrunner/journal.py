@@ -0,0 +1,140 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+
+from pytest_zebrunner.api import models
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownReferenceError(Exception):
+    pass
+
+
+def encode_value(value: Any) -> Any:
+    """
+    Converts argument of ZebrunnerAPI method to JSON compatible value. Lazy ids are stored as references
+    to the events that created them.
+    """
+    # Imported here because pipeline module depends on this one
+    from pytest_zebrunner.pipeline import LazyId
+
+    if isinstance(value, LazyId):
+        if value.is_resolved and value.get() is not None:
+            return {"$ref": value.key, "value": value.get()}
+        return {"$ref": value.key}
+    if isinstance(value, Path):
+        return {"$path": str(value.resolve())}
+    if isinstance(value, (BaseModel, models.Record)):
+        return {"$model": value.__class__.__name__, "fields": {name: encode_value(x) for name, x in value}}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(x) for x in value]
+    if isinstance(value, dict):
+        return {key: encode_value(x) for key, x in value.items()}
+    return value
+
+
+def decode_value(value: Any, references: Dict[str, Any]) -> Any:
+    """
+    Restores argument of ZebrunnerAPI method encoded by `encode_value`. References are replaced with ids
+    returned by Zebrunner. Raise UnknownReferenceError if the referenced entity was not created.
+    """
+    if isinstance(value, list):
+        return [decode_value(x, references) for x in value]
+    if not isinstance(value, dict):
+        return value
+    if "$ref" in value:
+        resolved = references.get(value["$ref"], value.get("value"))
+        if resolved is None:
+            raise UnknownReferenceError(value["$ref"])
+        return resolved
+    if "$path" in value:
+        return Path(value["$path"])
+    if "$model" in value:
+        model_class = getattr(models, value["$model"])
+        return model_class(**{name: decode_value(x, references) for name, x in value["fields"].items()})
+    return {key: decode_value(x, references) for key, x in value.items()}
+
+
+def _json_default(value: Any) -> Any:
+    try:
+        return pydantic_encoder(value)
+    except TypeError:
+        return str(value)
+
+
+class Journal:
+    """
+    Append-only journal of reporting events. Every line is a JSON object: either an event with
+    ZebrunnerAPI method name and arguments, or an acknowledgement of the event with a value returned by
+    Zebrunner. Lines are written and fsynced in batches.
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 100, fsync_interval: float = 1.0) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._buffer: List[bytes] = []
+        self._last_flush = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def record(self, key: str, method: str, args: Any, created_at: float) -> None:
+        self._write(
+            {
+                "key": key,
+                "method": method,
+                "args": encode_value(list(args)),
+                "createdAt": created_at,
+                "pid": os.getpid(),
+            }
+        )
+
+    def acknowledge(self, key: str, result: Any) -> None:
+        self._write({"ack": key, "result": result})
+
+    def _write(self, entry: dict) -> None:
+        line = json.dumps(entry, separators=(",", ":"), default=_json_default).encode() + b"\n"
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.fsync_interval:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            # Single write call keeps lines of concurrent processes (xdist workers) from interleaving
+            os.write(self._fd, b"".join(self._buffer))
+            os.fsync(self._fd)
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            os.close(self._fd)
+
+
+def read_journal(path: Union[str, Path]) -> Iterator[dict]:
+    with open(path, "rb") as journal:
+        for number, line in enumerate(journal, 1):
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Last line may be incomplete if the process was killed while writing it
+                logger.warning(f"Skipping malformed journal line {number}")
+
+
+def acknowledged_results(entries: List[dict]) -> Dict[str, Optional[Any]]:
+    return {entry["ack"]: entry["result"] for entry in entries if "ack" in entry}
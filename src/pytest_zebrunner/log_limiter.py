@@ -0,0 +1,153 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pytest_zebrunner.api.models import LogRecordModel
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def has_token(self) -> bool:
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens >= 1
+
+    def take(self) -> None:
+        if self.rate > 0:
+            self.tokens -= 1
+
+
+class LogStream:
+    """
+    Logs of a single logger in a single test.
+    """
+
+    __slots__ = ("test_id", "logger_name", "bucket", "last", "repeats", "last_timestamp", "suppressed")
+
+    def __init__(self, test_id: Any, logger_name: str, rate: float, burst: int) -> None:
+        self.test_id = test_id
+        self.logger_name = logger_name
+        self.bucket = TokenBucket(rate, burst)
+        self.last: Optional[LogRecordModel] = None
+        self.repeats = 0
+        self.last_timestamp = ""
+        self.suppressed = 0
+
+
+class LogLimiter:
+    """
+    Bounds log volume of tests. Identical consecutive records of a logger are aggregated into a single
+    "message ×N more" record. Remaining records are rate limited by token buckets per test and per logger,
+    records over the limit are counted and reported by a summary record.
+    """
+
+    def __init__(
+        self,
+        test_rate: float = 0,
+        test_burst: int = 0,
+        logger_rate: float = 0,
+        logger_burst: int = 0,
+        aggregate_repeats: bool = True,
+    ) -> None:
+        self.test_rate = test_rate
+        self.test_burst = test_burst
+        self.logger_rate = logger_rate
+        self.logger_burst = logger_burst
+        self.aggregate_repeats = aggregate_repeats
+        self._tests: Dict[Any, TokenBucket] = {}
+        self._streams: Dict[Tuple[Any, str], LogStream] = {}
+        self._lock = threading.Lock()
+
+    def process(self, test: Any, logger_name: str, record: LogRecordModel) -> List[LogRecordModel]:
+        """
+        Returns records to send instead of the given one.
+        """
+        records: List[LogRecordModel] = []
+        with self._lock:
+            test_bucket = self._tests.get(test)
+            if test_bucket is None:
+                test_bucket = self._tests[test] = TokenBucket(self.test_rate, self.test_burst)
+            stream = self._streams.get((test, logger_name))
+            if stream is None:
+                stream = self._streams[(test, logger_name)] = LogStream(
+                    record.test_id, logger_name, self.logger_rate, self.logger_burst  # type: ignore
+                )
+
+            if self.aggregate_repeats:
+                last = stream.last
+                if last is not None and last.level == record.level and last.message == record.message:  # type: ignore
+                    stream.repeats += 1
+                    stream.last_timestamp = record.timestamp  # type: ignore
+                    return records
+                if stream.repeats:
+                    self._admit(test_bucket, stream, _repeated(stream), records)
+                stream.last = record
+                stream.repeats = 0
+            self._admit(test_bucket, stream, record, records)
+        return records
+
+    def finish(self, test: Any) -> List[LogRecordModel]:
+        """
+        Forget the test and return records summarizing its aggregated and suppressed records.
+        """
+        records: List[LogRecordModel] = []
+        with self._lock:
+            self._tests.pop(test, None)
+            keys = [key for key in self._streams if key[0] is test]
+            for key in keys:
+                stream = self._streams.pop(key)
+                if stream.repeats:
+                    records.append(_repeated(stream))
+                if stream.suppressed:
+                    records.append(_suppressed(stream))
+        return records
+
+    def close(self) -> Dict[Any, List[LogRecordModel]]:
+        with self._lock:
+            tests = {test for test, _ in self._streams}
+        return {test: self.finish(test) for test in tests}
+
+    def _admit(
+        self, test_bucket: TokenBucket, stream: LogStream, record: LogRecordModel, records: List[LogRecordModel]
+    ) -> None:
+        if not (test_bucket.has_token() and stream.bucket.has_token()):
+            stream.suppressed += 1
+            return
+        test_bucket.take()
+        stream.bucket.take()
+        if stream.suppressed:
+            records.append(_suppressed(stream))
+        records.append(record)
+
+
+def _repeated(stream: LogStream) -> LogRecordModel:
+    last = stream.last
+    record = LogRecordModel(
+        test_id=stream.test_id,
+        timestamp=stream.last_timestamp,
+        level=last.level,  # type: ignore
+        message=f"{last.message} ×{stream.repeats} more",  # type: ignore
+    )
+    stream.repeats = 0
+    return record
+
+
+def _suppressed(stream: LogStream) -> LogRecordModel:
+    record = LogRecordModel(
+        test_id=stream.test_id,
+        timestamp=str(round(time.time() * 1000)),
+        level="WARNING",
+        message=f"{stream.suppressed} log records of logger {stream.logger_name} were suppressed by rate limit",
+    )
+    stream.suppressed = 0
+    return record
@@ -0,0 +1,135 @@
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from pytest_zebrunner.api.client import ZebrunnerAPI
+from pytest_zebrunner.api.models import LogRecordModel
+from pytest_zebrunner.context import zebrunner_context
+from pytest_zebrunner.pipeline import send
+
+logger = logging.getLogger(__name__)
+
+# Approximate size of serialized log record without message
+RECORD_OVERHEAD = 80
+
+
+def _record_size(record: LogRecordModel) -> int:
+    return len(record.message) + RECORD_OVERHEAD  # type: ignore
+
+
+class LogShipper:
+    """
+    Buffers test logs and sends them in batches from a background thread. A batch is sent once it reaches
+    `max_records` records, `max_bytes` bytes or its oldest record is `max_age` seconds old, whichever comes first.
+    Memory is bounded by `capacity` records: records logged while the buffer is full are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        api: ZebrunnerAPI,
+        max_records: int = 1000,
+        max_bytes: int = 1024 * 1024,
+        max_age: float = 1.0,
+        capacity: int = 100000,
+    ) -> None:
+        self.api = api
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.capacity = capacity
+        self.dropped = 0
+        self._records: List[LogRecordModel] = []
+        self._bytes = 0
+        self._oldest: Optional[float] = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="zebrunner-logs", daemon=True)
+        self._thread.start()
+
+    def add(self, record: LogRecordModel) -> None:
+        """
+        Buffer log record. Never blocks on network.
+        """
+        with self._condition:
+            if len(self._records) >= self.capacity:
+                self.dropped += 1
+                return
+            self._records.append(record)
+            self._bytes += _record_size(record)
+            if self._oldest is None:
+                # Sender thread starts counting batch age
+                self._oldest = time.monotonic()
+                self._condition.notify()
+            elif len(self._records) >= self.max_records or self._bytes >= self.max_bytes:
+                self._condition.notify()
+
+    def flush(self) -> None:
+        """
+        Send all buffered records from the calling thread.
+        """
+        with self._send_lock:
+            with self._condition:
+                records = self._take()
+            self._send(records)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout)
+        if self.dropped:
+            logger.warning(f"{self.dropped} log records were dropped")
+
+    def _take(self) -> List[LogRecordModel]:
+        records = self._records
+        self._records = []
+        self._bytes = 0
+        self._oldest = None
+        return records
+
+    def _due(self) -> Optional[float]:
+        """
+        Returns 0 if the batch should be sent, seconds left until it should be otherwise or None if it is empty.
+        """
+        if self._oldest is None:
+            return None
+        if len(self._records) >= self.max_records or self._bytes >= self.max_bytes:
+            return 0
+        return max(0.0, self._oldest + self.max_age - time.monotonic())
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and self._due() != 0:
+                    self._condition.wait(self._due())
+                if self._closed:
+                    return
+            # Records are taken under the send lock, so batches are sent in order with flush from other threads
+            with self._send_lock:
+                with self._condition:
+                    records = self._take()
+                self._send(records)
+
+    def _send(self, records: List[LogRecordModel]) -> None:
+        start = 0
+        while start < len(records):
+            end = start + 1
+            size = _record_size(records[start])
+            while end < len(records) and end - start < self.max_records and size < self.max_bytes:
+                size += _record_size(records[end])
+                end += 1
+            self._send_batch(records[start:end])
+            start = end
+
+    def _send_batch(self, batch: List[LogRecordModel]) -> None:
+        try:
+            if zebrunner_context.test_run_id is None:
+                raise RuntimeError("There is no active test run to send logs to")
+            send(self.api, "send_logs", zebrunner_context.test_run_id, batch)
+        except Exception as e:
+            with self._condition:
+                self.dropped += len(batch)
+            logging.error("Failed to send logs to zebrunner", exc_info=e)
@@ -0,0 +1,82 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from _pytest.nodes import Item
+
+try:
+    from _pytest.stash import StashKey
+except ImportError:
+    try:
+        from _pytest.store import StoreKey as StashKey  # type: ignore
+    except ImportError:
+        StashKey = None  # type: ignore
+
+
+class TestMetadata(NamedTuple):
+    """
+    Zebrunner related data of a collected test item. Built once per item, reports of all phases reference it.
+    """
+
+    name: str
+    file: str
+    maintainers: Tuple[str, ...] = ()
+    labels: Tuple[Tuple[str, str], ...] = ()
+    artifact_references: Tuple[Tuple[str, str], ...] = ()
+    artifacts: Tuple[Any, ...] = ()
+    test_rail_case_ids: Tuple[Any, ...] = ()
+    xray_case_ids: Tuple[Any, ...] = ()
+    zephyr_case_ids: Tuple[Any, ...] = ()
+    zebrunner_case_keys: Tuple[Any, ...] = ()
+
+
+# Markers attaching a single value or pair of values to the test
+_VALUE_MARKERS = {"maintainer": "maintainers", "artifact": "artifacts"}
+_PAIR_MARKERS = {"label": "labels", "artifact_reference": "artifact_references"}
+# Markers attaching all their arguments to the test
+_ARGS_MARKERS = {
+    "test_rail_case_id": "test_rail_case_ids",
+    "xray_test_key": "xray_case_ids",
+    "zephyr_test_case_key": "zephyr_case_ids",
+    "zebrunner_test_case_key": "zebrunner_case_keys",
+}
+
+metadata_key = StashKey["TestMetadata"]() if StashKey is not None else None
+
+
+def build_metadata(item: Item) -> TestMetadata:
+    """
+    Collects metadata of the item walking its markers once. Closest markers come first.
+    """
+    values: Dict[str, List] = {}
+    for mark in item.iter_markers():
+        if mark.name in _VALUE_MARKERS:
+            value = str(mark.args[0]) if mark.name == "maintainer" else mark.args[0]
+            values.setdefault(_VALUE_MARKERS[mark.name], []).append(value)
+        elif mark.name in _PAIR_MARKERS:
+            values.setdefault(_PAIR_MARKERS[mark.name], []).append((str(mark.args[0]), str(mark.args[1])))
+        elif mark.name in _ARGS_MARKERS:
+            values.setdefault(_ARGS_MARKERS[mark.name], []).extend(mark.args)
+
+    file, _, name = item.nodeid.partition("::")
+    return TestMetadata(
+        name=name.replace("::", "."),
+        file=file,
+        **{field: tuple(value) for field, value in values.items()},
+    )
+
+
+def item_metadata(item: Item) -> TestMetadata:
+    """
+    Returns metadata of the item, building it if the item was not seen at collection, e.g. added by a plugin later.
+    """
+    store = getattr(item, "stash", getattr(item, "_store", None))
+    metadata: Optional[TestMetadata]
+    if metadata_key is not None and store is not None:
+        metadata = store.get(metadata_key, None)
+        if metadata is None:
+            metadata = store[metadata_key] = build_metadata(item)
+    else:
+        metadata = getattr(item, "_zebrunner_metadata", None)
+        if metadata is None:
+            metadata = build_metadata(item)
+            item._zebrunner_metadata = metadata  # type: ignore
+    return metadata
@@ -0,0 +1,129 @@
+import hashlib
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode(errors="replace"), digest_size=8).hexdigest()
+
+
+def _size(text: str) -> int:
+    """
+    Returns size of the text in the request body. Payloads are sent as UTF-8 encoded JSON.
+    """
+    return len(text.encode(errors="replace"))
+
+
+def truncate(text: str, max_length: int) -> str:
+    """
+    Keeps head and tail of the text, cut at line boundaries where possible, so it fits max length.
+    """
+    if max_length <= 0 or len(text) <= max_length:
+        return text
+
+    marker = f"\n... {len(text)} characters truncated ...\n"
+    budget = max(max_length - len(marker), 0)
+    head = text[: budget // 2]
+    tail_length = budget - len(head)
+    tail = text[-tail_length:] if tail_length else ""
+    # Partial lines are dropped unless the text has no line breaks at all
+    if "\n" in head:
+        head = head.rsplit("\n", 1)[0]
+    if "\n" in tail:
+        tail = tail.split("\n", 1)[1]
+    # Marker alone does not fit into tiny limits
+    return f"{head}{marker}{tail}"[:max_length]
+
+
+def limit_name(name: str, max_length: int) -> str:
+    """
+    Cuts the name to max length, keeping a hash of the full name, so truncated names stay unique.
+    """
+    if len(name) <= max_length or max_length <= 0:
+        return name
+
+    digest = _digest(name)
+    return f"{name[: max(max_length - len(digest) - 3, 0)]}...{digest}"
+
+
+class PayloadLimits:
+    """
+    Caps size of failure reasons, test names and log messages. Truncated reasons keep the crash line and head and
+    tail of the traceback, truncated names get a hash of the full name, so they stay unique. Identical reasons of
+    failures with a crash line are sent once per process, repeats keep the crash line and reference the test that
+    failed first.
+    """
+
+    def __init__(
+        self,
+        max_reason_length: int = 0,
+        max_name_length: int = 0,
+        max_log_message_length: int = 0,
+        deduplicate_reasons: bool = False,
+    ) -> None:
+        self.max_reason_length = max_reason_length
+        self.max_name_length = max_name_length
+        self.max_log_message_length = max_log_message_length
+        self.deduplicate_reasons = deduplicate_reasons
+        self.saved: Counter = Counter()
+        self._reasons: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def reason(self, reason: Optional[str], test_name: str, crash: Optional[str] = None) -> Optional[str]:
+        """
+        Returns failure reason to send. `crash` is the line describing the exception, skip and xfail reasons have
+        none and are never deduplicated.
+        """
+        if not reason:
+            return reason
+
+        limited = reason
+        if self.deduplicate_reasons and crash:
+            digest = _digest(reason)
+            with self._lock:
+                first_test = self._reasons.setdefault(digest, test_name)
+            reference = f"{crash}\n\nSame failure as in test {first_test} (reason {digest})"
+            if first_test != test_name and len(reference) < len(reason):
+                self._save("deduplicated reasons", reason, reference)
+                limited = reference
+
+        if len(limited) > self.max_reason_length > 0:
+            prefix = ""
+            body = limited
+            if crash and limited.startswith(crash):
+                prefix = truncate(crash, self.max_reason_length // 4) + "\n\n"
+                body = limited.replace(crash, "", 1).lstrip("\n")
+            truncated = prefix + truncate(body, self.max_reason_length - len(prefix))
+            self._save("truncated reasons", limited, truncated)
+            limited = truncated
+        return limited
+
+    def name(self, name: str) -> str:
+        limited = limit_name(name, self.max_name_length)
+        if limited is not name:
+            self._save("truncated names", name, limited)
+        return limited
+
+    def log_message(self, message: str) -> str:
+        limited = truncate(message, self.max_log_message_length)
+        if limited is not message:
+            self._save("truncated log messages", message, limited)
+        return limited
+
+    def report(self) -> None:
+        """
+        Log how many bytes of payloads were saved by truncation and deduplication.
+        """
+        with self._lock:
+            saved = dict(self.saved)
+        if saved:
+            details = ", ".join(f"{kind}: {count}" for kind, count in saved.items())
+            logger.info(f"Payload limits saved {sum(saved.values())} bytes ({details})")
+
+    def _save(self, kind: str, original: str, limited: str) -> None:
+        with self._lock:
+            self.saved[kind] += _size(original) - _size(limited)
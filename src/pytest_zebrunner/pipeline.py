@@ -0,0 +1,288 @@
+import logging
+import threading
+import time
+from collections import deque
+from queue import Empty, Queue
+from typing import Any, Deque, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+from pytest_zebrunner.api.client import ZebrunnerAPI
+from pytest_zebrunner.api.models import Record, generate_uuid
+from pytest_zebrunner.context import zebrunner_context
+from pytest_zebrunner.errors import AgentApiError, CircuitOpenError
+from pytest_zebrunner.journal import Journal
+
+logger = logging.getLogger(__name__)
+
+
+class LazyId:
+    """
+    Zebrunner identifier of an entity whose creation request may not have been sent yet.
+    Resolved by the sender thread once Zebrunner responds. Converting it to str or int blocks until then.
+    """
+
+    def __init__(self, key: Optional[str] = None) -> None:
+        self.key = key or generate_uuid()
+        self._value: Optional[int] = None
+        self._resolved = threading.Event()
+
+    @property
+    def is_resolved(self) -> bool:
+        return self._resolved.is_set()
+
+    def resolve(self, value: Optional[int]) -> None:
+        self._value = value
+        self._resolved.set()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[int]:
+        self._resolved.wait(timeout)
+        return self._value
+
+    def __int__(self) -> int:
+        value = self.get()
+        if value is None:
+            raise TypeError(f"Zebrunner id {self.key} was not resolved")
+        return value
+
+    def __str__(self) -> str:
+        return str(self.get())
+
+    def __repr__(self) -> str:
+        return f"LazyId(key={self.key!r}, value={self._value!r})"
+
+
+class ReportingEvent(NamedTuple):
+    method: str
+    args: Tuple[Any, ...]
+    created_at: float
+    result: LazyId
+
+
+class UnresolvedReferenceError(Exception):
+    pass
+
+
+def resolve_id(value: Any) -> Any:
+    """
+    Returns the real Zebrunner id for LazyId values and the value itself otherwise.
+    """
+    return value.get() if isinstance(value, LazyId) else value
+
+
+def _has_lazy_ids(value: Any) -> bool:
+    if isinstance(value, LazyId):
+        return True
+    if isinstance(value, (list, tuple)):
+        return any(_has_lazy_ids(x) for x in value)
+    if isinstance(value, (BaseModel, Record)):
+        return any(_has_lazy_ids(x) for _, x in value)
+    return False
+
+
+def _references_unregistered(value: Any) -> bool:
+    """
+    True if value references an entity that failed to register. Such events are skipped without sending.
+    """
+    if isinstance(value, LazyId):
+        return value.is_resolved and value.get() is None
+    if isinstance(value, (list, tuple)):
+        return any(_references_unregistered(x) for x in value)
+    return False
+
+
+def _resolve(value: Any) -> Any:
+    """
+    Replaces LazyId values (also nested in lists, records and models) with real ids. Models built with `construct()`
+    around LazyId values are validated here. List items referencing entities that failed to register are dropped.
+    """
+    if isinstance(value, LazyId):
+        resolved = value.get()
+        if resolved is None:
+            raise UnresolvedReferenceError(value.key)
+        return resolved
+    if isinstance(value, (list, tuple)):
+        items = []
+        for item in value:
+            try:
+                items.append(_resolve(item))
+            except UnresolvedReferenceError:
+                logger.debug("Dropping item referencing unregistered entity")
+        return type(value)(items)
+    if isinstance(value, (BaseModel, Record)) and _has_lazy_ids(value):
+        return value.__class__(**{name: _resolve(field) for name, field in value})
+    return value
+
+
+class ReportingPipeline:
+    """
+    Background reporting mode. Events are put into a bounded queue and sent to Zebrunner by a dedicated thread
+    in the order they were submitted, so hooks never wait for HTTP round trips.
+
+    While the API circuit breaker is open, events are moved to an offline buffer and sent once Zebrunner
+    recovers. Events that do not fit into the offline buffer are dropped.
+
+    If journal is given, every event is written to it when submitted and acknowledged once Zebrunner accepts it,
+    so events that were not delivered can be replayed later.
+    """
+
+    def __init__(
+        self,
+        api: ZebrunnerAPI,
+        queue_size: int = 10000,
+        offline_buffer_size: int = 100000,
+        journal: Optional[Journal] = None,
+    ) -> None:
+        self.api = api
+        self.journal = journal
+        self.offline_buffer_size = offline_buffer_size
+        self.dropped_events = 0
+        self._queue: Queue = Queue(maxsize=queue_size)
+        self._offline: Deque[ReportingEvent] = deque()
+        self._sender = threading.Thread(target=self._run, name="zebrunner-sender", daemon=True)
+        self._sender.start()
+
+    def submit(self, method: str, *args: Any) -> LazyId:
+        """
+        Enqueue call of ZebrunnerAPI method. Returns lazy reference to the value returned by the method.
+        Blocks if the queue is full.
+        """
+        event = self._create_event(method, args)
+        self._queue.put(event)
+        return event.result
+
+    def call(self, method: str, *args: Any) -> LazyId:
+        """
+        Call ZebrunnerAPI method right away in the calling thread, bypassing the queue. Used for run level events
+        that have to complete before reporting goes on. Returned id is resolved to None if the call failed.
+        """
+        event = self._create_event(method, args)
+        if self.journal is not None:
+            self.journal.flush()
+        if not self._send(event):
+            logger.error(f"Failed to send '{method}' event because Zebrunner is unavailable")
+            event.result.resolve(None)
+        if self.journal is not None:
+            self.journal.flush()
+        return event.result
+
+    def _create_event(self, method: str, args: Tuple[Any, ...]) -> ReportingEvent:
+        event = ReportingEvent(method=method, args=args, created_at=time.time(), result=LazyId())
+        if self.journal is not None:
+            self.journal.record(event.result.key, method, args, event.created_at)
+        return event
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all submitted events are sent. Returns False if timeout expired before that.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        if not self.flush(timeout):
+            logger.error(f"Failed to send {self._queue.unfinished_tasks} reporting events in time")
+        self._queue.put(None)
+        self._sender.join(timeout)
+        if self.dropped_events:
+            logger.error(f"{self.dropped_events} reporting events were dropped")
+        if self.journal is not None:
+            self.journal.close()
+            logger.info(f"Reporting events journal is saved to {self.journal.path}")
+
+    @property
+    def _is_online(self) -> bool:
+        breaker = self.api.circuit_breaker
+        return breaker is None or breaker.accepts_requests
+
+    def _run(self) -> None:
+        while True:
+            event = self._next_event()
+            if event is None:
+                self._drop_offline_events()
+                self._queue.task_done()
+                return
+
+            if self._send(event):
+                self._queue.task_done()
+            else:
+                if not self._offline:
+                    logger.warning("Zebrunner is unavailable. Reporting events are buffered until it recovers")
+                self._offline.appendleft(event)
+
+    def _next_event(self) -> Optional[ReportingEvent]:
+        """
+        Returns next event to send. Keeps events in the offline buffer until circuit breaker lets
+        the next request through.
+        """
+        while True:
+            if self._offline and self._is_online:
+                return self._offline.popleft()
+
+            timeout = None
+            if self._offline and self.api.circuit_breaker is not None:
+                timeout = max(self.api.circuit_breaker.time_until_probe(), 0.1)
+            try:
+                event: Optional[ReportingEvent] = self._queue.get(timeout=timeout)
+            except Empty:
+                continue
+
+            if event is None or (not self._offline and self._is_online) or _references_unregistered(event.args):
+                return event
+            self._buffer(event)
+
+    def _buffer(self, event: ReportingEvent) -> None:
+        if len(self._offline) >= self.offline_buffer_size:
+            self.dropped_events += 1
+            event.result.resolve(None)
+            self._queue.task_done()
+            return
+
+        if not self._offline:
+            logger.warning("Zebrunner is unavailable. Reporting events are buffered until it recovers")
+        self._offline.append(event)
+
+    def _drop_offline_events(self) -> None:
+        while self._offline:
+            self._offline.popleft().result.resolve(None)
+            self.dropped_events += 1
+            self._queue.task_done()
+
+    def _send(self, event: ReportingEvent) -> bool:
+        """
+        Send event to Zebrunner. Returns False if the event has to be sent again after Zebrunner recovers.
+        """
+        result = None
+        try:
+            args = [_resolve(arg) for arg in event.args]
+            result = getattr(self.api, event.method)(*args)
+            if self.journal is not None:
+                self.journal.acknowledge(event.result.key, result)
+        except UnresolvedReferenceError:
+            logger.debug(f"Skipping '{event.method}' because referenced entity was not registered")
+        except CircuitOpenError:
+            return False
+        except AgentApiError as e:
+            if not self._is_online:
+                return False
+            logger.error(f"Failed to send '{event.method}' event", exc_info=e)
+        except Exception as e:
+            logger.error(f"Unexpected error while sending '{event.method}' event", exc_info=e)
+
+        event.result.resolve(result)
+        return True
+
+
+def send(api: ZebrunnerAPI, method: str, *args: Any) -> Any:
+    """
+    Call ZebrunnerAPI method right away or enqueue it when background reporting is enabled.
+    """
+    if zebrunner_context.pipeline is not None:
+        return zebrunner_context.pipeline.submit(method, *args)
+    return getattr(api, method)(*args)
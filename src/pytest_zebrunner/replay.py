@@ -0,0 +1,95 @@
+"""
+Sends reporting events recorded to the journal that were not acknowledged by Zebrunner:
+
+    python -m pytest_zebrunner.replay zebrunner-journal.jsonl
+
+Zebrunner connection settings are loaded the same way as by the plugin. Relative artifact paths are resolved
+against the current directory, so replay should be run from the directory the tests were run from.
+Replayed events are acknowledged in the journal, so running replay again sends only events that failed.
+"""
+
+import argparse
+import logging
+import sys
+from typing import List, NamedTuple, Optional
+
+from pytest_zebrunner.api.client import ZebrunnerAPI
+from pytest_zebrunner.errors import AgentApiError
+from pytest_zebrunner.journal import (
+    Journal,
+    UnknownReferenceError,
+    acknowledged_results,
+    decode_value,
+    read_journal,
+)
+from pytest_zebrunner.settings import load_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayResult(NamedTuple):
+    sent: int
+    skipped: int
+    failed: int
+
+
+def replay(path: str, api: ZebrunnerAPI) -> ReplayResult:
+    """
+    Send events from the journal that were not acknowledged. Ids issued by Zebrunner for replayed events
+    replace local references in the events that follow.
+    """
+    entries = list(read_journal(path))
+    references = acknowledged_results(entries)
+    journal = Journal(path)
+    sent = skipped = failed = 0
+    try:
+        for entry in entries:
+            if "key" not in entry or entry["key"] in references:
+                continue
+
+            try:
+                args = decode_value(entry["args"], references)
+            except UnknownReferenceError:
+                logger.warning(f"Skipping '{entry['method']}' because referenced entity was not registered")
+                skipped += 1
+                continue
+
+            try:
+                result = getattr(api, entry["method"])(*args)
+            except AgentApiError as e:
+                logger.error(f"Failed to send '{entry['method']}' event", exc_info=e)
+                failed += 1
+                continue
+
+            references[entry["key"]] = result
+            journal.acknowledge(entry["key"], result)
+            sent += 1
+    finally:
+        journal.close()
+
+    return ReplayResult(sent, skipped, failed)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Send reporting events journal to Zebrunner")
+    parser.add_argument("journal", help="path to the journal file")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    server = load_settings().server
+    api = ZebrunnerAPI(server.hostname, server.access_token, server)
+    try:
+        api.auth()
+        result = replay(args.journal, api)
+    except AgentApiError as e:
+        logger.error("Failed to replay journal", exc_info=e)
+        return 1
+    finally:
+        api.close()
+
+    logger.info(f"Sent {result.sent} events, skipped {result.skipped}, failed {result.failed}")
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
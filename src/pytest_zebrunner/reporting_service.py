@@ -1,5 +1,6 @@
+import json
 import logging
-from typing import Any, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pytest
 from _pytest._code.code import ExceptionChainRepr, ReprExceptionInfo
@@ -10,40 +11,145 @@ from selenium.webdriver.common.options import BaseOptions
 from pytest_zebrunner.api.client import ZebrunnerAPI
 from pytest_zebrunner.api.models import (
     ArtifactReferenceModel,
-    CorrelationDataModel,
     FinishTestModel,
     FinishTestSessionModel,
+    LabelModel,
+    LogRecordModel,
     MilestoneModel,
     NotificationsModel,
     NotificationsType,
     NotificationTargetModel,
+    RerunDataModel,
     StartTestModel,
     StartTestRunModel,
     StartTestSessionModel,
+    TestModel,
     TestRunConfigModel,
     TestStatus,
 )
+from pytest_zebrunner.artifact_cache import ArtifactCache, test_run_key
 from pytest_zebrunner.ci_loaders import CiContextLoader
 from pytest_zebrunner.context import Test, TestRun, zebrunner_context
 from pytest_zebrunner.errors import AgentApiError
+from pytest_zebrunner.journal import Journal
+from pytest_zebrunner.log_limiter import LogLimiter
+from pytest_zebrunner.log_shipper import LogShipper
+from pytest_zebrunner.metadata import TestMetadata, item_metadata
+from pytest_zebrunner.payload_limits import PayloadLimits, limit_name
+from pytest_zebrunner.pipeline import LazyId, ReportingPipeline, resolve_id, send
+from pytest_zebrunner.rerun_cache import read_rerun_data, write_rerun_data
+from pytest_zebrunner.retention import RetentionBuffer, is_flaky
+from pytest_zebrunner.screenshots import create_transcoder
+from pytest_zebrunner.settings import RetentionPolicy, ServerSettings, Settings
 from pytest_zebrunner.tcm.test_rail import TestRail
 from pytest_zebrunner.tcm.xray import Xray
-from pytest_zebrunner.tcm.zephyr import Zephyr
 from pytest_zebrunner.tcm.zebrunner import Zebrunner
-from pytest_zebrunner.zebrunner_logging import ZebrunnerHandler
+from pytest_zebrunner.tcm.zephyr import Zephyr
+from pytest_zebrunner.token_cache import AuthToken, TokenCache, token_key
+from pytest_zebrunner.upload_pool import UploadPool, upload
+from pytest_zebrunner.zebrunner_logging import (
+    deliver_captured_logs,
+    deliver_logs,
+    propagate_current_test,
+    stop_propagating_current_test,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def api_settings(settings: Settings) -> ServerSettings:
+    """
+    Returns server settings to create the API with. Requests rejected by an open circuit breaker are kept in the
+    offline buffer of background reporting only, so without it the breaker is turned off and no results are dropped.
+    """
+    background = settings.pipeline.enabled or settings.journal.enabled
+    if background or not settings.server.circuit_breaker.enabled:
+        return settings.server
+    circuit_breaker = settings.server.circuit_breaker.copy(update={"enabled": False})
+    return settings.server.copy(update={"circuit_breaker": circuit_breaker})
+
+
 class ReportingService:
     def __init__(self) -> None:
-        self.api = ZebrunnerAPI(
-            zebrunner_context.settings.server.hostname, zebrunner_context.settings.server.access_token
-        )
+        server_settings = api_settings(zebrunner_context.settings)
+        self.api = ZebrunnerAPI(server_settings.hostname, server_settings.access_token, server_settings)
+        self.token_cache: Optional[TokenCache] = None
+        if server_settings.auth.token_cache:
+            self.token_cache = TokenCache(server_settings.auth.token_cache, server_settings.auth.refresh_margin)
+        self.last_test: Optional[Test] = None
+        pipeline_settings = zebrunner_context.settings.pipeline
+        journal_settings = zebrunner_context.settings.journal
+        # Journal records events submitted to the pipeline, so it turns background reporting on
+        if (pipeline_settings.enabled or journal_settings.enabled) and zebrunner_context.pipeline is None:
+            journal = None
+            if journal_settings.enabled:
+                journal = Journal(journal_settings.path, journal_settings.batch_size, journal_settings.fsync_interval)
+            zebrunner_context.pipeline = ReportingPipeline(
+                self.api, pipeline_settings.queue_size, pipeline_settings.offline_buffer_size, journal
+            )
+        if zebrunner_context.payload_limits is None:
+            zebrunner_context.payload_limits = PayloadLimits(**zebrunner_context.settings.payloads.dict())
+        log_settings = zebrunner_context.settings.logs
+        if zebrunner_context.settings.send_logs and zebrunner_context.log_shipper is None:
+            zebrunner_context.log_shipper = LogShipper(
+                self.api,
+                log_settings.batch_records,
+                log_settings.batch_bytes,
+                log_settings.batch_age,
+                log_settings.buffer_records,
+            )
+            if log_settings.propagate_to_threads:
+                propagate_current_test()
+            limits_logs = log_settings.aggregate_repeats or log_settings.test_rate > 0 or log_settings.logger_rate > 0
+            if limits_logs and zebrunner_context.log_limiter is None:
+                zebrunner_context.log_limiter = LogLimiter(
+                    log_settings.test_rate,
+                    log_settings.test_burst,
+                    log_settings.logger_rate,
+                    log_settings.logger_burst,
+                    log_settings.aggregate_repeats,
+                )
+        retention_settings = zebrunner_context.settings.retention
+        if retention_settings.policy != RetentionPolicy.ALWAYS and zebrunner_context.retention is None:
+            zebrunner_context.retention = RetentionBuffer(retention_settings.policy, retention_settings.memory_limit)
+        screenshot_settings = zebrunner_context.settings.screenshots
+        if screenshot_settings.transcode and zebrunner_context.screenshot_transcoder is None:
+            zebrunner_context.screenshot_transcoder = create_transcoder(
+                image_format=screenshot_settings.format,
+                quality=screenshot_settings.quality,
+                max_width=screenshot_settings.max_width,
+                max_height=screenshot_settings.max_height,
+                deduplicate=screenshot_settings.deduplicate,
+                processes=screenshot_settings.processes,
+            )
+        upload_settings = zebrunner_context.settings.uploads
+        if upload_settings.workers > 0 and zebrunner_context.upload_pool is None:
+            pipeline = zebrunner_context.pipeline
+            zebrunner_context.upload_pool = UploadPool(
+                self.api,
+                upload_settings.workers,
+                pipeline.journal if pipeline is not None else None,
+                ArtifactCache() if upload_settings.deduplicate else None,
+                zebrunner_context.screenshot_transcoder,
+                upload_settings.timeout,
+            )
 
     def authorize(self) -> None:
-        if not self.api._authenticated:
-            self.api.auth()
+        if self.api._authenticated:
+            return
+
+        try:
+            if self.token_cache is None or not self.api.access_token:
+                self.api.auth()
+                return
+            key = token_key(self.api.service_url, self.api.access_token)
+            self.api.use_auth_token(*self.token_cache.get_or_refresh(key, self._refresh_auth_token))
+        except AgentApiError as e:
+            logging.error("Failed to authorize zebrunner agent", exc_info=e)
+
+    def _refresh_auth_token(self) -> AuthToken:
+        self.api.auth()
+        return self.api.auth_token  # type: ignore
 
     def get_notification_configurations(self) -> Optional[NotificationsModel]:
         settings = zebrunner_context.settings
@@ -95,7 +201,7 @@ class ReportingService:
 
         if settings.run.context:
             try:
-                zebrunner_run_context = self.api.get_rerun_tests(settings.run.context)
+                zebrunner_run_context = self.get_rerun_data(settings.run.context)
             except AgentApiError as e:
                 logging.error("Failed to get rerun tests", exc_info=e)
                 pytest.exit("Failed to get rerun tests")
@@ -105,6 +211,18 @@ class ReportingService:
                 pytest.exit(f"Run not allowed by zebrunner! Reason: {zebrunner_run_context.reason}")
             if zebrunner_run_context.run_only_specific_tests and not zebrunner_run_context.tests_to_run:
                 pytest.exit("Aborted. No tests to run!!")
+
+        pipeline = zebrunner_context.pipeline
+        if pipeline is not None:
+            test_run.zebrunner_id = pipeline.call("start_test_run", settings.project_key, start_run_model)
+            if test_run.zebrunner_id.get() is not None:
+                return
+            if pipeline.journal is None:
+                pytest.exit("Failed to start test run")
+            # Events are still recorded to the journal and can be reported later with `pytest_zebrunner.replay`
+            logging.warning(f"Failed to start test run. Reporting events are saved to {pipeline.journal.path}")
+            return
+
         try:
             test_run.zebrunner_id = self.api.start_test_run(settings.project_key, start_run_model)
         except AgentApiError as e:
@@ -116,52 +234,93 @@ class ReportingService:
             return
 
         self.authorize()
+        metadata: TestMetadata = report.zebrunner_metadata
+        name = metadata.name
+        node_id = report.nodeid
+        if zebrunner_context.payload_limits is not None:
+            # Parametrized test names may embed whole data blobs
+            name = zebrunner_context.payload_limits.name(name)
+            # Counted in savings once, as the test name
+            node_id = limit_name(node_id, zebrunner_context.payload_limits.max_name_length)
         test = Test(
-            name=".".join(report.nodeid.split("::")[1:]),
-            file=report.nodeid.split("::")[0],
-            maintainers=report.maintainers,
-            labels=report.labels,
+            name=name,
+            file=metadata.file,
+            maintainers=list(metadata.maintainers),
+            labels=list(metadata.labels),
         )
         zebrunner_context.test = test
+        self.last_test = test
         start_model = StartTestModel(
             name=test.name,
             class_name=test.file,
             method_name=test.name,
             maintainer=",".join(test.maintainers),
-            labels=[{"key": label[0], "value": label[1]} for label in test.labels],
-            correlation_data=CorrelationDataModel(name=test.name).json(),
+            labels=[LabelModel(key=key, value=value) for key, value in test.labels],
+            correlation_data=json.dumps({"name": test.name, "nodeId": node_id}),
         )
 
         test_id = self._find_attribute(report.user_properties, "zebrunner_id")
         try:
             if test_id:
-                test.zebrunner_id = self.api.update_test(zebrunner_context.test_run_id, int(test_id), start_model)
+                test.zebrunner_id = send(
+                    self.api, "update_test", zebrunner_context.test_run_id, int(test_id), start_model
+                )
             else:
-                test.zebrunner_id = self.api.start_test(zebrunner_context.test_run_id, start_model)
+                test.zebrunner_id = send(self.api, "start_test", zebrunner_context.test_run_id, start_model)
         except AgentApiError as e:
             logging.error("Failed to start test", exc_info=e)
             return
 
-        if report.artifact_references:
-            references = [ArtifactReferenceModel(name=x[0], value=x[1]) for x in report.artifact_references]
+        if zebrunner_context.retention is not None:
+            zebrunner_context.retention.hold(test)
+
+        if metadata.artifact_references:
+            references = [ArtifactReferenceModel(name=x[0], value=x[1]) for x in metadata.artifact_references]
             try:
-                self.api.send_artifact_references(references, zebrunner_context.test_run_id, zebrunner_context.test_id)
+                send(
+                    self.api,
+                    "send_artifact_references",
+                    references,
+                    zebrunner_context.test_run_id,
+                    zebrunner_context.test_id,
+                )
             except AgentApiError as e:
                 logging.error("Failed to send artifact reference", exc_info=e)
 
-        if report.artifacts:
-            for artifact in report.artifacts:
+        if metadata.artifacts:
+            for artifact in metadata.artifacts:
                 try:
-                    self.api.send_artifact(artifact, zebrunner_context.test_run_id, zebrunner_context.test_id)
+                    upload(
+                        self.api,
+                        test,
+                        "send_artifact",
+                        artifact,
+                        zebrunner_context.test_run_id,
+                        zebrunner_context.test_id,
+                    )
                 except AgentApiError as e:
                     logging.error("Failed to send artifact", exc_info=e)
 
+    def send_captured_logs(self, report: TestReport) -> None:
+        """
+        Send logs and output captured by pytest during the test phase of the report. Teardown follows the finish of
+        the test, so its logs belong to the last started test.
+        """
+        logs = getattr(report, "captured_logs", None)
+        test = zebrunner_context.test or self.last_test
+        if logs and test is not None and test.zebrunner_id is not None and not test.is_reverted:
+            deliver_captured_logs(test, logs)
+
     def finish_test(self, report: TestReport) -> None:
         # Test was reverted skip finishing
         if not zebrunner_context.test_is_active:
             return
 
         if zebrunner_context.test and zebrunner_context.test.is_reverted:
+            if zebrunner_context.log_limiter is not None:
+                zebrunner_context.log_limiter.finish(zebrunner_context.test)
+            if zebrunner_context.retention is not None:
+                zebrunner_context.retention.release(zebrunner_context.test, keep=False)
             return
 
         self.authorize()
@@ -169,6 +328,7 @@ class ReportingService:
         is_xfail = hasattr(report, "wasxfail")
 
         reason = None
+        crash = None
         if report.passed:
             status = TestStatus.PASSED
         elif is_skip or is_xfail:
@@ -185,30 +345,44 @@ class ReportingService:
             # https://docs.pytest.org/en/6.2.x/changelog.html?highlight=reprexceptioninfo#pytest-6-0-0rc1-2020-07-08
             reason = report.longrepr
             if isinstance(report.longrepr, ReprExceptionInfo) or isinstance(report.longrepr, ExceptionChainRepr):
-                reason = report.longrepr.reprcrash.message + "\n\n" + (str(reason) if reason else "")  # type: ignore
-
-        test_rail_case_ids = getattr(report, "test_rail_case_ids", None)
-        if test_rail_case_ids:
-            for case_id in test_rail_case_ids:
+                crash = report.longrepr.reprcrash.message  # type: ignore
+                reason = crash + "\n\n" + (str(reason) if reason else "")  # type: ignore
+        if reason is not None and zebrunner_context.payload_limits is not None and zebrunner_context.test is not None:
+            reason = zebrunner_context.payload_limits.reason(str(reason), zebrunner_context.test.name, crash)
+
+        metadata: Optional[TestMetadata] = getattr(report, "zebrunner_metadata", None)
+        if metadata is not None:
+            for case_id in metadata.test_rail_case_ids:
                 TestRail.set_case_id(case_id)
-
-        xray_case_ids = getattr(report, "xray_case_ids", None)
-        if xray_case_ids:
-            for case_id in xray_case_ids:
+            for case_id in metadata.xray_case_ids:
                 Xray.set_test_key(case_id)
-
-        zephyr_case_ids = getattr(report, "zephyr_case_ids", None)
-        if zephyr_case_ids:
-            for case_id in zephyr_case_ids:
+            for case_id in metadata.zephyr_case_ids:
                 Zephyr.set_test_case_key(case_id)
-
-        zebrunner_case_keys = getattr(report, "zebrunner_case_keys", None)
-        if zebrunner_case_keys:
-            for case_key in zebrunner_case_keys:
+            for case_key in metadata.zebrunner_case_keys:
                 Zebrunner.set_test_case_key(case_key)
 
+        limiter = zebrunner_context.log_limiter
+        if limiter is not None and zebrunner_context.test is not None:
+            # Summaries of aggregated and suppressed logs are subject to retention as any other test logs
+            deliver_logs(zebrunner_context.test, limiter.finish(zebrunner_context.test))
+        retention = zebrunner_context.retention
+        if retention is not None and zebrunner_context.test is not None:
+            keep = retention.keeps(status, is_flaky(report))
+            self._send_held_payloads(zebrunner_context.test, *retention.release(zebrunner_context.test, keep))
+        if zebrunner_context.upload_pool is not None:
+            timeout = zebrunner_context.settings.uploads.timeout
+            breaker = self.api.circuit_breaker
+            if breaker is not None and not breaker.accepts_requests:
+                # Uploads can not be sent during outage, test run goes on and they are sent later if possible
+                timeout = 0
+            zebrunner_context.upload_pool.wait(zebrunner_context.test, timeout)
+        elif zebrunner_context.screenshot_transcoder is not None:
+            zebrunner_context.screenshot_transcoder.forget(zebrunner_context.test)
+
         try:
-            self.api.finish_test(
+            send(
+                self.api,
+                "finish_test",
                 zebrunner_context.test_run_id,
                 zebrunner_context.test_id,
                 FinishTestModel(
@@ -225,34 +399,153 @@ class ReportingService:
         if not zebrunner_context.test_run_is_active:
             return
 
+        self.close_payload_limits()
+        self.close_log_limiter()
+        self.close_retention()
+        self.close_log_shipper()
+        self.close_upload_pool(remove_cache_index=True)
+        self.remove_retention_files()
+        pipeline = zebrunner_context.pipeline
+        if pipeline is not None:
+            # Test run is finished after all other events were sent
+            pipeline.flush(zebrunner_context.settings.pipeline.flush_timeout)
+            pipeline.call("finish_test_run", zebrunner_context.test_run_id)
+            self.close_pipeline()
+            self.close_screenshot_transcoder()
+            return
+
+        self.close_screenshot_transcoder()
         self.authorize()
         try:
-            self.api.finish_test_run(zebrunner_context.test_run_id)
+            self.api.finish_test_run(resolve_id(zebrunner_context.test_run_id))
         except AgentApiError as e:
             logging.error("failed to finish test run", exc_info=e)
 
-        loggers = [logging.getLogger(name) for name in logging.root.manager.loggerDict]  # type: ignore
-        handlers: List[ZebrunnerHandler] = []
-        for logger in loggers:
-            handlers += [handler for handler in logger.handlers if isinstance(handler, ZebrunnerHandler)]
+    def _send_held_payloads(self, test: Test, logs: List[LogRecordModel], uploads: List[Tuple[str, tuple]]) -> None:
+        if logs and zebrunner_context.log_shipper is not None:
+            for log in logs:
+                zebrunner_context.log_shipper.add(log)
+        for method, args in uploads:
+            try:
+                # Retention buffer has copied the files already
+                upload(self.api, test, method, *args, copied=True)
+            except AgentApiError as e:
+                logging.error("Failed to upload file", exc_info=e)
+
+    def close_payload_limits(self) -> None:
+        """
+        Report how much of failure reasons, test names and log messages was cut by payload limits.
+        """
+        payload_limits = zebrunner_context.payload_limits
+        if payload_limits is None:
+            return
+
+        payload_limits.report()
+        zebrunner_context.payload_limits = None
+
+    def close_log_limiter(self) -> None:
+        """
+        Send summaries of aggregated and suppressed logs of tests that were never finished.
+        """
+        limiter = zebrunner_context.log_limiter
+        if limiter is None:
+            return
+
+        for test, logs in limiter.close().items():
+            deliver_logs(test, logs)
+        zebrunner_context.log_limiter = None
+
+    def close_retention(self) -> None:
+        """
+        Send payloads held for tests that were never finished, e.g. because their setup failed.
+        """
+        retention = zebrunner_context.retention
+        if retention is None:
+            return
+
+        for test, payloads in retention.close().items():
+            self._send_held_payloads(test, *payloads)
 
-        for handler in handlers:
-            handler.push_logs()
+    def remove_retention_files(self) -> None:
+        """
+        Remove copies of files held for tests. Called once they are uploaded.
+        """
+        retention = zebrunner_context.retention
+        if retention is None:
+            return
+
+        retention.cleanup()
+        zebrunner_context.retention = None
+
+    def close_log_shipper(self) -> None:
+        """
+        Send buffered logs and stop the log shipper thread.
+        """
+        shipper = zebrunner_context.log_shipper
+        if shipper is None:
+            return
+
+        stop_propagating_current_test()
+        shipper.close(zebrunner_context.settings.pipeline.flush_timeout)
+        zebrunner_context.log_shipper = None
+
+    def close_upload_pool(self, remove_cache_index: bool = False) -> None:
+        """
+        Wait for artifact uploads that are still running and stop upload threads. Artifact cache index shared
+        by xdist workers is removed by the controller once the test run is finished.
+        """
+        pool = zebrunner_context.upload_pool
+        if pool is None:
+            return
+
+        pool.close(zebrunner_context.settings.pipeline.flush_timeout)
+        if remove_cache_index and pool.cache is not None and zebrunner_context.test_run_id is not None:
+            pool.cache.remove_index(test_run_key(zebrunner_context.test_run_id))
+        zebrunner_context.upload_pool = None
+
+    def close_screenshot_transcoder(self) -> None:
+        """
+        Stop transcoding processes and remove transcoded screenshots. Called once they are uploaded.
+        """
+        transcoder = zebrunner_context.screenshot_transcoder
+        if transcoder is None:
+            return
 
-    def start_test_session(self, session_id: str, options: BaseOptions, test_ids: List[int]) -> Optional[str]:
+        transcoder.close()
+        zebrunner_context.screenshot_transcoder = None
+
+    def close_pipeline(self) -> None:
+        """
+        Send all events left in background reporting queue and stop the sender thread.
+        """
+        pipeline = zebrunner_context.pipeline
+        if pipeline is None:
+            return
+
+        pipeline.close(zebrunner_context.settings.pipeline.flush_timeout)
+        zebrunner_context.pipeline = None
+
+    def start_test_session(
+        self, session_id: str, options: BaseOptions, test_ids: List[Union[int, LazyId]]
+    ) -> Optional[Union[str, LazyId]]:
         if not zebrunner_context.test_run_is_active:
             return None
 
         self.authorize()
+        start_session_model = StartTestSessionModel(
+            session_id=session_id,
+            desired_capabilities=options.to_capabilities(),
+            capabilities=options.capabilities,
+            test_ids=[x for x in map(resolve_id, test_ids) if x is not None],
+        )
+        if zebrunner_context.pipeline is not None:
+            return zebrunner_context.pipeline.call(
+                "start_test_session", zebrunner_context.test_run_id, start_session_model
+            )
+
         try:
             zebrunner_session_id = self.api.start_test_session(
-                zebrunner_context.test_run_id,
-                StartTestSessionModel(
-                    session_id=session_id,
-                    desired_capabilities=options.to_capabilities(),
-                    capabilities=options.capabilities,
-                    test_ids=test_ids,
-                ),
+                resolve_id(zebrunner_context.test_run_id), start_session_model
             )
         except AgentApiError as e:
             logging.error("failed to start test session", exc_info=e)
@@ -260,26 +553,33 @@ class ReportingService:
 
         return zebrunner_session_id
 
-    def add_test_to_session(self, zebrunner_session_id: str, related_tests: List[int]) -> None:
+    def add_test_to_session(
+        self, zebrunner_session_id: Union[str, LazyId], related_tests: List[Union[int, LazyId]]
+    ) -> None:
         if not zebrunner_context.test_run_is_active:
             return
 
         self.authorize()
         try:
-            self.api.add_tests_to_session(zebrunner_context.test_run_id, zebrunner_session_id, related_tests)
+            send(self.api, "add_tests_to_session", zebrunner_context.test_run_id, zebrunner_session_id, related_tests)
         except AgentApiError as e:
             logging.error("failed to add tests to session", exc_info=e)
 
-    def finish_test_session(self, zebrunner_session_id: str, related_tests: List[int]) -> None:
+    def finish_test_session(
+        self, zebrunner_session_id: Union[str, LazyId], related_tests: List[Union[int, LazyId]]
+    ) -> None:
         if not zebrunner_context.test_run_is_active:
             return
 
         self.authorize()
         try:
-            self.api.finish_test_session(
+            send(
+                self.api,
+                "finish_test_session",
                 zebrunner_context.test_run_id,
                 zebrunner_session_id,
-                FinishTestSessionModel(test_ids=related_tests),
+                # Ids of tests may be not resolved yet in background reporting mode
+                FinishTestSessionModel.construct(test_ids=list(related_tests)),
             )
         except AgentApiError as e:
             logging.error("failed to finish test session", exc_info=e)
@@ -291,28 +591,68 @@ class ReportingService:
 
         return None
 
+    def get_rerun_data(self, run_context: str) -> RerunDataModel:
+        """
+        Returns tests to rerun for the run context. The context is exchanged once: xdist workers get the data
+        from controller and it is read from the cache directory if one is configured.
+        """
+        if zebrunner_context.rerun_data is not None:
+            return zebrunner_context.rerun_data
+
+        cache_dir = zebrunner_context.settings.run.context_cache_dir
+        rerun_data = read_rerun_data(cache_dir, run_context) if cache_dir else None
+        if rerun_data is None:
+            self.authorize()
+            rerun_data = self.api.get_rerun_tests(run_context)
+            if cache_dir:
+                write_rerun_data(cache_dir, run_context, rerun_data)
+        zebrunner_context.rerun_data = rerun_data
+        return rerun_data
+
     def filter_test_items(self, items: List[Item]) -> List[Item]:
         run_context = zebrunner_context.settings.run.context
         if run_context is None:
             return items
 
         try:
-            self.authorize()
-            context_data = self.api.get_rerun_tests(run_context)
+            context_data = self.get_rerun_data(run_context)
         except AgentApiError as e:
             logging.error("failed to filter tests", exc_info=e)
             return items
 
-        rerun_tests = {x.name: x for x in context_data.tests_to_run if x.correlation_data is not None}
-
         if not context_data.tests_to_run:
             return items
 
-        rerun_items: List[Item] = []
-        for item in items:
-            if item.name in rerun_tests:
-                test = rerun_tests[item.name]
-                item.user_properties.append(("zebrunner_id", test.id))
-                rerun_items.append(item)
-
-        return rerun_items
+        return select_rerun_items(items, context_data.tests_to_run)
+
+
+def select_rerun_items(items: List[Item], tests_to_run: List[TestModel]) -> List[Item]:
+    """
+    Returns items of tests to rerun and binds them to the tests reported by the previous run. Tests are matched by
+    nodeid, which includes parameter id, so parametrized tests and tests with the same name in different modules
+    are told apart. Tests reported by older agent versions have no nodeid in correlation data and are matched
+    by name. Both are compared as capped by payload limits when they were reported.
+    """
+    payload_limits = zebrunner_context.payload_limits
+    max_length = payload_limits.max_name_length if payload_limits is not None else 0
+    tests_by_node_id: Dict[str, TestModel] = {}
+    tests_by_name: Dict[str, TestModel] = {}
+    for test_to_run in tests_to_run:
+        correlation_data = test_to_run.correlation_data
+        if correlation_data is None:
+            continue
+        if correlation_data.node_id is not None:
+            tests_by_node_id[correlation_data.node_id] = test_to_run
+        else:
+            tests_by_name[correlation_data.name] = test_to_run
+
+    rerun_items: List[Item] = []
+    for item in items:
+        test: Optional[TestModel] = tests_by_node_id.get(limit_name(item.nodeid, max_length))
+        if test is None and tests_by_name:
+            test = tests_by_name.get(limit_name(item_metadata(item).name, max_length))
+        if test is not None:
+            item.user_properties.append(("zebrunner_id", test.id))
+            rerun_items.append(item)
+
+    return rerun_items
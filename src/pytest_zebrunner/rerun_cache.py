@@ -0,0 +1,47 @@
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+from pydantic import ValidationError
+
+from pytest_zebrunner.api.models import RerunDataModel
+
+logger = logging.getLogger(__name__)
+
+
+def cache_path(directory: Union[str, Path], run_context: str) -> Path:
+    digest = hashlib.sha256(run_context.encode()).hexdigest()[:16]
+    return Path(directory) / f"zebrunner-rerun-{digest}.json"
+
+
+def read_rerun_data(directory: Union[str, Path], run_context: str) -> Optional[RerunDataModel]:
+    """
+    Returns rerun data exchanged for the run context earlier or None if it is not cached.
+    """
+    path = cache_path(directory, run_context)
+    try:
+        return RerunDataModel.parse_file(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, ValidationError) as e:
+        logger.warning(f"Failed to read cached rerun data {path}", exc_info=e)
+        return None
+
+
+def write_rerun_data(directory: Union[str, Path], run_context: str, data: RerunDataModel) -> None:
+    """
+    Caches rerun data of the run context. The file is replaced atomically, so concurrent runs never read
+    a partially written one.
+    """
+    path = cache_path(directory, run_context)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(suffix=".json", dir=path.parent)
+        with os.fdopen(file_descriptor, "w") as file:
+            file.write(data.json(by_alias=True))
+        os.replace(temporary_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to cache rerun data to {path}", exc_info=e)
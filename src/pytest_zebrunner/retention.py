@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pytest_zebrunner.api.models import LogRecordModel, TestStatus
+from pytest_zebrunner.context import Test
+from pytest_zebrunner.settings import RetentionPolicy
+
+logger = logging.getLogger(__name__)
+
+# Position of file path in arguments of ZebrunnerAPI upload methods
+FILE_ARGUMENTS = {"send_screenshot": 2, "send_artifact": 0}
+
+
+def keep_file(method: str, args: tuple, directory: Path) -> tuple:
+    """
+    Copies the file of upload method arguments to the directory and returns arguments referencing the copy, so the
+    upload sends the content the file had at this moment. Screenshots get the time they were taken.
+    """
+    index = FILE_ARGUMENTS[method]
+    # Every file gets own directory, because artifacts are uploaded under their original names
+    copy = Path(tempfile.mkdtemp(dir=directory)) / os.path.basename(args[index])
+    shutil.copyfile(args[index], copy)
+    args = tuple(str(copy) if position == index else arg for position, arg in enumerate(args))
+    if method == "send_screenshot" and len(args) == 3:
+        # Screenshot is uploaded later, but should be shown at the moment it was taken
+        args = (*args, "image/png", round(time.time() * 1000))
+    return args
+
+
+class HeldPayloads:
+    def __init__(self) -> None:
+        self.logs: List[LogRecordModel] = []
+        self.log_bytes = 0
+        self.spilled_logs: Optional[Path] = None
+        self.uploads: List[Tuple[str, tuple]] = []
+        self.directory: Optional[Path] = None
+
+
+class RetentionBuffer:
+    """
+    Holds logs, screenshots and artifacts of running tests until their status is known, so payloads of tests
+    that do not need them are never uploaded. Logs are kept in memory up to `memory_limit` bytes for all tests and
+    spilled to disk beyond it. Attached files are copied, because tests often reuse the same path.
+
+    Teardown runs after the test is finished and its payloads are released, so payloads the test adds later follow
+    the decision made for the test: they are sent right away if its payloads were kept and discarded otherwise.
+    """
+
+    def __init__(self, policy: RetentionPolicy, memory_limit: int = 16 * 1024 * 1024) -> None:
+        self.policy = policy
+        self.memory_limit = memory_limit
+        self._held: Dict[Test, HeldPayloads] = {}
+        self._released: Dict[Test, bool] = {}
+        self._memory = 0
+        self._directory: Optional[Path] = None
+        self._lock = threading.Lock()
+
+    def hold(self, test: Test) -> None:
+        """
+        Start holding payloads of the test.
+        """
+        with self._lock:
+            # Teardown of previously released tests is over by the time the next test starts
+            self._released.clear()
+            self._held[test] = HeldPayloads()
+
+    def keeps(self, status: TestStatus, is_flaky: bool) -> bool:
+        """
+        Returns True if payloads of test finished with the status should be uploaded.
+        """
+        if self.policy == RetentionPolicy.ALWAYS or status == TestStatus.FAILED:
+            return True
+        return self.policy == RetentionPolicy.ON_FAILURE_OR_FLAKY and is_flaky
+
+    def add_log(self, test: Test, record: LogRecordModel) -> bool:
+        """
+        Returns False if the test is not held and its payloads were not discarded, so the record should be sent
+        right away.
+        """
+        size = len(record.message)  # type: ignore
+        with self._lock:
+            held = self._held.get(test)
+            if held is None:
+                return self._released.get(test) is False
+            held.logs.append(record)
+            held.log_bytes += size
+            self._memory += size
+            if self._memory > self.memory_limit:
+                self._spill_logs(held)
+            return True
+
+    def add_upload(self, test: Any, method: str, args: tuple) -> bool:
+        """
+        Returns False if the test is not held and its payloads were not discarded, so the file should be uploaded
+        right away.
+        """
+        with self._lock:
+            held = self._held.get(test)
+            if held is None:
+                return self._released.get(test) is False
+            if held.directory is None:
+                held.directory = Path(tempfile.mkdtemp(dir=self._spool_directory()))
+
+            try:
+                args = keep_file(method, args, held.directory)
+            except OSError as e:
+                logger.error(f"Failed to keep {args[FILE_ARGUMENTS[method]]} until test is finished", exc_info=e)
+                return True
+            held.uploads.append((method, args))
+            return True
+
+    def release(self, test: Test, keep: bool) -> Tuple[List[LogRecordModel], List[Tuple[str, tuple]]]:
+        """
+        Stop holding payloads of the test. Returns logs and uploads to send if `keep` is True and discards them
+        otherwise. Copies of files are removed when the buffer is closed.
+        """
+        with self._lock:
+            held = self._held.pop(test, None)
+            if held is None:
+                return [], []
+            self._memory -= held.log_bytes
+            self._released[test] = keep
+        if not keep:
+            if held.spilled_logs is not None:
+                held.spilled_logs.unlink()
+            if held.directory is not None:
+                shutil.rmtree(held.directory, ignore_errors=True)
+            return [], []
+        return self._read_spilled_logs(test, held) + held.logs, held.uploads
+
+    def close(self) -> Dict[Test, Tuple[List[LogRecordModel], List[Tuple[str, tuple]]]]:
+        """
+        Release payloads of tests that were never finished, e.g. because of failed setup.
+        """
+        return {test: self.release(test, keep=True) for test in list(self._held)}
+
+    def cleanup(self) -> None:
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+    def _spool_directory(self) -> Path:
+        if self._directory is None:
+            self._directory = Path(tempfile.mkdtemp(prefix="zebrunner-retention-"))
+        return self._directory
+
+    def _spill_logs(self, held: HeldPayloads) -> None:
+        if held.spilled_logs is None:
+            file_descriptor, path = tempfile.mkstemp(suffix=".jsonl", dir=self._spool_directory())
+            os.close(file_descriptor)
+            held.spilled_logs = Path(path)
+        with open(held.spilled_logs, "a") as file:
+            for record in held.logs:
+                file.write(json.dumps([record.timestamp, record.level, record.message]) + "\n")  # type: ignore
+        self._memory -= held.log_bytes
+        held.logs = []
+        held.log_bytes = 0
+
+    def _read_spilled_logs(self, test: Test, held: HeldPayloads) -> List[LogRecordModel]:
+        if held.spilled_logs is None:
+            return []
+        with open(held.spilled_logs) as file:
+            records = [
+                LogRecordModel(test_id=test.zebrunner_id, timestamp=timestamp, level=level, message=message)
+                for timestamp, level, message in map(json.loads, file)
+            ]
+        held.spilled_logs.unlink()
+        return records
+
+
+def is_flaky(report: Any) -> bool:
+    """
+    Returns True if the test passed after reruns made by pytest-rerunfailures.
+    """
+    return getattr(report, "rerun", 0) > 0
@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {"jpeg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+
+
+def transcode(
+    path: Union[str, Path], directory: str, image_format: str, quality: int, max_width: int, max_height: int
+) -> Tuple[str, Optional[str]]:
+    """
+    Runs in a worker process. Downscales the image to fit max dimensions and encodes it in the given format.
+    Returns digest of the original pixels and path of the encoded image or None if it is not smaller than the
+    original file.
+    """
+    with Image.open(path) as image:
+        image.load()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{image.mode}{image.size}".encode())
+        digest.update(image.tobytes())
+
+        resized = image.width > max_width or image.height > max_height
+        if resized:
+            image.thumbnail((max_width, max_height), Image.LANCZOS)  # type: ignore
+        if image_format == "jpeg" and image.mode != "RGB":
+            image = image.convert("RGB")  # type: ignore
+
+        file_descriptor, output = tempfile.mkstemp(suffix=f".{image_format}", dir=directory)
+        with os.fdopen(file_descriptor, "wb") as file:
+            image.save(file, image_format, quality=quality, optimize=True)
+
+    if not resized and os.path.getsize(output) >= os.path.getsize(path):
+        os.remove(output)
+        return digest.hexdigest(), None
+    return digest.hexdigest(), output
+
+
+class ScreenshotTranscoder:
+    """
+    Re-encodes and downscales screenshots before upload in a pool of processes, so encoding does not compete
+    with tests for the GIL. Optionally skips screenshots identical to the previous one of the same test.
+    """
+
+    def __init__(
+        self,
+        image_format: str = "jpeg",
+        quality: int = 80,
+        max_width: int = 1920,
+        max_height: int = 1080,
+        deduplicate: bool = False,
+        processes: int = 2,
+    ) -> None:
+        if image_format not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported screenshot format '{image_format}'")
+        self.image_format = image_format
+        self.quality = quality
+        self.max_width = max_width
+        self.max_height = max_height
+        self.deduplicate = deduplicate
+        self.processes = processes
+        self._directory = tempfile.mkdtemp(prefix="zebrunner-screenshots-")
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._last_digests: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, owner: Any, path: Union[str, Path]) -> Optional[Tuple[str, str]]:
+        """
+        Returns path and content type of the screenshot to upload or None if it repeats the previous screenshot
+        of the owner. The original file is returned if it can not be transcoded.
+        """
+        with self._lock:
+            if self._executor is None:
+                # Started lazily, most of test runs never take a screenshot. Workers are spawned rather than
+                # forked, forking a process running reporting threads may copy locks held by them
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+                )
+            executor = self._executor
+        try:
+            digest, output = executor.submit(
+                transcode, path, self._directory, self.image_format, self.quality, self.max_width, self.max_height
+            ).result()
+        except Exception as e:
+            logger.warning(f"Failed to transcode screenshot {path}, uploading it as is", exc_info=e)
+            return str(path), CONTENT_TYPES["png"]
+
+        with self._lock:
+            repeated = self.deduplicate and self._last_digests.get(owner) == digest
+            self._last_digests[owner] = digest
+        if repeated:
+            if output is not None:
+                os.remove(output)
+            return None
+        if output is None:
+            return str(path), CONTENT_TYPES["png"]
+        return output, CONTENT_TYPES[self.image_format]
+
+    def cleanup(self, path: str) -> None:
+        """
+        Removes transcoded screenshot after upload. Original screenshots are kept.
+        """
+        if os.path.dirname(path) == self._directory:
+            os.remove(path)
+
+    def forget(self, owner: Any) -> None:
+        with self._lock:
+            self._last_digests.pop(owner, None)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+
+def create_transcoder(**options: Any) -> Optional[ScreenshotTranscoder]:
+    """
+    Returns screenshot transcoder or None if Pillow is not installed.
+    """
+    if Image is None:
+        logger.warning("Screenshot transcoding requires Pillow, screenshots are uploaded as is")
+        return None
+    return ScreenshotTranscoder(**options)
@@ -1,10 +1,11 @@
 import copy
 import logging
-from typing import Dict, List
+from typing import Dict, List, Union
 
 from selenium.webdriver.common.options import BaseOptions
 
 from pytest_zebrunner.context import zebrunner_context
+from pytest_zebrunner.pipeline import LazyId
 from pytest_zebrunner.reporting_service import ReportingService
 
 logger = logging.getLogger(__name__)
@@ -25,9 +26,9 @@ allowed_capabilities: List = [
 
 
 class SeleniumSession:
-    zebrunner_id: str
+    zebrunner_id: Union[str, LazyId]
     id: str
-    tests: List[int]
+    tests: List[Union[int, LazyId]]
 
     def __init__(self, id: str) -> None:
         self.id = id
@@ -42,8 +43,9 @@ class SeleniumSessionManager:
     def start_session(self, session_id: str, options: BaseOptions) -> None:
         session = SeleniumSession(session_id)
         self._active_sessions[session_id] = session
-        if zebrunner_context.test_is_active:
-            session.tests.append(zebrunner_context.test_id)
+        test_id = zebrunner_context.test_id
+        if zebrunner_context.test_is_active and test_id is not None:
+            session.tests.append(test_id)
 
         zebrunner_session_id = self._reporting_service.start_test_session(
             session_id, options, self._active_sessions[session_id].tests
@@ -60,7 +62,7 @@ class SeleniumSessionManager:
         for session_id in list(self._active_sessions.keys()):
             self.finish_session(session_id)
 
-    def add_test(self, test_id: int) -> None:
+    def add_test(self, test_id: Union[int, LazyId]) -> None:
         for session in self._active_sessions.values():
             session.tests.append(test_id)
             self._reporting_service.add_test_to_session(session.zebrunner_id, [test_id])
@@ -102,8 +104,9 @@ def inject_driver(session_manager: SeleniumSessionManager) -> None:
                 options=opts,
             )
             session_manager.start_session(session.session_id, options)
-            if zebrunner_context.test_is_active:
-                session_manager.add_test(zebrunner_context.test_id)
+            test_id = zebrunner_context.test_id
+            if zebrunner_context.test_is_active and test_id is not None:
+                session_manager.add_test(test_id)
 
         def quit(session) -> None:  # type: ignore
             session_manager.finish_session(session.session_id)
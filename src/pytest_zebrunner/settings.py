@@ -1,6 +1,7 @@
 import json
 import logging
 import os
+from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Type
 
@@ -22,9 +23,58 @@ class TestRunSettings(BaseModel):
     build: Optional[str] = None
     environment: Optional[str] = None
     context: Optional[str] = None
+    context_cache_dir: Optional[str] = None
     treat_skips_as_failures: bool = True
 
 
+class CircuitBreakerSettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents circuit breaker settings.
+    """
+
+    # Takes effect with background reporting only, it buffers requests while the circuit is open
+    enabled: bool = True
+    failure_threshold: int = 5
+    latency_slo: Optional[float] = None
+    recovery_timeout: float = 30.0
+
+
+class RetrySettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents retry settings.
+    """
+
+    attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    budget: float = 300.0
+
+
+class ContentEncoding(Enum):
+    IDENTITY = "identity"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class CompressionSettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents request body compression settings.
+    """
+
+    encoding: ContentEncoding = ContentEncoding.IDENTITY
+    threshold: int = 1024
+    level: Optional[int] = None
+
+
+class AuthSettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents auth token settings.
+    """
+
+    token_cache: Optional[str] = None
+    refresh_margin: float = 60.0
+
+
 class ServerSettings(BaseModel):
     """
     A class that inherit from BaseModel and represents server settings.
@@ -32,6 +82,19 @@ class ServerSettings(BaseModel):
 
     hostname: str
     access_token: str
+    http2: bool = False
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 5.0
+    connect_timeout: Optional[float] = 60.0
+    read_timeout: Optional[float] = 60.0
+    write_timeout: Optional[float] = 60.0
+    pool_timeout: Optional[float] = 60.0
+    max_request_size: int = 4 * 1024 * 1024
+    compression: CompressionSettings = CompressionSettings()
+    auth: AuthSettings = AuthSettings()
+    retry: RetrySettings = RetrySettings()
+    circuit_breaker: CircuitBreakerSettings = CircuitBreakerSettings()
 
 
 class NotificationsSettings(BaseModel):
@@ -72,6 +135,100 @@ class ZebrunnerSettings(BaseModel):
     hub_url: Optional[str] = None
 
 
+class PipelineSettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents background reporting settings.
+    """
+
+    enabled: bool = False
+    queue_size: int = 10000
+    offline_buffer_size: int = 100000
+    flush_timeout: float = 300.0
+
+
+class UploadSettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents artifact upload settings.
+    """
+
+    workers: int = 4
+    timeout: float = 60.0
+    deduplicate: bool = True
+
+
+class ScreenshotSettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents screenshot transcoding settings.
+    """
+
+    transcode: bool = False
+    format: str = "jpeg"
+    quality: int = 80
+    max_width: int = 1920
+    max_height: int = 1080
+    deduplicate: bool = False
+    processes: int = 2
+
+
+class LogSettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents test log shipping settings.
+    """
+
+    batch_records: int = 1000
+    batch_bytes: int = 1024 * 1024
+    batch_age: float = 1.0
+    buffer_records: int = 100000
+    capture: bool = False
+    propagate_to_threads: bool = False
+    # Log volume limits are opt-in. REPORTING_LOGS_AGGREGATE_REPEATS=true merges identical consecutive records
+    # of a logger, REPORTING_LOGS_TEST_RATE and REPORTING_LOGS_LOGGER_RATE set records per second allowed for a
+    # test and a logger of the test beyond their bursts. Rate 0 means unlimited
+    aggregate_repeats: bool = False
+    test_rate: float = 0
+    test_burst: int = 2000
+    logger_rate: float = 0
+    logger_burst: int = 1000
+
+
+class RetentionPolicy(Enum):
+    ALWAYS = "always"
+    ON_FAILURE = "on_failure"
+    ON_FAILURE_OR_FLAKY = "on_failure_or_flaky"
+
+
+class RetentionSettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents retention settings of test logs, screenshots and artifacts.
+    """
+
+    policy: RetentionPolicy = RetentionPolicy.ALWAYS
+    memory_limit: int = 16 * 1024 * 1024
+
+
+class PayloadSettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents size limits of failure reasons, test names and log messages.
+    """
+
+    max_reason_length: int = 64 * 1024
+    max_name_length: int = 1024
+    max_log_message_length: int = 32 * 1024
+    # Reasons are deduplicated within a process, so xdist workers each send the first occurrence in full
+    deduplicate_reasons: bool = False
+
+
+class JournalSettings(BaseModel):
+    """
+    A class that inherit from BaseModel and represents reporting events journal settings.
+    """
+
+    enabled: bool = False
+    path: str = "zebrunner-journal.jsonl"
+    batch_size: int = 100
+    fsync_interval: float = 1.0
+
+
 class Settings(BaseModel):
     """
     A class that inherit from BaseModel and represents some settings.
@@ -85,6 +242,13 @@ class Settings(BaseModel):
     notification: Optional[NotificationsSettings] = None
     milestone: Optional[MilestoneSettings] = None
     zebrunner: Optional[ZebrunnerSettings] = None
+    pipeline: PipelineSettings = PipelineSettings()
+    journal: JournalSettings = JournalSettings()
+    uploads: UploadSettings = UploadSettings()
+    screenshots: ScreenshotSettings = ScreenshotSettings()
+    logs: LogSettings = LogSettings()
+    retention: RetentionSettings = RetentionSettings()
+    payloads: PayloadSettings = PayloadSettings()
 
 
 def _list_settings(model: Type[BaseModel]) -> List:
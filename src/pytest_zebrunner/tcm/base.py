@@ -3,6 +3,7 @@ import logging
 from pytest_zebrunner.api.client import ZebrunnerAPI
 from pytest_zebrunner.api.models import LabelModel
 from pytest_zebrunner.context import zebrunner_context
+from pytest_zebrunner.pipeline import send
 
 
 class AgentException(Exception):
@@ -12,13 +13,15 @@ class AgentException(Exception):
 class BaseTcm:
     @staticmethod
     def _attach_label(name: str, value: str) -> None:
-        api = ZebrunnerAPI(zebrunner_context.settings.server.hostname, zebrunner_context.settings.server.access_token)
-        api.auth()
+        server_settings = zebrunner_context.settings.server
+        api = ZebrunnerAPI(server_settings.hostname, server_settings.access_token, server_settings)
+        if not api._authenticated:
+            api.auth()
         if not zebrunner_context.test_run_is_active:
             logging.error(f"Failed to attach label '{name}: {value}' to test run because it has not been started yet.")
             return
         label = LabelModel(key=name, value=value)
-        api.send_labels([label], zebrunner_context.test_run_id, zebrunner_context.test_id)
+        send(api, "send_labels", [label], zebrunner_context.test_run_id, zebrunner_context.test_id)
 
     @staticmethod
     def _verify_no_tests() -> None:
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Bearer token and time it expires at in seconds since epoch, None if unknown
+AuthToken = Tuple[str, Optional[float]]
+
+
+def token_key(service_url: str, access_token: str) -> str:
+    """
+    Returns key of tokens issued for the access token. Access token itself is never stored.
+    """
+    return hashlib.sha256(f"{service_url}\0{access_token}".encode()).hexdigest()
+
+
+def is_fresh(expires_at: Optional[float], refresh_margin: float) -> bool:
+    return expires_at is None or time.time() < expires_at - refresh_margin
+
+
+class TokenCache:
+    """
+    Auth tokens shared by processes of the machine, e.g. by consecutive pytest invocations of a CI job. The file
+    is locked while a token is refreshed, so processes starting at once authorize only once. Tokens without
+    known expiration time are not cached.
+    """
+
+    def __init__(self, path: Union[str, Path], refresh_margin: float = 60.0) -> None:
+        self.path = Path(path)
+        self.refresh_margin = refresh_margin
+
+    def get_or_refresh(self, key: str, refresh: Callable[[], AuthToken]) -> AuthToken:
+        """
+        Returns cached token if it does not expire within refresh margin. Otherwise gets a new one with `refresh`
+        and caches it.
+        """
+        try:
+            file_descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError as e:
+            logger.warning(f"Failed to open auth token cache {self.path}", exc_info=e)
+            return refresh()
+
+        with os.fdopen(file_descriptor, "r+") as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                try:
+                    tokens = json.loads(file.read() or "{}")
+                except ValueError:
+                    tokens = {}
+                cached = tokens.get(key)
+                if cached is not None and is_fresh(cached["expiresAt"], self.refresh_margin):
+                    return cached["token"], cached["expiresAt"]
+
+                token, expires_at = refresh()
+                if expires_at is not None:
+                    tokens = {k: v for k, v in tokens.items() if is_fresh(v["expiresAt"], 0)}
+                    tokens[key] = {"token": token, "expiresAt": expires_at}
+                    file.seek(0)
+                    file.truncate()
+                    file.write(json.dumps(tokens))
+                return token, expires_at
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(file, fcntl.LOCK_UN)
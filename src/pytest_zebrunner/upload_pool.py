@@ -0,0 +1,206 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pytest_zebrunner.api.client import ZebrunnerAPI
+from pytest_zebrunner.api.models import generate_uuid
+from pytest_zebrunner.artifact_cache import ArtifactCache, test_run_key
+from pytest_zebrunner.context import zebrunner_context
+from pytest_zebrunner.journal import Journal
+from pytest_zebrunner.pipeline import LazyId, send
+from pytest_zebrunner.retention import FILE_ARGUMENTS, keep_file
+from pytest_zebrunner.screenshots import ScreenshotTranscoder
+
+logger = logging.getLogger(__name__)
+
+
+class UploadPool:
+    """
+    Bounded pool uploading artifacts and screenshots in background threads, so uploads overlap each other and
+    the test execution. Files are copied when the upload is submitted, because tests often reuse the same path or
+    remove files right after attaching them. Uploads are tracked by owner (a test or None for the test run), so
+    finishing a test waits only for uploads of that test. Repeated artifacts are skipped if `cache` is given,
+    screenshots are re-encoded by `transcoder` if it is given.
+
+    Uploads wait for ids of entities created in background reporting mode at most `resolve_timeout` seconds,
+    so workers are not parked while Zebrunner is unavailable.
+    """
+
+    def __init__(
+        self,
+        api: ZebrunnerAPI,
+        workers: int = 4,
+        journal: Optional[Journal] = None,
+        cache: Optional[ArtifactCache] = None,
+        transcoder: Optional[ScreenshotTranscoder] = None,
+        resolve_timeout: Optional[float] = None,
+    ) -> None:
+        self.api = api
+        self.journal = journal
+        self.cache = cache
+        self.transcoder = transcoder
+        self.resolve_timeout = resolve_timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zebrunner-upload")
+        self._pending: Dict[Any, List[Future]] = defaultdict(list)
+        self._directory: Optional[Path] = None
+        self._lock = threading.Lock()
+
+    def submit(self, owner: Any, method: str, *args: Any, copied: bool = False) -> Future:
+        """
+        Schedule call of ZebrunnerAPI upload method. The file is copied right away unless it is `copied` already,
+        so errors reading it are raised to the caller. Errors of the upload are logged.
+        """
+        key = generate_uuid()
+        recorded = args
+        is_copy = method in FILE_ARGUMENTS and not copied
+        if is_copy:
+            index = FILE_ARGUMENTS[method]
+            args = keep_file(method, args, self._spool_directory())
+            # Copies are removed after upload, so replay reads the original file
+            recorded = tuple(recorded[index] if position == index else arg for position, arg in enumerate(args))
+        if self.journal is not None:
+            self.journal.record(key, method, recorded, time.time())
+        future = self._executor.submit(self._upload, owner, key, method, args, is_copy)
+        with self._lock:
+            self._pending[owner].append(future)
+        return future
+
+    def _upload(self, owner: Any, key: str, method: str, args: tuple, is_copy: bool = False) -> None:
+        try:
+            self._send(owner, key, method, args)
+        finally:
+            if is_copy:
+                shutil.rmtree(os.path.dirname(args[FILE_ARGUMENTS[method]]), ignore_errors=True)
+
+    def _send(self, owner: Any, key: str, method: str, args: tuple) -> None:
+        # Ids of entities may be not resolved yet in background reporting mode
+        resolved = [arg.get(self.resolve_timeout) if isinstance(arg, LazyId) else arg for arg in args]
+        unresolved = [arg for arg, value in zip(args, resolved) if isinstance(arg, LazyId) and value is None]
+        if any(arg.is_resolved for arg in unresolved):
+            logger.debug(f"Skipping '{method}' because referenced entity was not registered")
+            return
+        if unresolved:
+            logger.warning(f"Skipping '{method}' because Zebrunner did not register the entity in time")
+            return
+
+        cache_key = self._cache_key(method, args)
+        if cache_key is not None and not self.cache.claim(owner, *cache_key):  # type: ignore
+            logger.debug(f"Skipping '{method}' because {args[0]} was already uploaded")
+            if self.journal is not None:
+                self.journal.acknowledge(key, None)
+            return
+
+        transcoded = None
+        if method == "send_screenshot" and self.transcoder is not None:
+            screenshot = self.transcoder.prepare(owner, args[2])
+            if screenshot is None:
+                logger.debug("Skipping screenshot identical to the previous one")
+                if self.journal is not None:
+                    self.journal.acknowledge(key, None)
+                return
+            transcoded = screenshot[0]
+            resolved = [*resolved[:2], *screenshot, *resolved[4:]]
+
+        try:
+            getattr(self.api, method)(*resolved)
+        except Exception as e:
+            # Nobody waits for results of uploads, so errors are logged here, e.g. file removed by the test
+            logger.error(f"Failed to upload file with '{method}'", exc_info=e)
+            if cache_key is not None:
+                self.cache.release(owner, *cache_key)  # type: ignore
+            return
+        finally:
+            if transcoded is not None:
+                self.transcoder.cleanup(transcoded)  # type: ignore
+        if self.journal is not None:
+            self.journal.acknowledge(key, None)
+
+    def _spool_directory(self) -> Path:
+        with self._lock:
+            if self._directory is None:
+                self._directory = Path(tempfile.mkdtemp(prefix="zebrunner-uploads-"))
+            return self._directory
+
+    def _cache_key(self, method: str, args: tuple) -> Optional[Tuple[str, str]]:
+        """
+        Returns content digest and test run key of artifact upload that should be deduplicated.
+        """
+        if self.cache is None or method != "send_artifact":
+            return None
+        path, test_run_id = args[0], args[1]
+        try:
+            digest = self.cache.digest(path)
+        except OSError:
+            # Missing file fails the upload, which logs the error
+            return None
+        return digest, test_run_key(test_run_id)
+
+    def wait(self, owner: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for uploads of the owner. Returns False if some of them did not finish in time. These keep running
+        and are waited for when the pool is closed.
+        """
+        with self._lock:
+            futures = self._pending.pop(owner, [])
+        _, not_done = wait(futures, timeout)
+        if owner is not None:
+            if self.cache is not None:
+                self.cache.forget(owner)
+            if self.transcoder is not None:
+                self.transcoder.forget(owner)
+        if not_done:
+            logger.warning(f"{len(not_done)} uploads did not finish in {timeout}s, continuing in background")
+            with self._lock:
+                self._pending[None].extend(not_done)
+        return not not_done
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            futures = [future for owner_futures in self._pending.values() for future in owner_futures]
+            self._pending.clear()
+        _, not_done = wait(futures, timeout)
+        if not_done:
+            logger.error(f"{len(not_done)} uploads did not finish in time")
+        self._executor.shutdown(wait=False)
+        if self._directory is not None and not not_done:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+
+def upload(api: ZebrunnerAPI, owner: Any, method: str, *args: Any, copied: bool = False) -> None:
+    """
+    Upload file in background when upload pool is enabled or right away otherwise. Files of tests are held until
+    the test is finished if retention policy requires it. `copied` files are copies no one else writes to.
+    Screenshots are transcoded by the screenshot transcoder of the context if it is enabled.
+    """
+    retention = zebrunner_context.retention
+    if retention is not None and method in FILE_ARGUMENTS and retention.add_upload(owner, method, args):
+        return
+
+    pool = zebrunner_context.upload_pool
+    if pool is not None:
+        pool.submit(owner, method, *args, copied=copied)
+        return
+
+    transcoder = zebrunner_context.screenshot_transcoder
+    if method != "send_screenshot" or transcoder is None:
+        send(api, method, *args)
+        return
+
+    screenshot = transcoder.prepare(owner, args[2])
+    if screenshot is None:
+        logger.debug("Skipping screenshot identical to the previous one")
+        return
+    try:
+        send(api, method, *args[:2], *screenshot, *args[4:])
+    finally:
+        # Background reporting reads the file later, transcoder removes it when it is closed
+        if zebrunner_context.pipeline is None:
+            transcoder.cleanup(screenshot[0])
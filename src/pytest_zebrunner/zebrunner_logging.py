@@ -1,12 +1,25 @@
-import logging
+import functools
+import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
 from logging import LogRecord, StreamHandler
-from typing import List
+from typing import Any, Callable, List, Tuple
+
+from _pytest.nodes import Item
+from _pytest.reports import TestReport
 
-from pytest_zebrunner.api.client import ZebrunnerAPI
 from pytest_zebrunner.api.models import LogRecordModel
-from pytest_zebrunner.context import zebrunner_context
+from pytest_zebrunner.context import Test, current_test, zebrunner_context
+
+try:
+    from _pytest.logging import caplog_records_key
+except ImportError:
+    caplog_records_key = None  # type: ignore
+
+_thread_start = threading.Thread.start
+_executor_submit = ThreadPoolExecutor.submit
+# Set while a thread pool task is submitted, worker threads started by the executor then are not bound to the test
+_submitting = threading.local()
 
 
 class ZebrunnerHandler(StreamHandler):
@@ -14,46 +27,141 @@ class ZebrunnerHandler(StreamHandler):
     A class that inherit from StreamHandler useful for recording logs.
     """
 
-    logs: List[LogRecordModel] = []
-
-    def __init__(self) -> None:
-        super().__init__()
-        if zebrunner_context.is_configured:
-            self.api = ZebrunnerAPI(
-                zebrunner_context.settings.server.hostname, zebrunner_context.settings.server.access_token
-            )
-        else:
-            self.api = None  # type: ignore
-        self.last_push = datetime.utcnow()
-
     def emit(self, record: LogRecord) -> None:
         """
-        Try to send logs to test_run_id if the last attempt was more than a second ago. If not, and test is active,
-        adds a new log to the list.
+        Adds a new log to the log shipper if test is active. Logs are sent to Zebrunner in background.
+        Records are attributed to the test bound to the current thread or asyncio task, falling back to the
+        running test for threads started outside of tests.
         """
-        if datetime.utcnow() - self.last_push >= timedelta(seconds=1):
-            self.push_logs()
-
-        if zebrunner_context.test_is_active:
-            self.logs.append(
-                LogRecordModel(
-                    test_id=str(zebrunner_context.test_id),
-                    timestamp=str(round(time.time() * 1000)),
-                    level=record.levelname,
-                    message=str(record.msg),
-                )
+        shipper = zebrunner_context.log_shipper
+        if shipper is None or not zebrunner_context.test_run_is_active or zebrunner_context.settings.logs.capture:
+            return
+
+        test = current_test.get() or zebrunner_context.test
+        if test is not None and test.zebrunner_id is not None:
+            # Test id may be LazyId resolved by reporting pipeline before the logs are sent
+            log = LogRecordModel(
+                test_id=test.zebrunner_id,
+                timestamp=str(round(record.created * 1000)),
+                level=record.levelname,
+                message=_limit_message(str(record.msg)),
             )
+            limiter = zebrunner_context.log_limiter
+            deliver_logs(test, [log] if limiter is None else limiter.process(test, record.name, log))
 
     def push_logs(self) -> None:
         """
-        Updates last_push datetime, resets logs list and send the to Zebrunner API
-        for reporting if test_run_id is activ
+        Sends buffered logs to Zebrunner right away.
         """
-        try:
-            if zebrunner_context.test_run_id and zebrunner_context.settings.send_logs:
-                self.api.send_logs(zebrunner_context.test_run_id, self.logs)
-        except Exception as e:
-            logging.error("Failed to send logs to zebrunner", exc_info=e)
-        finally:
-            self.logs = []
-            self.last_push = datetime.utcnow()
+        shipper = zebrunner_context.log_shipper
+        if shipper is not None:
+            shipper.flush()
+
+
+def _limit_message(message: str) -> str:
+    payload_limits = zebrunner_context.payload_limits
+    return message if payload_limits is None else payload_limits.log_message(message)
+
+
+def deliver_logs(test: Test, logs: List[LogRecordModel]) -> None:
+    """
+    Pass logs of the test to the log shipper or hold them until the test is finished if retention policy requires.
+    """
+    shipper = zebrunner_context.log_shipper
+    retention = zebrunner_context.retention
+    for log in logs:
+        if retention is not None and retention.add_log(test, log):
+            continue
+        if shipper is not None:
+            shipper.add(log)
+
+
+def captured_logs(item: Item, report: TestReport) -> List[Tuple[str, float, str, str]]:
+    """
+    Returns logger name, time, level and message of log records and output captured by pytest during the test
+    phase of the report.
+    """
+    records: List[LogRecord] = []
+    store = getattr(item, "stash", getattr(item, "_store", None))
+    if caplog_records_key is not None and store is not None and caplog_records_key in store:
+        records = store[caplog_records_key].get(report.when, [])
+    elif report.when == "teardown":
+        records = vars(item).pop("_zebrunner_teardown_records", [])
+    logs = [(record.name, record.created, record.levelname, record.getMessage()) for record in records]
+
+    now = time.time()
+    for title, content in report.sections:
+        if title == f"Captured stdout {report.when}":
+            logs.append(("stdout", now, "INFO", content))
+        elif title == f"Captured stderr {report.when}":
+            logs.append(("stderr", now, "WARNING", content))
+    return logs
+
+
+def keep_teardown_records(item: Item) -> None:
+    """
+    Keep log records captured by pytest during teardown of the item. Pytest drops captured records at the end of
+    teardown, before the teardown report is made.
+    """
+    store = getattr(item, "stash", getattr(item, "_store", None))
+    if caplog_records_key is not None and store is not None and caplog_records_key in store:
+        item._zebrunner_teardown_records = store[caplog_records_key].get("teardown", [])  # type: ignore
+
+
+def deliver_captured_logs(test: Test, logs: List[Tuple[str, float, str, str]]) -> None:
+    limiter = zebrunner_context.log_limiter
+    records: List[LogRecordModel] = []
+    for logger_name, created, level, message in logs:
+        record = LogRecordModel(
+            test_id=test.zebrunner_id,
+            timestamp=str(round(created * 1000)),
+            level=level,
+            message=_limit_message(message),
+        )
+        records += [record] if limiter is None else limiter.process(test, logger_name, record)
+    deliver_logs(test, records)
+
+
+def _run_for_test(test: Test, function: Callable, *args: Any, **kwargs: Any) -> Any:
+    token = current_test.set(test)
+    try:
+        return function(*args, **kwargs)
+    finally:
+        current_test.reset(token)
+
+
+def _start_with_current_test(thread: threading.Thread) -> None:
+    test = current_test.get()
+    # Worker threads of executors outlive the task that started them, tasks are bound to tests one by one instead
+    if test is not None and not getattr(_submitting, "active", False):
+        thread.run = functools.partial(_run_for_test, test, thread.run)  # type: ignore
+    _thread_start(thread)
+
+
+def _submit_with_current_test(
+    executor: ThreadPoolExecutor, function: Callable, /, *args: Any, **kwargs: Any
+) -> Future:
+    test = current_test.get()
+    if test is not None:
+        function = functools.partial(_run_for_test, test, function)
+    _submitting.active = True
+    try:
+        return _executor_submit(executor, function, *args, **kwargs)
+    finally:
+        _submitting.active = False
+
+
+def propagate_current_test() -> None:
+    """
+    Bind threads and thread pool tasks started by a test to the test. Threads do not inherit context variables,
+    unlike asyncio tasks. Undone by `stop_propagating_current_test`.
+    """
+    threading.Thread.start = _start_with_current_test  # type: ignore
+    ThreadPoolExecutor.submit = _submit_with_current_test  # type: ignore
+
+
+def stop_propagating_current_test() -> None:
+    if threading.Thread.start is _start_with_current_test:
+        threading.Thread.start = _thread_start  # type: ignore
+    if ThreadPoolExecutor.submit is _submit_with_current_test:
+        ThreadPoolExecutor.submit = _executor_submit  # type: ignore
@@ -0,0 +1,73 @@
+import os
+import threading
+from typing import TYPE_CHECKING, Any, List, NamedTuple, Set, Tuple
+
+if TYPE_CHECKING:
+    from pytest_zebrunner.api.models import LogRecordModel
+
+
+class UploadedFile(NamedTuple):
+    name: str
+    content: bytes
+
+
+class FakeApi:
+    """
+    Records calls of ZebrunnerAPI methods used by background reporting and uploads. Uploaded files are read
+    right away, because uploaders remove their copies once the upload is finished. Calls wait for `release`
+    and fail if the API is not `available` or the method is `failing`.
+    """
+
+    circuit_breaker = None
+
+    def __init__(self, available: bool = True) -> None:
+        self.available = available
+        self.failing: Set[str] = set()
+        self.calls: List[Tuple[str, tuple]] = []
+        self.called = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self.next_id = 100
+        self._lock = threading.Lock()
+
+    def _call(self, method: str, *args: Any) -> int:
+        # Conftest is loaded before collection makes the package importable from a source checkout
+        from pytest_zebrunner.errors import AgentApiError
+
+        self.release.wait(5)
+        if not self.available or method in self.failing:
+            raise AgentApiError(f"Failed to call {method}")
+        with self._lock:
+            self.calls.append((method, args))
+            self.next_id += 1
+            self.called.set()
+            return self.next_id
+
+    def arguments(self, method: str) -> List[tuple]:
+        with self._lock:
+            return [args for name, args in self.calls if name == method]
+
+    def start_test_run(self, project_key: str, body: Any) -> int:
+        return self._call("start_test_run", project_key, body)
+
+    def start_test(self, test_run_id: int, body: Any) -> int:
+        return self._call("start_test", test_run_id, body)
+
+    def finish_test(self, test_run_id: int, test_id: int, body: Any) -> None:
+        self._call("finish_test", test_run_id, test_id, body)
+
+    def send_logs(self, test_run_id: int, logs: List["LogRecordModel"]) -> None:
+        self._call("send_logs", test_run_id, logs)
+
+    def send_artifact(self, path: str, test_run_id: int, test_id: int = None) -> None:  # type: ignore
+        self._call("send_artifact", read_file(path), test_run_id, test_id)
+
+    def send_screenshot(  # type: ignore
+        self, test_run_id: int, test_id: int, path: str, content_type: str = "image/png", captured_at: int = None
+    ) -> None:
+        self._call("send_screenshot", test_run_id, test_id, read_file(path), content_type, captured_at)
+
+
+def read_file(path: str) -> UploadedFile:
+    with open(path, "rb") as file:
+        return UploadedFile(os.path.basename(path), file.read())
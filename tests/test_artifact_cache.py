@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+
+import pytest
+from conftest import FakeApi
+
+from pytest_zebrunner.artifact_cache import ArtifactCache
+from pytest_zebrunner.pipeline import LazyId
+from pytest_zebrunner.upload_pool import UploadPool
+
+
+def test_digest_is_cached_until_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "file.txt"
+    path.write_text("first")
+    cache = ArtifactCache(tmp_path)
+
+    digest = cache.digest(path)
+    assert cache.digest(path) == digest
+    assert cache.digest(tmp_path / "file.txt") == digest
+
+    path.write_text("second")
+    os.utime(path, ns=(0, 0))
+    assert cache.digest(path) != digest
+
+
+def test_run_level_claims_are_shared_through_index(tmp_path: Path) -> None:
+    worker, other_worker = ArtifactCache(tmp_path), ArtifactCache(tmp_path)
+
+    assert worker.claim(None, "digest", "run")
+    assert not other_worker.claim(None, "digest", "run")
+    assert not worker.claim(None, "digest", "run")
+    assert other_worker.claim(None, "digest", "other-run")
+
+    worker.release(None, "digest", "run")
+    assert other_worker.claim(None, "digest", "run")
+
+    worker.remove_index("run")
+    assert not worker.index_path("run").exists()
+
+
+def test_test_level_claims_are_per_test(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path)
+
+    assert cache.claim("first", "digest", "run")
+    assert not cache.claim("first", "digest", "run")
+    assert cache.claim("second", "digest", "run")
+
+    cache.forget("first")
+    assert cache.claim("first", "digest", "run")
+    assert not cache.index_path("run").exists()
+
+
+def test_pool_skips_repeated_artifacts(tmp_path: Path) -> None:
+    for name, content in [("a.txt", "same"), ("b.txt", "same"), ("c.txt", "other")]:
+        (tmp_path / name).write_text(content)
+    api = FakeApi()
+    pool = UploadPool(api, workers=1, cache=ArtifactCache(tmp_path))  # type: ignore
+    test_run_id = LazyId("run")
+    test_run_id.resolve(1)
+
+    for name in ["a.txt", "b.txt", "c.txt"]:
+        pool.submit(None, "send_artifact", str(tmp_path / name), test_run_id)
+        pool.submit("test", "send_artifact", str(tmp_path / name), test_run_id, 2)
+    pool.close(timeout=5)
+
+    uploaded = [(file.name, test_id) for file, _, test_id in api.arguments("send_artifact")]
+    assert uploaded == [("a.txt", None), ("a.txt", 2), ("c.txt", None), ("c.txt", 2)]
+
+
+def test_index_is_read_only_when_it_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    worker, other_worker = ArtifactCache(tmp_path), ArtifactCache(tmp_path)
+    applied: list = []
+    apply = ArtifactCache._apply
+
+    def record(claimed: set, entry: dict) -> None:
+        applied.append(entry)
+        apply(claimed, entry)
+
+    monkeypatch.setattr(ArtifactCache, "_apply", staticmethod(record))
+    assert worker.claim(None, "first", "run")
+    assert worker.claim(None, "second", "run")
+    # Only own entries are applied, the index is not read again
+    assert applied == [{"claim": "first"}, {"claim": "second"}]
+
+    applied.clear()
+    assert other_worker.claim(None, "third", "run")
+    assert not worker.claim(None, "third", "run")
+    assert applied == [{"claim": "first"}, {"claim": "second"}, {"claim": "third"}, {"claim": "third"}]
+    assert worker.claim(None, "fourth", "run")
+    assert not other_worker.claim(None, "fourth", "run")
@@ -0,0 +1,116 @@
+import asyncio
+from typing import List
+
+import httpx
+
+from pytest_zebrunner.api.circuit_breaker import CircuitBreaker, CircuitState
+from pytest_zebrunner.api.client import AsyncZebrunnerAPI
+from pytest_zebrunner.api.models import FinishTestModel
+from pytest_zebrunner.errors import AgentApiError
+from pytest_zebrunner.reporting_service import api_settings
+from pytest_zebrunner.settings import (
+    PipelineSettings,
+    RetrySettings,
+    ServerSettings,
+    Settings,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_opens_after_consecutive_failures() -> None:
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10, clock=FakeClock())
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success(0.1)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.rejected_requests == 1
+
+
+def test_latency_slo_violations_count_as_failures() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, latency_slo=1.0, clock=FakeClock())
+
+    breaker.record_success(5.0)
+    breaker.record_success(5.0)
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_probe_closes_circuit() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 5
+    assert not breaker.accepts_requests
+    assert breaker.time_until_probe() == 5
+
+    clock.now = 10
+    assert breaker.accepts_requests
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.transitions == {"closed -> open": 1, "open -> half-open": 1, "half-open -> closed": 1}
+
+
+def test_failed_probe_opens_circuit_again() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.time_until_probe() == 10
+
+
+def test_breaker_is_enabled_with_background_reporting_only() -> None:
+    server = ServerSettings(hostname="https://zebrunner.local", access_token="token")
+
+    assert not api_settings(Settings(server=server)).circuit_breaker.enabled
+    assert api_settings(Settings(server=server, pipeline=PipelineSettings(enabled=True))).circuit_breaker.enabled
+
+
+def test_no_results_lost_in_default_mode() -> None:
+    server = ServerSettings(
+        hostname="https://zebrunner.local", access_token="token", retry=RetrySettings(attempts=1, budget=0)
+    )
+    received: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        # Zebrunner is down long enough for the breaker to open, then recovers
+        return httpx.Response(500 if len(received) <= 10 else 200)
+
+    async def scenario() -> int:
+        api = AsyncZebrunnerAPI(server.hostname, server.access_token, api_settings(Settings(server=server)))
+        api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        failed = 0
+        for test_id in range(20):
+            try:
+                await api.finish_test(1, test_id, FinishTestModel(result="PASSED"))
+            except AgentApiError:
+                failed += 1
+        await api.close()
+        return failed
+
+    assert asyncio.run(scenario()) == 10
+    assert len(received) == 20
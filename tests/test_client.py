@@ -0,0 +1,298 @@
+import asyncio
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, List
+
+import httpx
+import pytest
+
+from pytest_zebrunner.api.client import AsyncZebrunnerAPI
+from pytest_zebrunner.api.models import FinishTestModel, LogRecordModel, StartTestModel
+from pytest_zebrunner.errors import AgentApiError
+from pytest_zebrunner.settings import (
+    CompressionSettings,
+    ContentEncoding,
+    RetrySettings,
+    ServerSettings,
+)
+
+
+def create_api(handler: Callable[[httpx.Request], httpx.Response]) -> AsyncZebrunnerAPI:
+    api = AsyncZebrunnerAPI("https://zebrunner.local/", "access_token")
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return api
+
+
+def test_auth_signs_next_requests() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/api/iam/v1/auth/refresh":
+            return httpx.Response(200, json={"authToken": "auth_token"})
+        return httpx.Response(200, json={"id": 1})
+
+    async def scenario() -> None:
+        api = create_api(handler)
+        await api.auth()
+        await api.start_test(1, StartTestModel(name="test", class_name="file.py", method_name="test"))
+        await api.close()
+
+    asyncio.run(scenario())
+
+    assert json.loads(requests[0].content) == {"refreshToken": "access_token"}
+    assert requests[1].url == "https://zebrunner.local/api/reporting/v1/test-runs/1/tests"
+    assert requests[1].headers["Authorization"] == "Bearer auth_token"
+
+
+def test_concurrent_requests() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"id": int(request.url.path.split("/")[-2])})
+
+    async def scenario() -> List:
+        api = create_api(handler)
+        calls = [
+            api.start_test(run_id, StartTestModel(name="test", class_name="file.py", method_name="test"))
+            for run_id in range(10)
+        ]
+        result = await asyncio.gather(*calls)
+        await api.close()
+        return result
+
+    assert asyncio.run(scenario()) == list(range(10))
+
+
+@pytest.mark.parametrize(
+    "response",
+    [httpx.Response(500, json={"message": "error"}), httpx.Response(502, text="<html>Bad gateway</html>")],
+)
+def test_unsuccessful_response(response: httpx.Response) -> None:
+    async def scenario() -> None:
+        api = create_api(lambda request: response)
+        try:
+            await api.finish_test(1, 1, FinishTestModel(result="PASSED"))
+        finally:
+            await api.close()
+
+    with pytest.raises(AgentApiError):
+        asyncio.run(scenario())
+
+
+def test_network_error() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    async def scenario() -> None:
+        api = create_api(handler)
+        try:
+            await api.finish_test_run(1)
+        finally:
+            await api.close()
+
+    with pytest.raises(AgentApiError):
+        asyncio.run(scenario())
+
+
+def test_client_configured_from_settings() -> None:
+    settings = ServerSettings(
+        hostname="https://zebrunner.local", access_token="token", connect_timeout=1.0, read_timeout=30.0
+    )
+    api = AsyncZebrunnerAPI(settings.hostname, settings.access_token, settings)
+
+    assert api._client.timeout == httpx.Timeout(connect=1.0, read=30.0, write=60.0, pool=60.0)
+    asyncio.run(api.close())
+
+
+def create_retrying_api(handler: Callable[[httpx.Request], httpx.Response], **retry: Any) -> AsyncZebrunnerAPI:
+    settings = ServerSettings(
+        hostname="https://zebrunner.local", access_token="token", retry=RetrySettings(base_delay=0, **retry)
+    )
+    api = AsyncZebrunnerAPI(settings.hostname, settings.access_token, settings)
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return api
+
+
+def test_idempotent_request_is_retried() -> None:
+    responses = [httpx.Response(503, headers={"Retry-After": "0"}), httpx.Response(500), httpx.Response(200)]
+
+    async def scenario() -> None:
+        api = create_retrying_api(lambda request: responses.pop(0))
+        await api.finish_test(1, 1, FinishTestModel(result="PASSED"))
+        await api.close()
+
+    asyncio.run(scenario())
+    assert not responses
+
+
+def test_not_idempotent_request_is_not_retried_after_server_error() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(500)
+
+    async def scenario() -> None:
+        api = create_retrying_api(handler)
+        try:
+            await api.send_logs(1, [])
+        finally:
+            await api.close()
+
+    with pytest.raises(AgentApiError):
+        asyncio.run(scenario())
+    assert len(requests) == 1
+
+
+def test_not_idempotent_request_is_retried_if_not_sent() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            raise httpx.ConnectError("Connection refused", request=request)
+        return httpx.Response(429, headers={"Retry-After": "0"}) if len(requests) == 2 else httpx.Response(200)
+
+    async def scenario() -> None:
+        api = create_retrying_api(handler)
+        await api.send_logs(1, [])
+        await api.close()
+
+    asyncio.run(scenario())
+    assert len(requests) == 3
+
+
+def test_retry_budget() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(503, headers={"Retry-After": "1"})
+
+    async def scenario() -> None:
+        api = create_retrying_api(handler, budget=0.5)
+        try:
+            await api.finish_test_run(1)
+        finally:
+            await api.close()
+
+    with pytest.raises(AgentApiError):
+        asyncio.run(scenario())
+    assert len(requests) == 1
+
+
+def test_artifact_upload_is_streamed(tmp_path: Path) -> None:
+    artifact = tmp_path / "video.mp4"
+    artifact.write_bytes(os.urandom(200 * 1024))
+    bodies: List[bytes] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(await request.aread())
+        assert int(request.headers["Content-Length"]) == len(bodies[-1])
+        assert "Transfer-Encoding" not in request.headers
+        # Only the first attempt fails with rejection, so the stream has to be sent twice
+        return httpx.Response(429, headers={"Retry-After": "0"}) if len(bodies) == 1 else httpx.Response(200)
+
+    async def scenario() -> None:
+        api = create_retrying_api(handler)  # type: ignore
+        await api.send_artifact(artifact, 1, 2)
+        await api.close()
+
+    asyncio.run(scenario())
+
+    assert len(bodies) == 2 and bodies[0] == bodies[1]
+    assert b'name="file"; filename="video.mp4"\r\nContent-Type: video/mp4\r\n\r\n' in bodies[1]
+    assert artifact.read_bytes() in bodies[1]
+
+
+def test_screenshot_upload(tmp_path: Path) -> None:
+    screenshot = tmp_path / "screenshot.png"
+    screenshot.write_bytes(os.urandom(1024))
+    requests: List[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        requests.append(request)
+        return httpx.Response(200)
+
+    async def scenario() -> None:
+        api = create_retrying_api(handler)  # type: ignore
+        await api.send_screenshot(1, 2, screenshot)
+        await api.close()
+
+    asyncio.run(scenario())
+
+    assert requests[0].content == screenshot.read_bytes()
+    assert requests[0].headers["Content-Type"] == "image/png"
+    assert requests[0].headers["Content-Length"] == "1024"
+
+
+def test_large_log_batch_is_split() -> None:
+    bodies: List[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(200)
+
+    logs = [LogRecordModel(test_id="1", timestamp="1", level="INFO", message="x" * 100) for _ in range(100)]
+
+    async def scenario() -> None:
+        api = create_api(handler)
+        api.max_request_size = 2000
+        await api.send_logs(1, logs)
+        await api.close()
+
+    asyncio.run(scenario())
+
+    assert len(bodies) > 1
+    assert all(len(body) <= 2000 for body in bodies)
+    assert sum(len(json.loads(body)) for body in bodies) == 100
+
+
+def test_json_body_is_compressed() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(429, headers={"Retry-After": "0"}) if len(requests) == 2 else httpx.Response(200)
+
+    settings = ServerSettings(
+        hostname="https://zebrunner.local",
+        access_token="token",
+        compression=CompressionSettings(encoding=ContentEncoding.GZIP, threshold=100),
+        retry=RetrySettings(base_delay=0),
+    )
+    logs = [LogRecordModel(test_id="1", timestamp="1", level="INFO", message=f"line {i}") for i in range(100)]
+
+    async def scenario() -> None:
+        api = AsyncZebrunnerAPI(settings.hostname, settings.access_token, settings)
+        api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await api.send_logs(1, logs[:1])
+        await api.send_logs(1, logs)
+        await api.close()
+
+    asyncio.run(scenario())
+
+    assert "Content-Encoding" not in requests[0].headers
+    assert requests[1].headers["Content-Encoding"] == "gzip"
+    assert requests[1].content == requests[2].content
+    assert len(json.loads(gzip.decompress(requests[2].content))) == 100
+
+
+def test_auth_token_expiration() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"authToken": "auth_token", "authTokenExpirationInSecs": 3600})
+
+    async def scenario() -> None:
+        api = create_api(handler)
+        await api.auth()
+        assert api.auth_expires_at is not None and api.auth_expires_at > time.time() + 3500
+        assert not api.auth_expires_soon
+
+        api.use_auth_token("other_token", time.time() + 30)
+        assert api.auth_expires_soon
+        await api.close()
+
+    asyncio.run(scenario())
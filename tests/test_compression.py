@@ -0,0 +1,41 @@
+import gzip
+import json
+
+import pytest
+
+from pytest_zebrunner.api import compression
+from pytest_zebrunner.api.compression import Compressor
+from pytest_zebrunner.settings import ContentEncoding
+
+CONTENT = json.dumps([{"message": f"line {i}", "level": "INFO"} for i in range(100)]).encode()
+
+
+def test_gzip() -> None:
+    content, headers = Compressor(ContentEncoding.GZIP, threshold=100).compress(CONTENT)
+
+    assert headers == {"Content-Encoding": "gzip"}
+    assert len(content) < len(CONTENT)
+    assert gzip.decompress(content) == CONTENT
+
+
+def test_small_content_is_not_compressed() -> None:
+    compressor = Compressor(ContentEncoding.GZIP, threshold=len(CONTENT) + 1)
+    assert compressor.compress(CONTENT) == (CONTENT, {})
+
+
+def test_incompressible_content_is_sent_as_is() -> None:
+    content = bytes(range(256))
+    assert Compressor(ContentEncoding.GZIP, threshold=0).compress(content) == (content, {})
+
+
+def test_zstd() -> None:
+    zstandard = pytest.importorskip("zstandard")
+    content, headers = Compressor(ContentEncoding.ZSTD, threshold=100).compress(CONTENT)
+
+    assert headers == {"Content-Encoding": "zstd"}
+    assert zstandard.ZstdDecompressor().decompress(content) == CONTENT
+
+
+def test_zstd_falls_back_to_gzip(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(compression, "zstandard", None)
+    assert Compressor(ContentEncoding.ZSTD).encoding == ContentEncoding.GZIP
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from conftest import FakeApi
+
+from pytest_zebrunner.api.models import FinishTestModel, LogRecordModel, StartTestModel
+from pytest_zebrunner.journal import Journal, decode_value, encode_value, read_journal
+from pytest_zebrunner.pipeline import LazyId, ReportingPipeline
+from pytest_zebrunner.replay import replay
+
+
+def report_test(pipeline: ReportingPipeline) -> None:
+    test_run_id = pipeline.call("start_test_run", "DEF", "run")
+    test_id = pipeline.submit("start_test", test_run_id, StartTestModel(name="a", class_name="b", method_name="a"))
+    log = LogRecordModel(test_id=test_id, level="INFO", timestamp="1", message="message")
+    pipeline.submit("send_logs", test_run_id, [log])
+    pipeline.submit("finish_test", test_run_id, test_id, FinishTestModel(result="PASSED"))
+    pipeline.close(timeout=5)
+
+
+def test_values_encoding() -> None:
+    test_id = LazyId("test")
+    log = LogRecordModel(test_id=test_id, level="INFO", timestamp="1", message="message")
+    encoded = encode_value([test_id, Path("file.txt"), [log]])
+
+    assert encoded[0] == {"$ref": "test"}
+    assert decode_value(encoded, {"test": 5}) == [
+        5,
+        Path("file.txt").resolve(),
+        [LogRecordModel(test_id=5, level="INFO", timestamp="1", message="message")],
+    ]
+
+
+def test_delivered_events_are_acknowledged(tmp_path: Path) -> None:
+    path = tmp_path / "journal.jsonl"
+    api = FakeApi()
+    report_test(ReportingPipeline(api, journal=Journal(path)))  # type: ignore
+
+    entries = list(read_journal(path))
+    events = [entry for entry in entries if "method" in entry]
+    acks = [entry for entry in entries if "ack" in entry]
+    assert [event["method"] for event in events] == ["start_test_run", "start_test", "send_logs", "finish_test"]
+    assert {ack["ack"] for ack in acks} == {event["key"] for event in events}
+
+    assert replay(str(path), api) == (0, 0, 0)  # type: ignore
+
+
+def test_replay_of_offline_session(tmp_path: Path) -> None:
+    path = tmp_path / "journal.jsonl"
+    report_test(ReportingPipeline(FakeApi(available=False), journal=Journal(path)))  # type: ignore
+
+    api = FakeApi()
+    assert replay(str(path), api) == (4, 0, 0)  # type: ignore
+    assert [call[0] for call in api.calls] == ["start_test_run", "start_test", "send_logs", "finish_test"]
+    test_run_id, test_id = 101, 102
+    assert api.calls[1][1][0] == test_run_id
+    assert api.calls[2][1] == (
+        test_run_id,
+        [LogRecordModel(test_id=test_id, level="INFO", timestamp="1", message="message")],
+    )
+    assert api.calls[3][1][:2] == (test_run_id, test_id)
+    assert api.calls[3][1][2].result == "PASSED"
+
+    # Replayed events are acknowledged, so the next replay has nothing to send
+    assert replay(str(path), FakeApi()) == (0, 0, 0)  # type: ignore
+
+
+def test_incomplete_line_is_skipped(tmp_path: Path) -> None:
+    path = tmp_path / "journal.jsonl"
+    report_test(ReportingPipeline(FakeApi(available=False), journal=Journal(path)))  # type: ignore
+    with open(path, "a") as journal:
+        journal.write('{"key": "broken", "meth')
+
+    assert replay(str(path), FakeApi()).sent == 4  # type: ignore
@@ -0,0 +1,71 @@
+from typing import List
+
+from pytest_zebrunner.api.models import LogRecordModel
+from pytest_zebrunner.log_limiter import LogLimiter
+
+
+def log(message: str, timestamp: str = "1") -> LogRecordModel:
+    return LogRecordModel(test_id=1, timestamp=timestamp, level="INFO", message=message)
+
+
+def messages(records: List[LogRecordModel]) -> List[str]:
+    return [record.message for record in records]  # type: ignore
+
+
+def test_consecutive_repeats_are_aggregated() -> None:
+    limiter = LogLimiter()
+    sent = []
+    for index, message in enumerate(["poll", "poll", "poll", "done", "poll", "poll"]):
+        sent += limiter.process("test", "app", log(message, str(index)))
+
+    assert messages(sent) == ["poll", "poll ×2 more", "done", "poll"]
+    assert sent[1].timestamp == "2"  # type: ignore
+    assert messages(limiter.finish("test")) == ["poll ×1 more"]
+    assert limiter.finish("test") == []
+
+
+def test_repeats_are_aggregated_per_logger() -> None:
+    limiter = LogLimiter()
+    sent = []
+    for logger in ["first", "second", "first", "second"]:
+        sent += limiter.process("test", logger, log("message"))
+
+    assert messages(sent) == ["message", "message"]
+    assert messages(limiter.finish("test")) == ["message ×1 more", "message ×1 more"]
+
+
+def test_records_over_rate_limit_are_suppressed() -> None:
+    limiter = LogLimiter(logger_rate=0.001, logger_burst=2, aggregate_repeats=False)
+    sent = []
+    for index in range(5):
+        sent += limiter.process("test", "app", log(str(index)))
+    sent += limiter.process("test", "other", log("other"))
+
+    assert messages(sent) == ["0", "1", "other"]
+    summary = limiter.finish("test")
+    assert messages(summary) == ["3 log records of logger app were suppressed by rate limit"]
+    assert summary[0].level == "WARNING"  # type: ignore
+
+
+def test_test_rate_limit_is_shared_by_loggers() -> None:
+    limiter = LogLimiter(test_rate=0.001, test_burst=2)
+    sent = []
+    for logger in ["first", "second", "third"]:
+        sent += limiter.process("test", logger, log(logger))
+    sent += limiter.process("other test", "first", log("other test"))
+
+    assert messages(sent) == ["first", "second", "other test"]
+    assert messages(limiter.close()["test"]) == ["1 log records of logger third were suppressed by rate limit"]
+
+
+def test_suppressed_records_are_reported_once_limit_allows_again() -> None:
+    limiter = LogLimiter(logger_rate=0.001, logger_burst=1, aggregate_repeats=False)
+    limiter.process("test", "app", log("first"))
+    assert limiter.process("test", "app", log("second")) == []
+
+    limiter._streams[("test", "app")].bucket.tokens = 1
+
+    assert messages(limiter.process("test", "app", log("third"))) == [
+        "1 log records of logger app were suppressed by rate limit",
+        "third",
+    ]
@@ -0,0 +1,74 @@
+from typing import List
+
+import pytest
+from conftest import FakeApi
+
+from pytest_zebrunner.api.models import LogRecordModel
+from pytest_zebrunner.context import TestRun as ZebrunnerTestRun
+from pytest_zebrunner.context import zebrunner_context
+from pytest_zebrunner.log_shipper import LogShipper
+
+
+def batches(api: FakeApi) -> List[List[str]]:
+    return [[log.message for log in logs] for _, logs in api.arguments("send_logs")]
+
+
+def log(message: str) -> LogRecordModel:
+    return LogRecordModel(test_id=1, timestamp="1", level="INFO", message=message)
+
+
+@pytest.fixture(autouse=True)
+def test_run(monkeypatch: pytest.MonkeyPatch) -> None:
+    test_run = ZebrunnerTestRun("run")
+    test_run.zebrunner_id = 1
+    monkeypatch.setattr(zebrunner_context, "test_run", test_run)
+    monkeypatch.setattr(zebrunner_context, "pipeline", None)
+
+
+def test_batch_is_sent_when_record_count_is_reached() -> None:
+    api = FakeApi()
+    shipper = LogShipper(api, max_records=3, max_age=60)  # type: ignore
+
+    for message in "abc":
+        shipper.add(log(message))
+
+    assert api.called.wait(5)
+    assert batches(api) == [["a", "b", "c"]]
+    shipper.close(timeout=5)
+
+
+def test_batch_is_sent_when_it_is_old_enough() -> None:
+    api = FakeApi()
+    shipper = LogShipper(api, max_age=0.05)  # type: ignore
+
+    shipper.add(log("a"))
+
+    assert api.called.wait(5)
+    assert batches(api) == [["a"]]
+    shipper.close(timeout=5)
+
+
+def test_flush_splits_buffer_by_size() -> None:
+    api = FakeApi()
+    shipper = LogShipper(api, max_records=2, max_bytes=200, max_age=60)  # type: ignore
+    # Sender thread is stopped, so all records are sent by flush
+    shipper.close(timeout=5)
+
+    for message in ["a" * 150, "b", "c", "d", "e"]:
+        shipper.add(log(message))
+    shipper.flush()
+
+    assert batches(api) == [["a" * 150], ["b", "c"], ["d", "e"]]
+
+
+def test_records_over_capacity_and_failed_batches_are_dropped() -> None:
+    api = FakeApi()
+    api.available = False
+    shipper = LogShipper(api, max_age=60, capacity=2)  # type: ignore
+
+    for message in "abc":
+        shipper.add(log(message))
+    shipper.close(timeout=5)
+
+    assert shipper.dropped == 3
+    assert batches(api) == []
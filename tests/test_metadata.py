@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+from typing import Any
+
+from pytest_zebrunner.metadata import TestMetadata as ZebrunnerTestMetadata
+from pytest_zebrunner.metadata import build_metadata, item_metadata
+
+
+def mark(name: str, *args: Any) -> SimpleNamespace:
+    return SimpleNamespace(name=name, args=args)
+
+
+def create_item(nodeid: str, *marks: SimpleNamespace) -> Any:
+    return SimpleNamespace(nodeid=nodeid, stash={}, iter_markers=lambda: iter(marks))
+
+
+def test_markers_are_collected() -> None:
+    item = create_item(
+        "tests/test_file.py::TestClass::test_method[1]",
+        mark("maintainer", "owner"),
+        mark("artifact_reference", "docs", "https://example.local"),
+        mark("xray_test_key", "X-1", "X-2"),
+        mark("parametrize", "value", [1]),
+        mark("maintainer", "class_owner"),
+        mark("label", "suite", 1),
+        mark("zebrunner_test_case_key", "ZEB-1"),
+    )
+
+    assert build_metadata(item) == ZebrunnerTestMetadata(
+        name="TestClass.test_method[1]",
+        file="tests/test_file.py",
+        maintainers=("owner", "class_owner"),
+        labels=(("suite", "1"),),
+        artifact_references=(("docs", "https://example.local"),),
+        xray_case_ids=("X-1", "X-2"),
+        zebrunner_case_keys=("ZEB-1",),
+    )
+
+
+def test_metadata_is_built_once() -> None:
+    item = create_item("tests/test_file.py::test_function", mark("maintainer", "owner"))
+    metadata = item_metadata(item)
+
+    item.iter_markers = lambda: iter([mark("maintainer", "other")])
+    assert item_metadata(item) is metadata
+    assert metadata.maintainers == ("owner",)
@@ -0,0 +1,80 @@
+import logging
+
+import pytest
+
+from pytest_zebrunner.payload_limits import PayloadLimits, truncate
+
+TRACEBACK = "\n".join(f"    frame {i}: call()" for i in range(1000))
+
+
+def test_truncate_keeps_head_and_tail() -> None:
+    text = truncate(TRACEBACK, 500)
+
+    assert len(text) <= 500
+    assert text.startswith("    frame 0: call()\n")
+    assert text.endswith("    frame 999: call()")
+    assert f"... {len(TRACEBACK)} characters truncated ..." in text
+
+
+def test_short_text_is_not_truncated() -> None:
+    assert truncate("short", 10) == "short"
+    assert truncate(TRACEBACK, 0) is TRACEBACK
+
+
+@pytest.mark.parametrize("max_length", [1, 10, 30])
+def test_truncate_fits_tiny_limits(max_length: int) -> None:
+    assert len(truncate(TRACEBACK, max_length)) == max_length
+
+
+def test_truncated_reason_keeps_crash_line() -> None:
+    limits = PayloadLimits(max_reason_length=1000)
+    crash = "AssertionError: assert 1 == 2"
+    reason = limits.reason(f"{crash}\n\n{TRACEBACK}", "test_one", crash)
+
+    assert reason is not None and len(reason) <= 1000
+    assert reason.startswith(crash + "\n\n    frame 0: call()")
+    assert reason.endswith("    frame 999: call()")
+
+
+def test_repeated_reason_is_deduplicated(caplog: pytest.LogCaptureFixture) -> None:
+    limits = PayloadLimits(deduplicate_reasons=True)
+    crash = "AssertionError: assert 1 == 2"
+    reason = f"{crash}\n\n{TRACEBACK}"
+
+    assert limits.reason(reason, "test_one", crash) == reason
+    assert limits.reason(reason, "test_one", crash) == reason
+    repeated = limits.reason(reason, "test_two", crash)
+    assert repeated is not None and repeated.startswith(f"{crash}\n\nSame failure as in test test_one (reason ")
+    # Skip reasons have no crash line
+    assert limits.reason("Skipped: not supported", "test_three") == "Skipped: not supported"
+
+    with caplog.at_level(logging.INFO):
+        limits.report()
+    saved = len(reason) - len(repeated)
+    assert f"Payload limits saved {saved} bytes (deduplicated reasons: {saved})" in caplog.text
+
+
+def test_truncated_names_stay_unique() -> None:
+    limits = PayloadLimits(max_name_length=50)
+    first = limits.name("test_data[" + "a" * 100 + "]")
+    second = limits.name("test_data[" + "a" * 99 + "b]")
+
+    assert len(first) == len(second) == 50
+    assert first.startswith("test_data[aaa") and first != second
+    assert limits.name("test_short[1]") == "test_short[1]"
+
+
+def test_log_message_is_truncated() -> None:
+    limits = PayloadLimits(max_log_message_length=100)
+
+    assert len(limits.log_message("x" * 1000)) <= 100
+    assert limits.saved["truncated log messages"] > 0
+
+
+def test_saved_bytes_are_counted() -> None:
+    limits = PayloadLimits(max_log_message_length=100)
+    message = "сообщение " * 100
+
+    limited = limits.log_message(message)
+
+    assert limits.saved["truncated log messages"] == len(message.encode()) - len(limited.encode())
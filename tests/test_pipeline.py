@@ -0,0 +1,120 @@
+import threading
+from typing import Any
+
+from conftest import FakeApi
+
+from pytest_zebrunner.api.circuit_breaker import CircuitBreaker, CircuitState
+from pytest_zebrunner.api.models import LogRecordModel
+from pytest_zebrunner.errors import AgentApiError, CircuitOpenError
+from pytest_zebrunner.pipeline import LazyId, ReportingPipeline
+
+
+def test_lazy_id_resolution() -> None:
+    api = FakeApi()
+    api.release.clear()
+    pipeline = ReportingPipeline(api, queue_size=10)  # type: ignore
+
+    test_id = pipeline.submit("start_test", 1, "body")
+    pipeline.submit("finish_test", 1, test_id, "result")
+    assert not test_id.is_resolved
+
+    api.release.set()
+    assert pipeline.flush(timeout=5)
+    pipeline.close(timeout=5)
+
+    assert test_id.get() == 101
+    assert api.calls == [("start_test", (1, "body")), ("finish_test", (1, 101, "result"))]
+
+
+def test_lazy_id_inside_models() -> None:
+    api = FakeApi()
+    pipeline = ReportingPipeline(api, queue_size=10)  # type: ignore
+
+    test_id = pipeline.submit("start_test", 1, "body")
+    log = LogRecordModel(test_id=test_id, level="INFO", timestamp="1", message="message")
+    pipeline.submit("send_logs", 1, [log])
+    pipeline.close(timeout=5)
+
+    _, (_, logs) = api.calls[-1]
+    assert logs == [LogRecordModel(test_id=101, level="INFO", timestamp="1", message="message")]
+    assert logs[0].to_dict() == {"testId": "101", "level": "INFO", "timestamp": "1", "message": "message"}
+
+
+def test_events_of_unregistered_test_are_skipped() -> None:
+    api = FakeApi()
+    api.failing.add("start_test")
+    pipeline = ReportingPipeline(api, queue_size=10)  # type: ignore
+
+    test_id = pipeline.submit("start_test", 1, "body")
+    pipeline.submit("finish_test", 1, test_id, "result")
+    log = LogRecordModel(test_id=test_id, level="INFO", timestamp="1", message="message")
+    pipeline.submit("send_logs", 1, [log])
+    pipeline.close(timeout=5)
+
+    assert test_id.get() is None
+    assert api.calls == [("send_logs", (1, []))]
+
+
+def test_flush_timeout() -> None:
+    api = FakeApi()
+    api.release.clear()
+    pipeline = ReportingPipeline(api, queue_size=10)  # type: ignore
+
+    pipeline.submit("start_test", 1, "body")
+    assert not pipeline.flush(timeout=0.05)
+
+    api.release.set()
+    assert pipeline.flush(timeout=5)
+    pipeline.close(timeout=5)
+
+
+def test_lazy_id_conversion() -> None:
+    test_id = LazyId()
+    test_id.resolve(7)
+
+    assert int(test_id) == 7
+    assert f"/tests/{test_id}" == "/tests/7"
+
+
+class UnavailableApi(FakeApi):
+    def __init__(self) -> None:
+        super().__init__()
+        self.circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.2)  # type: ignore
+        self.recovered = threading.Event()
+
+    def finish_test(self, test_run_id: int, test_id: int, body: Any) -> None:
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError("Failed to finish test")
+        if not self.recovered.is_set():
+            self.circuit_breaker.record_failure()
+            raise AgentApiError("Failed to finish test")
+        self.circuit_breaker.record_success(0.0)
+        super().finish_test(test_run_id, test_id, body)
+
+
+def test_events_are_buffered_while_zebrunner_is_unavailable() -> None:
+    api = UnavailableApi()
+    pipeline = ReportingPipeline(api, queue_size=10)  # type: ignore
+
+    for test_id in range(3):
+        pipeline.submit("finish_test", 1, test_id, "result")
+    assert not pipeline.flush(timeout=0.1)
+    assert api.circuit_breaker.state == CircuitState.OPEN
+
+    api.recovered.set()
+    assert pipeline.flush(timeout=5)
+    pipeline.close(timeout=5)
+
+    assert [call[1][1] for call in api.calls] == [0, 1, 2]
+
+
+def test_events_over_offline_buffer_size_are_dropped() -> None:
+    api = UnavailableApi()
+    pipeline = ReportingPipeline(api, queue_size=10, offline_buffer_size=2)  # type: ignore
+
+    results = [pipeline.submit("finish_test", 1, test_id, "result") for test_id in range(4)]
+    assert results[3].get(timeout=5) is None
+    pipeline.close(timeout=0.1)
+
+    assert pipeline.dropped_events == 4
+    assert api.calls == []
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from pytest_zebrunner.api.models import RerunDataModel
+from pytest_zebrunner.rerun_cache import cache_path, read_rerun_data, write_rerun_data
+
+RUN_CONTEXT = '{"id": "1", "mode": "RERUN"}'
+
+
+def create_rerun_data() -> RerunDataModel:
+    return RerunDataModel(
+        test_run_uuid="uuid",
+        run_allowed=True,
+        reason=None,
+        run_only_specific_tests=True,
+        tests_to_run=[
+            {
+                "id": 1,
+                "name": "test_login[admin]",
+                "correlationData": {"name": "test_login[admin]", "nodeId": "tests/test_a.py::test_login[admin]"},
+                "status": "FAILED",
+                "startedAt": "2024-01-01T00:00:00+00:00",
+                "endedAt": "2024-01-01T00:00:01+00:00",
+            }
+        ],
+    )
+
+
+def test_rerun_data_is_cached(tmp_path: Path) -> None:
+    data = create_rerun_data()
+    write_rerun_data(tmp_path, RUN_CONTEXT, data)
+
+    assert read_rerun_data(tmp_path, RUN_CONTEXT) == data
+    assert read_rerun_data(tmp_path, '{"id": "2"}') is None
+    assert [path.name for path in tmp_path.iterdir()] == [cache_path(tmp_path, RUN_CONTEXT).name]
+
+
+def test_invalid_cache_is_ignored(tmp_path: Path) -> None:
+    cache_path(tmp_path, RUN_CONTEXT).write_text("{")
+    assert read_rerun_data(tmp_path, RUN_CONTEXT) is None
+
+
+def test_rerun_data_is_shared_with_workers_as_json() -> None:
+    data = create_rerun_data()
+    assert RerunDataModel.parse_raw(data.json(by_alias=True)) == data
@@ -0,0 +1,65 @@
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import pytest
+
+from pytest_zebrunner.api.models import CorrelationDataModel
+from pytest_zebrunner.api.models import TestModel as ZebrunnerTestModel
+from pytest_zebrunner.context import zebrunner_context
+from pytest_zebrunner.payload_limits import PayloadLimits
+from pytest_zebrunner.reporting_service import select_rerun_items
+
+
+def create_item(nodeid: str) -> Any:
+    return SimpleNamespace(nodeid=nodeid, user_properties=[], stash={}, iter_markers=lambda: iter([]))
+
+
+def create_test(test_id: int, correlation_data: Optional[dict]) -> ZebrunnerTestModel:
+    return ZebrunnerTestModel(
+        id=test_id,
+        name="test",
+        correlation_data=CorrelationDataModel(**correlation_data) if correlation_data is not None else None,
+        status="FAILED",
+        started_at=datetime.now(),
+        ended_at=datetime.now(),
+    )
+
+
+def test_tests_are_matched_by_nodeid() -> None:
+    items = [
+        create_item("tests/test_a.py::test_login[admin]"),
+        create_item("tests/test_a.py::test_login[guest]"),
+        create_item("tests/test_b.py::test_login[admin]"),
+    ]
+    tests = [
+        create_test(1, {"name": "test_login[admin]", "nodeId": "tests/test_a.py::test_login[admin]"}),
+        create_test(2, {"name": "test_login[admin]", "nodeId": "tests/test_b.py::test_login[admin]"}),
+        create_test(3, None),
+    ]
+
+    selected = select_rerun_items(items, tests)
+
+    assert selected == [items[0], items[2]]
+    assert items[0].user_properties == [("zebrunner_id", 1)]
+    assert items[1].user_properties == []
+    assert items[2].user_properties == [("zebrunner_id", 2)]
+
+
+def test_tests_of_older_agents_are_matched_by_name() -> None:
+    items = [create_item("tests/test_a.py::TestClass::test_login"), create_item("tests/test_a.py::test_logout")]
+
+    selected = select_rerun_items(items, [create_test(1, {"name": "TestClass.test_login"})])
+
+    assert selected == [items[0]]
+
+
+def test_capped_nodeid_is_matched(monkeypatch: pytest.MonkeyPatch) -> None:
+    payload_limits = PayloadLimits(max_name_length=40)
+    monkeypatch.setattr(zebrunner_context, "payload_limits", payload_limits)
+    items = [create_item("tests/test_a.py::test_data[" + "a" * 100 + "]")]
+    node_id = payload_limits.name(items[0].nodeid)
+
+    selected = select_rerun_items(items, [create_test(1, {"name": "test_data", "nodeId": node_id})])
+
+    assert selected == items
@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+
+from pytest_zebrunner.api.models import LogRecordModel
+from pytest_zebrunner.api.models import TestStatus as Status
+from pytest_zebrunner.context import Test as ZebrunnerTest
+from pytest_zebrunner.retention import RetentionBuffer
+from pytest_zebrunner.settings import RetentionPolicy
+
+
+def new_test() -> ZebrunnerTest:
+    test = ZebrunnerTest("test", "file", [], [])
+    test.zebrunner_id = 1
+    return test
+
+
+def log(message: str) -> LogRecordModel:
+    return LogRecordModel(test_id=1, timestamp="1", level="INFO", message=message)
+
+
+@pytest.mark.parametrize(
+    "policy, status, is_flaky, keeps",
+    [
+        (RetentionPolicy.ALWAYS, Status.PASSED, False, True),
+        (RetentionPolicy.ON_FAILURE, Status.FAILED, False, True),
+        (RetentionPolicy.ON_FAILURE, Status.PASSED, True, False),
+        (RetentionPolicy.ON_FAILURE, Status.SKIPPED, False, False),
+        (RetentionPolicy.ON_FAILURE_OR_FLAKY, Status.PASSED, True, True),
+        (RetentionPolicy.ON_FAILURE_OR_FLAKY, Status.PASSED, False, False),
+    ],
+)
+def test_policy(policy: RetentionPolicy, status: Status, is_flaky: bool, keeps: bool) -> None:
+    assert RetentionBuffer(policy).keeps(status, is_flaky) is keeps
+
+
+def test_logs_are_spilled_to_disk_and_restored() -> None:
+    buffer = RetentionBuffer(RetentionPolicy.ON_FAILURE, memory_limit=10)
+    test = new_test()
+    buffer.hold(test)
+
+    for message in ["first", "second", "third"]:
+        assert buffer.add_log(test, log(message))
+    logs, uploads = buffer.release(test, keep=True)
+    buffer.cleanup()
+
+    assert [record.message for record in logs] == ["first", "second", "third"]  # type: ignore
+    assert uploads == []
+    assert not buffer.add_log(test, log("after finish"))
+
+
+def test_files_are_copied_until_test_is_finished(tmp_path: Path) -> None:
+    buffer = RetentionBuffer(RetentionPolicy.ON_FAILURE)
+    test = new_test()
+    screenshot = tmp_path / "screenshot.png"
+    buffer.hold(test)
+
+    screenshot.write_bytes(b"first")
+    assert buffer.add_upload(test, "send_screenshot", (1, 1, str(screenshot)))
+    screenshot.write_bytes(b"second")
+    assert buffer.add_upload(test, "send_artifact", (str(screenshot), 1, 1))
+    assert not buffer.add_upload(new_test(), "send_artifact", (str(screenshot), 1, 1))
+    _, uploads = buffer.release(test, keep=True)
+
+    (_, (_, _, first, content_type, captured_at)), (_, (second, _, _)) = uploads
+    assert Path(first).read_bytes() == b"first"
+    assert (content_type, captured_at > 0) == ("image/png", True)
+    assert Path(second).name == "screenshot.png"
+    assert Path(second).read_bytes() == b"second"
+    buffer.cleanup()
+    assert not Path(first).exists()
+
+
+def test_payloads_of_passed_test_are_discarded(tmp_path: Path) -> None:
+    buffer = RetentionBuffer(RetentionPolicy.ON_FAILURE, memory_limit=0)
+    test = new_test()
+    artifact = tmp_path / "artifact.txt"
+    artifact.write_text("content")
+    buffer.hold(test)
+
+    buffer.add_log(test, log("message"))
+    buffer.add_upload(test, "send_artifact", (str(artifact), 1, 1))
+
+    assert buffer.release(test, keep=False) == ([], [])
+    assert list(buffer._directory.iterdir()) == []  # type: ignore
+    buffer.cleanup()
+
+
+def test_teardown_payloads_follow_release_decision(tmp_path: Path) -> None:
+    buffer = RetentionBuffer(RetentionPolicy.ON_FAILURE)
+    passed, failed = new_test(), new_test()
+    artifact = tmp_path / "artifact.txt"
+    artifact.write_text("content")
+    buffer.hold(passed)
+    buffer.hold(failed)
+    buffer.release(passed, keep=False)
+    buffer.release(failed, keep=True)
+
+    assert buffer.add_log(passed, log("teardown"))
+    assert buffer.add_upload(passed, "send_artifact", (str(artifact), 1, 1))
+    assert not buffer.add_log(failed, log("teardown"))
+    assert not buffer.add_upload(failed, "send_artifact", (str(artifact), 1, 1))
+
+    buffer.hold(new_test())
+    assert not buffer.add_log(passed, log("late"))
+    buffer.cleanup()
+
+
+def test_unfinished_tests_are_released_on_close() -> None:
+    buffer = RetentionBuffer(RetentionPolicy.ON_FAILURE)
+    test = new_test()
+    buffer.hold(test)
+    buffer.add_log(test, log("setup failed"))
+
+    released = buffer.close()
+    buffer.cleanup()
+
+    assert [record.message for record in released[test][0]] == ["setup failed"]  # type: ignore
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from pytest_zebrunner.api.retry import RetryBudget, RetryPolicy, retry_after
+
+
+@pytest.mark.parametrize("attempt", range(10))
+def test_backoff_is_capped(attempt: int) -> None:
+    policy = RetryPolicy(base_delay=1, max_delay=10)
+    assert 0 <= policy.backoff(attempt) <= min(10, 2**attempt)
+
+
+def test_retry_after_seconds() -> None:
+    assert retry_after(httpx.Response(429, headers={"Retry-After": "12"})) == 12
+
+
+def test_retry_after_date() -> None:
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = retry_after(httpx.Response(503, headers={"Retry-After": format_datetime(retry_at, usegmt=True)}))
+    assert delay is not None and 25 < delay <= 30
+
+
+def test_retry_after_missing_or_invalid() -> None:
+    assert retry_after(httpx.Response(503)) is None
+    assert retry_after(httpx.Response(503, headers={"Retry-After": "soon"})) is None
+
+
+def test_not_idempotent_policy() -> None:
+    policy = RetryPolicy(idempotent=False)
+    request = httpx.Request("POST", "https://zebrunner.local")
+
+    assert policy.should_retry(error=httpx.ConnectError("refused", request=request))
+    assert not policy.should_retry(error=httpx.ReadTimeout("timeout", request=request))
+    assert policy.should_retry(status_code=429)
+    assert not policy.should_retry(status_code=500)
+
+
+def test_retry_budget() -> None:
+    budget = RetryBudget(10)
+    assert budget.acquire(6)
+    assert not budget.acquire(6)
+    assert budget.acquire(4)
@@ -0,0 +1,92 @@
+import io
+import os
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+from conftest import FakeApi
+
+from pytest_zebrunner.context import zebrunner_context
+from pytest_zebrunner.screenshots import ScreenshotTranscoder
+from pytest_zebrunner.upload_pool import UploadPool, upload
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def transcoder() -> Iterator[ScreenshotTranscoder]:
+    transcoder = ScreenshotTranscoder(max_width=640, max_height=360, deduplicate=True, processes=1)
+    yield transcoder
+    transcoder.close()
+
+
+def uploaded(api: FakeApi) -> List[tuple]:
+    screenshots = []
+    for _, _, file, content_type, _ in api.arguments("send_screenshot"):
+        with Image.open(io.BytesIO(file.content)) as image:
+            screenshots.append((image.format, image.size, content_type))
+    return screenshots
+
+
+def screenshot(path: Path, color: str, size: tuple = (1920, 1080)) -> Path:
+    Image.new("RGB", size, color).save(path, "PNG")
+    return path
+
+
+def test_screenshot_is_downscaled_and_reencoded(tmp_path: Path, transcoder: ScreenshotTranscoder) -> None:
+    original = screenshot(tmp_path / "screen.png", "red")
+
+    output, content_type = transcoder.prepare("test", original)  # type: ignore
+
+    assert content_type == "image/jpeg"
+    with Image.open(output) as image:
+        assert (image.format, image.size) == ("JPEG", (640, 360))
+    transcoder.cleanup(output)
+    assert not os.path.exists(output)
+    assert original.exists()
+
+
+def test_repeated_screenshots_of_test_are_skipped(tmp_path: Path, transcoder: ScreenshotTranscoder) -> None:
+    red = screenshot(tmp_path / "red.png", "red")
+    blue = screenshot(tmp_path / "blue.png", "blue")
+
+    assert transcoder.prepare("first", red) is not None
+    assert transcoder.prepare("first", red) is None
+    assert transcoder.prepare("second", red) is not None
+    assert transcoder.prepare("first", blue) is not None
+    assert transcoder.prepare("first", red) is not None
+
+
+def test_broken_screenshot_is_uploaded_as_is(tmp_path: Path, transcoder: ScreenshotTranscoder) -> None:
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+
+    assert transcoder.prepare("test", broken) == (str(broken), "image/png")
+
+
+def test_pool_uploads_transcoded_screenshots(tmp_path: Path, transcoder: ScreenshotTranscoder) -> None:
+    api = FakeApi()
+    pool = UploadPool(api, workers=1, transcoder=transcoder)  # type: ignore
+    red = screenshot(tmp_path / "red.png", "red")
+
+    pool.submit("test", "send_screenshot", 1, 2, str(red))
+    pool.submit("test", "send_screenshot", 1, 2, str(red))
+    pool.close(timeout=30)
+
+    assert uploaded(api) == [("JPEG", (640, 360), "image/jpeg")]
+
+
+def test_screenshots_are_transcoded_without_pool(
+    tmp_path: Path, transcoder: ScreenshotTranscoder, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    api = FakeApi()
+    for component in ["retention", "upload_pool", "pipeline"]:
+        monkeypatch.setattr(zebrunner_context, component, None)
+    monkeypatch.setattr(zebrunner_context, "screenshot_transcoder", transcoder)
+    red = screenshot(tmp_path / "red.png", "red")
+
+    upload(api, "test", "send_screenshot", 1, 2, str(red))  # type: ignore
+    upload(api, "test", "send_screenshot", 1, 2, str(red))  # type: ignore
+
+    assert uploaded(api) == [("JPEG", (640, 360), "image/jpeg")]
+    assert not os.listdir(transcoder._directory)
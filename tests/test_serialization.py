@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from pytest_zebrunner.api import serialization
+from pytest_zebrunner.api.models import (
+    FinishTestModel,
+    LabelModel,
+    PlatformModel,
+    StartTestModel,
+)
+
+
+def test_record_to_dict() -> None:
+    model = StartTestModel(
+        name="test", class_name="file.py", method_name="test", labels=[LabelModel(key="key", value="value")]
+    )
+
+    data = json.loads(serialization.dumps(model))
+    assert data == {
+        "name": "test",
+        "className": "file.py",
+        "methodName": "test",
+        "uuid": model.uuid,
+        "startedAt": model.started_at,
+        "labels": [{"key": "key", "value": "value"}],
+    }
+
+
+def test_label_values_are_strings() -> None:
+    assert dict(LabelModel(key="priority", value=1)) == {"key": "priority", "value": "1"}
+
+
+def test_record_fields_are_checked() -> None:
+    with pytest.raises(TypeError):
+        FinishTestModel()
+    with pytest.raises(TypeError):
+        FinishTestModel(result="PASSED", unknown="value")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps(monkeypatch: pytest.MonkeyPatch, use_orjson: bool) -> None:
+    if use_orjson and serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(serialization, "orjson", None)
+
+    payload = {"items": [FinishTestModel(result="PASSED", ended_at="1"), PlatformModel(name="linux", version=None)]}
+    assert json.loads(serialization.dumps(payload)) == {
+        "items": [{"result": "PASSED", "endedAt": "1"}, {"name": "linux"}]
+    }
+
+
+def test_json_array_chunks() -> None:
+    values = [{"message": "x" * 10} for _ in range(10)]
+    chunks = list(serialization.json_array_chunks(values, 60))
+
+    assert all(len(chunk) <= 60 for chunk in chunks)
+    assert [value for chunk in chunks for value in json.loads(chunk)] == values
+
+
+def test_json_array_chunks_with_oversized_value() -> None:
+    chunks = list(serialization.json_array_chunks(["small", "x" * 100, "small"], 50))
+    assert [json.loads(chunk) for chunk in chunks] == [["small"], ["x" * 100], ["small"]]
+    assert list(serialization.json_array_chunks([], 50)) == [b"[]"]
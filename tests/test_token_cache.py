@@ -0,0 +1,46 @@
+import stat
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from pytest_zebrunner.token_cache import AuthToken, TokenCache, token_key
+
+KEY = token_key("https://zebrunner.local", "access_token")
+
+
+class FakeIam:
+    def __init__(self, expires_in: Optional[float] = 3600) -> None:
+        self.expires_in = expires_in
+        self.tokens: List[str] = []
+
+    def refresh(self) -> AuthToken:
+        self.tokens.append(f"token-{len(self.tokens)}")
+        return self.tokens[-1], time.time() + self.expires_in if self.expires_in is not None else None
+
+
+def test_token_is_shared_by_processes(tmp_path: Path) -> None:
+    iam = FakeIam()
+    first = TokenCache(tmp_path / "tokens.json").get_or_refresh(KEY, iam.refresh)
+    second = TokenCache(tmp_path / "tokens.json").get_or_refresh(KEY, iam.refresh)
+
+    assert first == second and first[0] == "token-0"
+    assert iam.tokens == ["token-0"]
+    assert stat.S_IMODE((tmp_path / "tokens.json").stat().st_mode) == 0o600
+    assert "access_token" not in (tmp_path / "tokens.json").read_text()
+
+
+def test_token_is_refreshed_before_expiration(tmp_path: Path) -> None:
+    iam = FakeIam(expires_in=30)
+    cache = TokenCache(tmp_path / "tokens.json", refresh_margin=60)
+
+    cache.get_or_refresh(KEY, iam.refresh)
+    assert cache.get_or_refresh(KEY, iam.refresh)[0] == "token-1"
+    assert cache.get_or_refresh(token_key("https://zebrunner.local", "other"), iam.refresh)[0] == "token-2"
+
+
+def test_token_without_expiration_is_not_cached(tmp_path: Path) -> None:
+    iam = FakeIam(expires_in=None)
+    cache = TokenCache(tmp_path / "tokens.json")
+
+    assert cache.get_or_refresh(KEY, iam.refresh) == ("token-0", None)
+    assert cache.get_or_refresh(KEY, iam.refresh) == ("token-1", None)
@@ -0,0 +1,111 @@
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+from conftest import FakeApi
+
+from pytest_zebrunner.artifact_cache import ArtifactCache
+from pytest_zebrunner.pipeline import LazyId
+from pytest_zebrunner.upload_pool import UploadPool
+
+
+def create_file(path: Path, content: str) -> str:
+    path.write_text(content)
+    return str(path)
+
+
+def uploaded(api: FakeApi) -> List[str]:
+    return [file.content.decode() for file, *_ in api.arguments("send_artifact")]
+
+
+def test_uploads_run_concurrently(tmp_path: Path) -> None:
+    api = FakeApi()
+    barrier = threading.Barrier(3, timeout=5)
+    api.send_artifact = lambda path, *args: barrier.wait()  # type: ignore
+    pool = UploadPool(api, workers=3)  # type: ignore
+
+    for name in ["a", "b", "c"]:
+        pool.submit("test", "send_artifact", create_file(tmp_path / name, name), 1, 2)
+
+    assert pool.wait("test", timeout=5)
+    pool.close()
+
+
+def test_wait_for_uploads_of_single_test(tmp_path: Path) -> None:
+    api = FakeApi()
+    pool = UploadPool(api, workers=2)  # type: ignore
+    api.release.clear()
+    pool.submit("first", "send_artifact", create_file(tmp_path / "first.txt", "first"), 1, 1)
+
+    assert pool.wait("second", timeout=0)
+    assert not pool.wait("first", timeout=0.05)
+
+    api.release.set()
+    pool.close(timeout=5)
+    assert uploaded(api) == ["first"]
+
+
+def test_file_is_read_when_upload_is_submitted(tmp_path: Path) -> None:
+    api = FakeApi()
+    pool = UploadPool(api, workers=1)  # type: ignore
+    path = tmp_path / "screenshot.png"
+    api.release.clear()
+
+    pool.submit("test", "send_artifact", create_file(path, "first"), 1, 1)
+    submitted_at = round(time.time() * 1000)
+    pool.submit("test", "send_screenshot", 1, 1, create_file(path, "second"))
+    path.unlink()
+    api.release.set()
+    pool.close(timeout=5)
+
+    assert uploaded(api) == ["first"]
+    [(_, _, file, content_type, captured_at)] = api.arguments("send_screenshot")
+    assert (file.content, content_type) == (b"second", "image/png")
+    assert submitted_at <= captured_at <= submitted_at + 1000
+    assert not pool._directory
+
+
+def test_missing_file_is_reported_to_caller(tmp_path: Path) -> None:
+    pool = UploadPool(FakeApi(), workers=1)  # type: ignore
+
+    with pytest.raises(FileNotFoundError):
+        pool.submit("test", "send_artifact", str(tmp_path / "missing.txt"), 1, 1)
+    pool.close(timeout=5)
+
+
+def test_unregistered_uploads_are_skipped(tmp_path: Path) -> None:
+    api = FakeApi()
+    pool = UploadPool(api, workers=2, resolve_timeout=0.05)  # type: ignore
+    failed_test_id = LazyId()
+    failed_test_id.resolve(None)
+
+    pool.submit("test", "send_artifact", create_file(tmp_path / "failed.txt", "failed"), 1, failed_test_id)
+    # Never resolved, e.g. because Zebrunner is unavailable
+    pool.submit("test", "send_artifact", create_file(tmp_path / "pending.txt", "pending"), 1, LazyId())
+    pool.submit(None, "send_artifact", create_file(tmp_path / "run.txt", "run"), 1)
+
+    assert pool.wait("test", timeout=5)
+    pool.close(timeout=5)
+    assert uploaded(api) == ["run"]
+
+
+def test_claim_is_released_after_failed_upload(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    api = FakeApi()
+    send_artifact = api.send_artifact
+
+    def reset_connection(*args: object) -> None:
+        api.send_artifact = send_artifact  # type: ignore
+        raise ConnectionResetError("Connection reset by peer")
+
+    api.send_artifact = reset_connection  # type: ignore
+    pool = UploadPool(api, workers=1, cache=ArtifactCache(tmp_path))  # type: ignore
+    path = create_file(tmp_path / "file.txt", "content")
+
+    pool.submit("test", "send_artifact", path, 1, 1).result(5)
+    pool.submit("test", "send_artifact", path, 1, 1).result(5)
+
+    pool.close(timeout=5)
+    assert uploaded(api) == ["content"]
+    assert "Failed to upload file with 'send_artifact'" in caplog.text
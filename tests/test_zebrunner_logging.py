@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Iterator, List
+
+import pytest
+
+from pytest_zebrunner.api.models import LogRecordModel
+from pytest_zebrunner.context import Test as ZebrunnerTest
+from pytest_zebrunner.context import TestRun as ZebrunnerTestRun
+from pytest_zebrunner.context import zebrunner_context
+from pytest_zebrunner.hooks import PytestHooks
+from pytest_zebrunner.settings import LogSettings, ServerSettings, Settings
+from pytest_zebrunner.zebrunner_logging import (
+    ZebrunnerHandler,
+    caplog_records_key,
+    captured_logs,
+    deliver_captured_logs,
+    propagate_current_test,
+    stop_propagating_current_test,
+)
+
+pytest_plugins = ["pytester"]
+
+
+class FakeShipper:
+    def __init__(self) -> None:
+        self.records: List[LogRecordModel] = []
+        self.lock = threading.Lock()
+
+    def add(self, record: LogRecordModel) -> None:
+        with self.lock:
+            self.records.append(record)
+
+    def messages_of(self, test_id: int) -> List[str]:
+        return sorted(record.message for record in self.records if record.test_id == test_id)  # type: ignore
+
+
+@pytest.fixture
+def shipper(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeShipper]:
+    shipper = FakeShipper()
+    test_run = ZebrunnerTestRun("run")
+    test_run.zebrunner_id = 1
+    monkeypatch.setattr(zebrunner_context, "settings", Settings(server=ServerSettings(hostname="h", access_token="t")))
+    monkeypatch.setattr(zebrunner_context, "test_run", test_run)
+    monkeypatch.setattr(zebrunner_context, "log_shipper", shipper)
+    propagate_current_test()
+
+    handler = ZebrunnerHandler()
+    logger = logging.getLogger("zebrunner-test-logs")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    yield shipper
+    logger.removeHandler(handler)
+    stop_propagating_current_test()
+    zebrunner_context.test = None
+
+
+def start_test(test_id: int) -> ZebrunnerTest:
+    test = ZebrunnerTest(f"test {test_id}", "file", [], [])
+    test.zebrunner_id = test_id
+    zebrunner_context.test = test
+    return test
+
+
+def test_threads_started_by_test_log_to_it(shipper: FakeShipper) -> None:
+    logger = logging.getLogger("zebrunner-test-logs")
+    release = threading.Event()
+
+    start_test(1)
+    thread = threading.Thread(target=lambda: release.wait(5) and logger.info("thread"))
+    thread.start()
+    with ThreadPoolExecutor(2) as executor:
+        executor.submit(logger.info, "pool").result()
+
+        start_test(2)
+        logger.info("main")
+        executor.submit(logger.info, "pool").result()
+    release.set()
+    thread.join()
+
+    assert shipper.messages_of(1) == ["pool", "thread"]
+    assert shipper.messages_of(2) == ["main", "pool"]
+
+
+def test_pool_workers_are_not_bound_to_test_that_started_them(shipper: FakeShipper) -> None:
+    logger = logging.getLogger("zebrunner-test-logs")
+    patched_start = threading.Thread.start
+
+    start_test(1)
+    with ThreadPoolExecutor(1) as executor:
+        executor.submit(logger.info, "first").result()
+        stop_propagating_current_test()
+        start_test(2)
+        # Tasks are not bound to tests anymore, the worker started by test 1 logs to the running test
+        executor.submit(logger.info, "second").result()
+
+    assert threading.Thread.start is not patched_start
+    assert shipper.messages_of(1) == ["first"]
+    assert shipper.messages_of(2) == ["second"]
+
+
+def test_asyncio_tasks_log_to_test(shipper: FakeShipper) -> None:
+    logger = logging.getLogger("zebrunner-test-logs")
+
+    async def work() -> None:
+        await asyncio.sleep(0.01)
+        logger.info("task")
+
+    async def run() -> None:
+        start_test(1)
+        task = asyncio.ensure_future(work())
+        start_test(2)
+        await task
+
+    asyncio.run(run())
+
+    assert shipper.messages_of(1) == ["task"]
+
+
+def test_logs_outside_of_test_are_skipped(shipper: FakeShipper) -> None:
+    logging.getLogger("zebrunner-test-logs").info("no test")
+
+    assert shipper.records == []
+
+
+def test_output_captured_by_pytest_is_collected() -> None:
+    record = logging.LogRecord("app", logging.INFO, "file", 1, "value %s", ("1",), None)
+    item = SimpleNamespace(stash={caplog_records_key: {"call": [record], "setup": []}})
+    report = SimpleNamespace(
+        when="call",
+        sections=[
+            ("Captured stdout setup", "setup output"),
+            ("Captured stdout call", "printed"),
+            ("Captured stderr call", "warning"),
+            ("Captured log call", "INFO app value 1"),
+        ],
+    )
+
+    logs = captured_logs(item, report)  # type: ignore
+
+    assert [(name, level, message) for name, _, level, message in logs] == [
+        ("app", "INFO", "value 1"),
+        ("stdout", "INFO", "printed"),
+        ("stderr", "WARNING", "warning"),
+    ]
+
+
+def test_logs_captured_during_teardown_are_collected(
+    pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = Settings(server=ServerSettings(hostname="h", access_token="t"), logs=LogSettings(capture=True))
+    monkeypatch.setattr(zebrunner_context, "settings", settings)
+    pytester.makeconftest("""
+        from pytest_zebrunner.hooks import PytestHooks
+
+        class CapturedLogsHooks:
+            pytest_runtest_teardown = PytestHooks.pytest_runtest_teardown
+            pytest_runtest_makereport = PytestHooks.pytest_runtest_makereport
+
+        def pytest_configure(config):
+            config.pluginmanager.register(CapturedLogsHooks())
+        """)
+    pytester.makepyfile("""
+        import logging
+        import pytest
+
+        @pytest.fixture
+        def resource():
+            yield
+            logging.getLogger("app").warning("released")
+
+        def test_resource(resource):
+            pass
+        """)
+
+    reports = pytester.inline_run("--log-level=INFO").getreports("pytest_runtest_logreport")
+
+    teardown = next(report for report in reports if report.when == "teardown")
+    assert [(name, level, message) for name, _, level, message in teardown.captured_logs] == [
+        ("app", "WARNING", "released")
+    ]
+
+
+def test_captured_logs_are_not_sent_to_xdist_controller() -> None:
+    data = {"when": "call", "zebrunner_metadata": object(), "captured_logs": [("app", 1.5, "INFO", "message")]}
+    hook = PytestHooks.pytest_report_to_serializable(None, None)  # type: ignore
+    next(hook)
+    with pytest.raises(StopIteration):
+        hook.send(SimpleNamespace(get_result=lambda: data))
+
+    assert data == {"when": "call"}
+
+
+def test_captured_logs_are_delivered_to_test(shipper: FakeShipper) -> None:
+    test = start_test(1)
+
+    deliver_captured_logs(test, [("stdout", 1.5, "INFO", "printed")])
+
+    assert [(record.test_id, record.timestamp, record.message) for record in shipper.records] == [  # type: ignore
+        (1, "1500", "printed")
+    ]